@@ -1,9 +1,19 @@
+"""
+Vercel entry point
+A cold invocation serves /booking/destinations from the snapshot file written
+at deploy time (flask build-catalog-snapshot) and leaves the database alone,
+schema check included, until a request actually needs it.
+"""
 import os
 import sys
 
-# Add the project root directory to sys.path
-# This ensures that 'app.py' (which is in the parent directory) can be imported
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app import app
+from app import create_app
+from services.catalog import destination_catalog
+
+app = create_app(lazy_schema=True)
 app.debug = False
+
+if not destination_catalog.load_file():
+    print("Catalog snapshot file not found; the first catalog request will build it from the database")
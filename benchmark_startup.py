@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+World Tour Startup Benchmark
+Measures cold start in fresh interpreters: importing app, create_app(), and
+the first request. Run before and after touching module-level imports:
+
+    python benchmark_startup.py --runs 10
+    python benchmark_startup.py --importtime 20   # slowest modules by cumulative import time
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+application = app.create_app(sys.argv[1] if len(sys.argv) > 1 else None)
+t2 = time.perf_counter()
+application.test_client().get('/healthz')
+t3 = time.perf_counter()
+heavy = ['stripe', 'requests', 'redis', 'celery', 'PIL', 'flask_mail', 'flask_migrate', 'alembic']
+print(json.dumps({
+    'import_ms': (t1 - t0) * 1000,
+    'create_app_ms': (t2 - t1) * 1000,
+    'first_request_ms': (t3 - t2) * 1000,
+    'total_ms': (t3 - t0) * 1000,
+    'heavy_loaded': [m for m in heavy if m in sys.modules],
+}))
+"""
+
+
+def run_once(config):
+    args = [sys.executable, '-c', PROBE] + ([config] if config else [])
+    out = subprocess.run(args, cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def importtime(top):
+    """Slowest modules by cumulative import time for `import app; app.create_app()`"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app; app.create_app()'],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line.split(':', 1)[1].split('|')]
+        rows.append((int(cumulative_us), int(self_us), name))
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:9.1f} ms  {self_us / 1000:7.1f} ms self  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--config', help='config.py name passed to create_app (default: environment)')
+    parser.add_argument('--importtime', type=int, metavar='N', help='show the N slowest imports instead')
+    args = parser.parse_args()
+
+    if args.importtime:
+        importtime(args.importtime)
+        return
+
+    samples = [run_once(args.config) for _ in range(args.runs)]
+    for key in ('import_ms', 'create_app_ms', 'first_request_ms', 'total_ms'):
+        values = [s[key] for s in samples]
+        print(f"{key:18} median {statistics.median(values):8.1f}   min {min(values):8.1f}   max {max(values):8.1f}")
+    print(f"heavy modules loaded: {', '.join(samples[-1]['heavy_loaded']) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,66 +3,95 @@ Affiliate API Routes
 Handles affiliate link generation and click tracking
 """
 from flask import Blueprint, request, jsonify, redirect
-from services.affiliate_service import AffiliateService
-from models.affiliate import AffiliateClick
-from db import db
+from services.affiliate_service import AffiliateService, click_writer
+from services.link_templates import build_link, destination_links, is_iata
+from services.affiliate_stats import GROUP_COLUMNS, query_stats
+from datetime import date
 
 affiliate_bp = Blueprint('affiliate', __name__, url_prefix='/api/affiliate')
 
 @affiliate_bp.route('/track', methods=['POST'])
 def track_click():
     """Track affiliate link click"""
-    data = request.get_json()
-    
-    affiliate_type = data.get('affiliateType')
-    destination = data.get('destination')
-    user_id = data.get('userId')
-    
-    click_id = AffiliateService.track_click(affiliate_type, destination, user_id)
-    
-    return jsonify({'success': True, 'click_id': click_id}), 200
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+
+    # Queued and written in batches off the request path
+    try:
+        queued = AffiliateService.track_click(data.get('affiliateType'), data.get('destination'), data.get('userId'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({'success': True, 'queued': queued}), 202
+
+# ?type= -> (link template, affiliate_type recorded for the click, query params passed through)
+REDIRECT_TYPES = {
+    'hotel': ('booking', 'booking', ('destination', 'checkin', 'checkout', 'guests')),
+    'flight': ('skyscanner', 'skyscanner', ('origin', 'destination', 'date')),
+    'google_flights': ('google_flights', 'google_flights', ('origin', 'destination', 'date')),
+    'activity': ('getyourguide', 'activity', ('destination',)),
+    'insurance': ('worldnomads', 'insurance', ('destination', 'travelers', 'trip_cost')),
+}
 
 @affiliate_bp.route('/redirect', methods=['GET'])
 def redirect_affiliate():
     """Generate and redirect to affiliate link"""
-    link_type = request.args.get('type')
-    
-    if link_type == 'hotel':
-        destination = request.args.get('destination')
-        checkin = request.args.get('checkin')
-        checkout = request.args.get('checkout')
-        
-        # Track click
-        AffiliateService.track_click('booking', destination)
-        
-        # Generate and redirect
-        url = AffiliateService.get_hotel_link(destination, checkin, checkout)
-        return redirect(url)
-    
-    elif link_type == 'flight':
-        origin = request.args.get('origin')
-        destination = request.args.get('destination')
-        date = request.args.get('date')
-        
-        # Track click
-        AffiliateService.track_click('skyscanner', destination)
-        
-        # Generate and redirect
-        url = AffiliateService.get_flight_link(origin, destination, date)
-        return redirect(url)
-    
-    return jsonify({'error': 'Invalid link type'}), 400
+    route = REDIRECT_TYPES.get(request.args.get('type'))
+    if route is None:
+        return jsonify({'error': 'Invalid link type'}), 400
+
+    template, affiliate_type, params = route
+    if template == 'skyscanner' and not (is_iata(request.args.get('origin')) and is_iata(request.args.get('destination'))):
+        # Skyscanner paths only take airport/city codes; free-text places get a flight search instead
+        template, affiliate_type, params = REDIRECT_TYPES['google_flights']
+    try:
+        url = build_link(template, **{name: request.args.get(name) for name in params})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Track click (queued; never delays the redirect)
+    AffiliateService.track_click(affiliate_type, request.args.get('destination'))
+    return redirect(url)
+
+@affiliate_bp.route('/links', methods=['GET'])
+def destination_page_links():
+    """
+    Every outbound link for a destination page in one call.
+    ?destination=Paris (or ?destination_id=1) plus optional origin, date,
+    checkin, checkout, guests, travelers, trip_cost and destination_code (IATA).
+    """
+    name = request.args.get('destination')
+    if not name and request.args.get('destination_id'):
+        from new_models import Destination
+        dest = Destination.query.get(request.args.get('destination_id', type=int))
+        name = dest.name if dest else None
+    if not name:
+        return jsonify({'error': 'destination or destination_id is required'}), 400
+
+    trip = {key: request.args.get(key) for key in ('origin', 'date', 'checkin', 'checkout', 'guests', 'travelers', 'trip_cost')}
+    links = destination_links.get(name, destination_code=request.args.get('destination_code'), **trip)
+    response = jsonify({'destination': name, 'links': links})
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
 
 @affiliate_bp.route('/stats', methods=['GET'])
 def get_stats():
-    """Get affiliate performance stats"""
-    total_clicks = AffiliateClick.query.count()
-    conversions = AffiliateClick.query.filter_by(converted=True).count()
-    total_commission = db.session.query(db.func.sum(AffiliateClick.commission_earned)).scalar() or 0
-    
-    return jsonify({
-        'total_clicks': total_clicks,
-        'conversions': conversions,
-        'conversion_rate': (conversions / total_clicks * 100) if total_clicks > 0 else 0,
-        'total_commission': float(total_commission)
-    }), 200
+    """
+    Get affiliate performance stats from the daily rollups.
+    Optional ?from=YYYY-MM-DD&to=YYYY-MM-DD and ?group_by=day,affiliate_type,destination
+    """
+    try:
+        start = date.fromisoformat(request.args['from']) if request.args.get('from') else None
+        end = date.fromisoformat(request.args['to']) if request.args.get('to') else None
+    except ValueError:
+        return jsonify({'error': 'from/to must be YYYY-MM-DD'}), 400
+
+    group_by = [name.strip() for name in request.args.get('group_by', '').split(',') if name.strip()]
+    unknown = [name for name in group_by if name not in GROUP_COLUMNS]
+    if unknown:
+        return jsonify({'error': f"unknown group_by: {', '.join(unknown)}"}), 400
+
+    stats = query_stats(start, end, group_by)
+    stats['ingestion'] = click_writer.stats
+    return jsonify(stats), 200
@@ -1,58 +1,146 @@
-﻿from flask import Blueprint, render_template, request, jsonify
+﻿from flask import Blueprint, render_template, request, jsonify, Response, stream_with_context
 from flask_login import login_required, current_user
 from db import db
 from new_models import AITravelAssistant
 import json
-from services.ai_engine import ai_engine
+from services.rate_limiter import rate_limit
 from new_models import UserAnalytics
 from datetime import datetime
 
 ai_bp = Blueprint('ai', __name__)
 
+def wants_fresh_answer():
+    """Per-request cache bypass: {"fresh": true} or Cache-Control: no-cache (per user: /api/cache/bypass)"""
+    data = request.get_json(silent=True) or {}
+    return bool(data.get('fresh')) or 'no-cache' in request.headers.get('Cache-Control', '')
+
+def validate_chat_request():
+    """Returns (user_message, error_response)"""
+    data = request.get_json(silent=True) or {}
+    user_message = data.get('message', '')
+    
+    if not user_message:
+        return None, (jsonify({'error': 'Message is required'}), 400)
+    
+    # Input validation - limit message length
+    if len(user_message) > 1000:
+        return None, (jsonify({'error': 'Message too long. Maximum 1000 characters.'}), 400)
+    
+    return user_message, None
+
+def get_user_context():
+    return {
+        'user_id': current_user.id if current_user.is_authenticated else 'guest',
+        'username': current_user.username if current_user.is_authenticated else 'Guest'
+    }
+
+def save_conversation(user_id, user_message, ai_response, conversation_id='default'):
+    """Persist both sides of an exchange and log the analytics event"""
+    db.session.add(AITravelAssistant(
+        user_id=user_id,
+        conversation_id=conversation_id,
+        message_type='user',
+        message_content=user_message
+    ))
+    db.session.add(AITravelAssistant(
+        user_id=user_id,
+        conversation_id=conversation_id,
+        message_type='assistant',
+        message_content=ai_response
+    ))
+    db.session.add(UserAnalytics(
+        user_id=user_id,
+        event_type='AI_CHAT_MESSAGE',
+        event_data=json.dumps({'query': user_message, 'response': ai_response})
+    ))
+    db.session.commit()
+
 @ai_bp.route('/api/chat', methods=['POST'])
+@rate_limit(max_requests=20, window=60)
 def ai_chat():
-    """AI chat endpoint with rate limiting applied in app.py"""
+    """AI chat endpoint, rate limited per client IP"""
+    from services.ai_engine import ai_engine
     try:
-        data = request.get_json()
-        user_message = data.get('message', '')
-        
-        if not user_message:
-            return jsonify({'error': 'Message is required'}), 400
-        
-        # Input validation - limit message length
-        if len(user_message) > 1000:
-            return jsonify({'error': 'Message too long. Maximum 1000 characters.'}), 400
-        
-        # Get user context
-        user_context = {
-            'user_id': current_user.id if current_user.is_authenticated else 'guest',
-            'username': current_user.username if current_user.is_authenticated else 'Guest'
-        }
+        user_message, error = validate_chat_request()
+        if error:
+            return error
         
         # Generate AI response
-        ai_response = ai_engine.generate_response(user_message, context=user_context)
+        ai_response = ai_engine.generate_response(
+            user_message,
+            context=get_user_context(),
+            bypass_cache=wants_fresh_answer()
+        )
         
         # Save conversation to database if logged in
         if current_user.is_authenticated:
-            conversation = AITravelAssistant(
-                user_id=current_user.id,
-                query=user_message,
-                response=ai_response
-            )
-            db.session.add(conversation)
-            
-            # Log user analytics
-            user_analytics = UserAnalytics(
-                user_id=current_user.id,
-                event_type='AI_CHAT_MESSAGE',
-                event_details={'query': user_message, 'response': ai_response},
-                timestamp=datetime.utcnow()
-            )
-            db.session.add(user_analytics)
-            db.session.commit()
+            save_conversation(current_user.id, user_message, ai_response)
         
         return jsonify({'status': 'success', 'response': ai_response})
     except Exception as e:
         db.session.rollback()
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+def sse_event(data, event=None):
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data)}\n\n"
+
+@ai_bp.route('/api/chat/stream', methods=['POST'])
+@rate_limit(max_requests=20, window=60, scope='ai_chat')
+def ai_chat_stream():
+    """
+    Server-Sent Events variant of /api/chat.
+    Emits `data: {"token": ...}` per chunk, then `event: done` with the full text.
+    Run under the gevent/gthread worker (see gunicorn.conf.py) so a long
+    completion does not pin a whole worker process.
+    """
+    from services.ai_engine import ai_engine
+    user_message, error = validate_chat_request()
+    if error:
+        return error
+    
+    user_context = get_user_context()
+    user_id = current_user.id if current_user.is_authenticated else None
+    bypass_cache = wants_fresh_answer()
+    
+    def generate():
+        chunks = []
+        try:
+            for chunk in ai_engine.stream_response(user_message, context=user_context, bypass_cache=bypass_cache):
+                chunks.append(chunk)
+                yield sse_event({'token': chunk})
+        except Exception as e:
+            print(f"AI Stream Error: {e}")
+            yield sse_event({'message': 'Stream interrupted'}, event='error')
+        
+        ai_response = ''.join(chunks)
+        yield sse_event({'status': 'success', 'response': ai_response}, event='done')
+        
+        if user_id and ai_response:
+            try:
+                save_conversation(user_id, user_message, ai_response)
+            except Exception as e:
+                db.session.rollback()
+                print(f"AI Stream persistence error: {e}")
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop nginx-style proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@ai_bp.route('/api/cache/stats', methods=['GET'])
+def ai_cache_stats():
+    """Hit-rate metrics for the AI response cache"""
+    from services.response_cache import response_cache
+    return jsonify(response_cache.metrics())
+
+@ai_bp.route('/api/cache/bypass', methods=['GET', 'POST'])
+@login_required
+def ai_cache_bypass():
+    """Per-user opt-out of cached answers: POST {"enabled": true|false}"""
+    from services.response_cache import response_cache
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        response_cache.set_user_bypass(current_user.id, bool(data.get('enabled', True)))
+    return jsonify({'enabled': response_cache.is_bypassed_for(current_user.id)})
@@ -3,55 +3,151 @@ from flask_login import login_required, current_user
 from db import db
 from new_models import Destination, Hotel, Flight, Booking, Review, WishlistItem
 from datetime import datetime
+from sqlalchemy import or_
+from services.catalog import destination_catalog, serialize_destination, serialize_hotel, serialize_flight, parse_currency, convert_prices
+from services.pagination import keyset_paginate, resolve_sort, parse_limit, parse_float, parse_int, parse_datetime
 
 booking_bp = Blueprint('booking', __name__)
 
+# Query parameters that switch the list endpoints into paginated mode
+LIST_PARAMS = {
+    'destinations': {'limit', 'cursor', 'sort', 'category', 'country', 'min_price', 'max_price', 'min_rating', 'bbox'},
+    'hotels': {'limit', 'cursor', 'sort', 'destination_id', 'min_price', 'max_price'},
+    'flights': {'limit', 'cursor', 'sort', 'origin', 'destination', 'departure_from', 'departure_to'},
+}
+
+def wants_page(endpoint):
+    return any(request.args.get(name) not in (None, '') for name in LIST_PARAMS[endpoint])
+
+def serialize_all(rows, serializer, currency=None):
+    """Serialize rows, converting prices in bulk when ?currency asks for it"""
+    items = [serializer(row) for row in rows]
+    if currency and currency != 'USD':
+        items = convert_prices(items, currency)
+    return items
+
+def paginated_response(query, sort_columns, default_sort, id_column, serializer, currency=None):
+    """Apply ?sort/?limit/?cursor to an already-filtered query and build the page envelope"""
+    key, column, descending = resolve_sort(request.args.get('sort'), sort_columns, default_sort)
+    limit = parse_limit(request.args.get('limit'))
+    rows, next_cursor = keyset_paginate(query, column, id_column, limit, request.args.get('cursor'), descending)
+    return jsonify({
+        'items': serialize_all(rows, serializer, currency),
+        'next_cursor': next_cursor,
+        'limit': limit,
+        'sort': ('-' if descending else '') + key
+    })
+
+def filter_destinations(query, args):
+    if args.get('category'):
+        query = query.filter(Destination.category == args['category'].lower())
+    if args.get('country'):
+        query = query.filter(Destination.country == args['country'])
+
+    min_price = parse_float(args, 'min_price')
+    max_price = parse_float(args, 'max_price')
+    min_rating = parse_float(args, 'min_rating')
+    if min_price is not None:
+        query = query.filter(Destination.price >= min_price)
+    if max_price is not None:
+        query = query.filter(Destination.price <= max_price)
+    if min_rating is not None:
+        query = query.filter(Destination.rating >= min_rating)
+
+    if args.get('bbox'):
+        # bbox=west,south,east,north in degrees; west > east crosses the antimeridian
+        try:
+            west, south, east, north = [float(v) for v in args['bbox'].split(',')]
+        except ValueError:
+            raise ValueError('bbox must be west,south,east,north')
+        query = query.filter(Destination.latitude.between(south, north))
+        if west <= east:
+            query = query.filter(Destination.longitude.between(west, east))
+        else:
+            query = query.filter(or_(Destination.longitude >= west, Destination.longitude <= east))
+    return query
+
+def filter_hotels(query, args):
+    destination_id = parse_int(args, 'destination_id')
+    min_price = parse_float(args, 'min_price')
+    max_price = parse_float(args, 'max_price')
+    if destination_id is not None:
+        query = query.filter(Hotel.destination_id == destination_id)
+    if min_price is not None:
+        query = query.filter(Hotel.price >= min_price)
+    if max_price is not None:
+        query = query.filter(Hotel.price <= max_price)
+    return query
+
+def filter_flights(query, args):
+    # Airport labels look like 'JFK (New York)', so match on prefix to allow bare IATA codes
+    if args.get('origin'):
+        query = query.filter(Flight.origin.startswith(args['origin']))
+    if args.get('destination'):
+        query = query.filter(Flight.destination.startswith(args['destination']))
+
+    departure_from = parse_datetime(args, 'departure_from')
+    departure_to = parse_datetime(args, 'departure_to')
+    if departure_from is not None:
+        query = query.filter(Flight.departure_time >= departure_from)
+    if departure_to is not None:
+        query = query.filter(Flight.departure_time <= departure_to)
+    return query
+
 @booking_bp.route('/destinations')
 def destinations():
-    all_destinations = Destination.query.filter_by(available=True).all()
     if request.is_json or request.args.get('format') == 'json':
-        return jsonify([{
-            'id': d.id,
-            'name': d.name,
-            'country': d.country,
-            'image_url': d.image_url,
-            'price': d.price,
-            'rating': d.rating or 4.5,
-            'category': d.category,
-            'quote': d.quote,
-            'latitude': d.latitude,
-            'longitude': d.longitude
-        } for d in all_destinations])
+        try:
+            currency = parse_currency(request.args.get('currency'))
+            if wants_page('destinations'):
+                query = filter_destinations(Destination.query.filter_by(available=True), request.args)
+                return paginated_response(query, {
+                    'id': Destination.id,
+                    'name': Destination.name,
+                    'price': Destination.price,
+                    'rating': Destination.rating,
+                }, 'id', Destination.id, serialize_destination, currency)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        # Served from the precomputed snapshot; rebuilt only when destinations or rates change
+        return destination_catalog.get_snapshot(currency).to_response()
+    all_destinations = Destination.query.filter_by(available=True).all()
     return render_template('travel.html', destinations=all_destinations)
 
 @booking_bp.route('/hotels')
 def hotels():
-    all_hotels = Hotel.query.all()
     if request.is_json or request.args.get('format') == 'json':
-        return jsonify([{
-            'id': h.id,
-            'name': h.name,
-            'location': h.location,
-            'price': h.price,
-            'rating': h.rating,
-            'image_url': h.image_url,
-            'description': h.description
-        } for h in all_hotels])
+        try:
+            currency = parse_currency(request.args.get('currency'))
+            if wants_page('hotels'):
+                query = filter_hotels(Hotel.query.filter(Hotel.available.is_(True)), request.args)
+                return paginated_response(query, {
+                    'id': Hotel.id,
+                    'price': Hotel.price,
+                    'rating': Hotel.rating,
+                }, 'id', Hotel.id, serialize_hotel, currency)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(serialize_all(Hotel.query.filter(Hotel.available.is_(True)).all(), serialize_hotel, currency))
+    all_hotels = Hotel.query.filter(Hotel.available.is_(True)).all()
     return render_template('hotels.html', hotels=all_hotels)
 
 @booking_bp.route('/flights')
 def flights():
-    all_flights = Flight.query.all()
     if request.is_json or request.args.get('format') == 'json':
-        return jsonify([{
-            'id': f.id,
-            'airline': f.airline,
-            'origin': f.origin,
-            'destination': f.destination,
-            'price': f.price,
-            'departure': f.departure_time.strftime('%I:%M %p') if f.departure_time else '10:00 AM',
-            'duration': f.duration
-        } for f in all_flights])
+        try:
+            currency = parse_currency(request.args.get('currency'))
+            if wants_page('flights'):
+                query = filter_flights(Flight.query.filter(Flight.available.is_(True)), request.args)
+                return paginated_response(query, {
+                    'id': Flight.id,
+                    'price': Flight.price,
+                    'departure': Flight.departure_time,
+                }, 'departure', Flight.id, serialize_flight, currency)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(serialize_all(Flight.query.filter(Flight.available.is_(True)).all(), serialize_flight, currency))
+    all_flights = Flight.query.filter(Flight.available.is_(True)).all()
     return render_template('flights.html', flights=all_flights)
 @booking_bp.route('/external/hotels/search')
 def external_hotel_search():
@@ -65,14 +161,18 @@ def external_hotel_search():
 
 @booking_bp.route('/live/hotels/search')
 def live_hotel_search():
-    from services.liteapi_service import liteapi_service
+    from services.hotel_search import hotel_search
     dest = request.args.get('q', 'Paris')
-    guests = request.args.get('guests', 2)
+    guests = request.args.get('guests', 2, type=int)
     checkin = request.args.get('checkin')
     checkout = request.args.get('checkout')
-    
-    hotels = liteapi_service.search_hotels(dest, guests, checkin, checkout)
-    return jsonify(hotels)
+
+    hotels, providers, cache_state = hotel_search.cached_search(dest, guests, checkin, checkout)
+    response = jsonify(hotels)
+    # e.g. "liteapi=ok, hotelbeds=timeout, local=ok" - partial results are still a 200
+    response.headers['X-Hotel-Providers'] = ', '.join(f"{name}={state}" for name, state in providers.items())
+    response.headers['X-Cache'] = cache_state.upper()
+    return response
 
 @booking_bp.route('/create-checkout-session', methods=['POST'])
 def create_checkout_session():
@@ -0,0 +1,214 @@
+"""
+Core Routes - Health, service stats, seeding and catalog utilities
+Registered by create_app(); the CLI commands are top-level (flask seed, ...).
+"""
+from datetime import datetime, timedelta
+
+import click
+from flask import Blueprint, current_app, jsonify, request
+
+from db import db
+from decorators import admin_api_required
+from services.rate_limiter import rate_limiter
+
+core_bp = Blueprint('core', __name__, cli_group=None)
+
+@core_bp.after_app_request
+def add_security_headers(response):
+    # Prevent clickjacking
+    response.headers['X-Frame-Options'] = 'SAMEORIGIN'
+    # Prevent MIME type sniffing
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    # Enable XSS protection
+    response.headers['X-XSS-Protection'] = '1; mode=block'
+    # Content Security Policy
+    response.headers['Content-Security-Policy'] = "default-src 'self' 'unsafe-inline' 'unsafe-eval' https: data: blob:; img-src 'self' https: data: blob:;"
+    # Referrer Policy
+    response.headers['Referrer-Policy'] = 'strict-origin-when-cross-origin'
+    # Permissions Policy
+    response.headers['Permissions-Policy'] = 'geolocation=(), microphone=(), camera=()'
+    return response
+
+@core_bp.route('/healthz')
+def healthz():
+    return jsonify({"status": "ok"}), 200
+
+@core_bp.route('/api/rate-limit/stats')
+@admin_api_required
+def rate_limit_stats():
+    return jsonify(rate_limiter.stats())
+
+@core_bp.route('/api/http-client/stats')
+@admin_api_required
+def http_client_stats():
+    """Per-host latency, error and circuit-breaker state for outbound calls"""
+    from services.http_client import http_client
+    return jsonify(http_client.stats())
+
+@core_bp.route('/api/hotel-cache/stats')
+@admin_api_required
+def hotel_cache_stats():
+    from services.hotel_search import hotel_search
+    return jsonify(hotel_search.cache.metrics())
+
+@core_bp.route('/seed')
+def seed_db():
+    """Sync the demo catalog with seeds/catalog.json; ids of existing rows are kept"""
+    from new_models import Destination, Hotel, Flight
+    from services.seed_loader import load_fixture
+
+    try:
+        report = load_fixture('catalog')
+        return jsonify({
+            "message": "Database seeded successfully!",
+            "destinations": Destination.query.count(),
+            "hotels": Hotel.query.count(),
+            "flights": Flight.query.count(),
+            "report": report
+        })
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"Seed Error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@core_bp.route('/populate')
+def populate_data():
+    """Sync hotels and flights with seeds/populate.json"""
+    from new_models import Hotel, Flight
+    from services.seed_loader import load_fixture
+
+    try:
+        report = load_fixture('populate')
+        return jsonify({
+            'success': True,
+            'hotels': Hotel.query.count(),
+            'flights': Flight.query.count(),
+            'report': report
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@core_bp.route('/api/currency/rates')
+def get_currency_rates():
+    from services.currency import currency_service
+    try:
+        rates = currency_service.get_rates()
+        return jsonify({
+            'success': True,
+            'base': 'USD',
+            'rates': rates,
+            'version': currency_service.version,
+            'last_update': currency_service.last_update.isoformat() if currency_service.last_update else None
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+MAX_WEATHER_BATCH = 100
+
+@core_bp.route('/api/weather/batch', methods=['GET', 'POST'])
+def weather_batch():
+    """
+    Weather for many places in one call. Takes destination_ids and/or cities
+    (comma-separated query params or JSON lists). With neither, pages through
+    the available destinations MAX_WEATHER_BATCH at a time (?offset=, with
+    next_offset in the response) from the cache only; the prefetch thread
+    fills it, so places not fetched yet come back as null.
+    """
+    from services.weather import weather_service, key_for
+
+    data = request.get_json(silent=True) or {}
+    ids = data.get('destination_ids')
+    cities = data.get('cities')
+    if ids is None and request.args.get('destination_ids'):
+        ids = request.args['destination_ids'].split(',')
+    if cities is None and request.args.get('cities'):
+        cities = request.args['cities'].split(',')
+    try:
+        ids = {int(i) for i in ids or []}
+    except (TypeError, ValueError):
+        return jsonify({'error': 'destination_ids must be integers'}), 400
+    cities = [c.strip() for c in cities or [] if c and c.strip()]
+    if len(ids) + len(cities) > MAX_WEATHER_BATCH:
+        return jsonify({'error': f'at most {MAX_WEATHER_BATCH} locations per request'}), 400
+
+    weather_service.start_prefetcher(current_app._get_current_object())
+    destinations = weather_service.destination_locations()
+    next_offset = None
+    if ids:
+        destinations = [(dest_id, loc) for dest_id, loc in destinations if dest_id in ids]
+    elif cities:
+        destinations = []
+    else:
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        if offset + MAX_WEATHER_BATCH < len(destinations):
+            next_offset = offset + MAX_WEATHER_BATCH
+        destinations = destinations[offset:offset + MAX_WEATHER_BATCH]
+
+    results = weather_service.get_many(
+        [loc for _, loc in destinations] + [{'city': c} for c in cities],
+        fetch=bool(ids or cities)
+    )
+    body = {
+        'destinations': {dest_id: results.get(key_for(loc)) for dest_id, loc in destinations},
+        'cities': {c: results.get(key_for({'city': c})) for c in cities}
+    }
+    if not (ids or cities):
+        body['next_offset'] = next_offset
+    return jsonify(body)
+
+@core_bp.cli.command('create-db')
+def create_db():
+    """Create any missing tables (fresh databases; existing ones use flask db upgrade)"""
+    db.create_all()
+    print('Database tables created')
+
+@core_bp.cli.command('rollup-affiliate-clicks')
+@click.option('--days', default=7, show_default=True, help='How many recent days to recompute')
+def rollup_affiliate_clicks(days):
+    """Recompute affiliate click rollups from the raw clicks (picks up late conversions)"""
+    from services.affiliate_stats import rebuild_rollups
+    end = datetime.utcnow().date()
+    rows = rebuild_rollups(end - timedelta(days=days - 1), end)
+    print(f"Affiliate rollups: {rows} rows rebuilt for the last {days} days")
+
+@core_bp.cli.command('seed')
+@click.argument('fixtures', nargs=-1, required=True)
+def seed_fixtures(fixtures):
+    """Apply seed fixtures by name (seeds/<name>.json) or path, in order"""
+    from services.seed_loader import load_fixture
+    for fixture in fixtures:
+        report = load_fixture(fixture)
+        tables = ', '.join(
+            f"{name} +{c['inserted']} ~{c['updated']} -{c['deleted']}" + (f" ({c['skipped']} skipped)" if c['skipped'] else '')
+            for name, c in report['tables'].items()
+        )
+        print(f"{fixture}: {tables} in {report['elapsed_ms']} ms")
+
+@core_bp.cli.command('check-indexes')
+@click.option('--declared', is_flag=True, help='Check the model declarations instead of the connected database')
+def check_indexes(declared):
+    """Report filter_by lookups in blueprints/services that no index serves"""
+    from services.index_check import missing_indexes
+    missing = missing_indexes(live=not declared)
+    for entry in missing:
+        print(f"{entry['table']}({', '.join(entry['columns'])}): {', '.join(entry['locations'])}")
+    if missing:
+        raise SystemExit(1)
+    print('Every filter_by lookup is served by an index')
+
+@core_bp.cli.command('prewarm-cities')
+def prewarm_cities():
+    """Resolve and persist LiteAPI city ids for every destination"""
+    from services.liteapi_service import liteapi_service
+    counts = liteapi_service.cities.prewarm()
+    print(f"LiteAPI cities: {counts['resolved']} resolved, {counts['missing']} unknown, {counts['cached']} already cached")
+
+@core_bp.cli.command('build-catalog-snapshot')
+@click.option('--output', default=None, help='Snapshot file (default: CATALOG_SNAPSHOT_FILE or instance/catalog_snapshot.bin)')
+def build_catalog_snapshot(output):
+    """Write the destination catalog snapshot that serverless workers load on boot (run at deploy time)"""
+    from services.catalog import destination_catalog, SNAPSHOT_FILE
+    header = destination_catalog.save_file(output)
+    print(f"Catalog snapshot {header['etag']}: {header['body_length']} bytes "
+          f"({header['gzip_length']} gzipped) -> {output or SNAPSHOT_FILE}")
@@ -3,12 +3,10 @@ Payment Routes - Subscription Management
 """
 from flask import Blueprint, request, jsonify, redirect
 from flask_login import login_required, current_user
-from services.stripe_service import StripeService
 from models.subscription import Subscription
 from new_models import User
 from db import db
 from datetime import datetime
-import stripe
 import os
 
 payments_bp = Blueprint('payments', __name__, url_prefix='/api/payments')
@@ -17,6 +15,7 @@ payments_bp = Blueprint('payments', __name__, url_prefix='/api/payments')
 @login_required
 def create_subscription():
     """Create a new subscription"""
+    from services.stripe_service import StripeService
     data = request.get_json()
     plan = data.get('plan', 'monthly')  # 'monthly' or 'yearly'
     
@@ -122,6 +121,7 @@ def capture_paypal_payment():
 @login_required
 def cancel_subscription():
     """Cancel user's subscription"""
+    from services.stripe_service import StripeService
     subscription = Subscription.query.filter_by(user_id=current_user.id).first()
     
     if not subscription or not subscription.is_active():
@@ -157,6 +157,7 @@ def subscription_status():
 @payments_bp.route('/webhook', methods=['POST'])
 def stripe_webhook():
     """Handle Stripe webhook events"""
+    import stripe
     payload = request.data
     sig_header = request.headers.get('Stripe-Signature')
     
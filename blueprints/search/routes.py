@@ -0,0 +1,54 @@
+"""
+Search API Routes
+Typeahead suggestions served from the in-process catalog search index
+"""
+from flask import Blueprint, request, jsonify
+from flask_login import current_user
+from db import db
+from new_models import SearchHistory
+from services.background_writer import BatchWriter
+from services.search_index import catalog_search
+
+search_bp = Blueprint('search', __name__, url_prefix='/api/search')
+
+def write_search_history(batch):
+    """Persist queued searches, keeping only the last keystroke of a typed-out query"""
+    rows = []
+    for entry in batch:
+        previous = rows[-1] if rows else None
+        if previous and previous['user_id'] == entry['user_id'] and entry['search_query'].startswith(previous['search_query']):
+            rows[-1] = entry
+        else:
+            rows.append(entry)
+    db.session.bulk_insert_mappings(SearchHistory, rows)
+    db.session.commit()
+
+search_history_writer = BatchWriter('search-history-writer', write_search_history, max_batch=200, max_delay=2.0)
+
+@search_bp.route('/suggest', methods=['GET'])
+def suggest():
+    """Ranked destination/hotel suggestions for a partial query"""
+    query = (request.args.get('q') or '').strip()[:100]
+    if not query:
+        return jsonify({'query': query, 'results': []})
+
+    try:
+        limit = max(1, min(int(request.args.get('limit', 8)), 25))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+
+    kind = request.args.get('type')
+    if kind and kind not in ('destination', 'hotel'):
+        return jsonify({'error': 'type must be destination or hotel'}), 400
+
+    results = catalog_search.search(query, limit=limit, kinds={kind} if kind else None)
+
+    if current_user.is_authenticated:
+        search_history_writer.submit({
+            'user_id': current_user.id,
+            'search_query': query,
+            'search_type': kind or 'destination',
+            'results_count': len(results)
+        })
+
+    return jsonify({'query': query, 'results': results})
@@ -1,9 +1,9 @@
 from flask import Blueprint, jsonify, request
 from flask_login import login_required, current_user
 from new_models import SavedItem, Destination, Hotel, Flight
-from models.subscription import Subscription
 from db import db
-import json
+from services.user_summary import get_summary
+from services.wishlist import hydrate, dump_snapshot, link_ids
 from datetime import datetime
 
 user_bp = Blueprint('user', __name__, url_prefix='/api/user')
@@ -11,57 +11,19 @@ user_bp = Blueprint('user', __name__, url_prefix='/api/user')
 @user_bp.route('/profile', methods=['GET'])
 @login_required
 def get_profile():
-    # Build profile data
-    subscription = Subscription.query.filter_by(user_id=current_user.id, active=True).first()
-    saved_count = SavedItem.query.filter_by(user_id=current_user.id).count()
-    
-    return jsonify({
-        'username': current_user.username,
-        'email': current_user.email,
-        'subscription': {
-            'active': bool(subscription),
-            'plan': subscription.plan_type if subscription else 'free',
-            'expires_at': subscription.end_date.isoformat() if subscription else None
-        },
-        'stats': {
-            'saved_trips': saved_count
-        }
-    })
+    # Counters and subscription state come from the cached per-user summary
+    return jsonify(dict(
+        get_summary(current_user.id),
+        username=current_user.username,
+        email=current_user.email
+    ))
 
 @user_bp.route('/wishlist', methods=['GET'])
 @login_required
 def get_wishlist():
+    # Served by ix_saved_items_user_created; linked rows are hydrated in one query per type
     items = SavedItem.query.filter_by(user_id=current_user.id).order_by(SavedItem.created_at.desc()).all()
-    results = []
-    
-    for item in items:
-        # Load item data
-        data = {}
-        if item.item_data:
-            try:
-                data = json.loads(item.item_data)
-            except:
-                pass
-        
-        # If destination_id exists, fetch destination details (to ensure fresh data)
-        if item.destination_id:
-            dest = Destination.query.get(item.destination_id)
-            if dest:
-                # Merge dest data, preferring DB data over snapshot for these fields
-                data['name'] = dest.name
-                data['country'] = dest.country
-                data['image_url'] = dest.image_url
-                data['id'] = dest.id
-                data['rating'] = dest.rating
-                
-        results.append({
-            'id': item.id,
-            'type': item.item_type,
-            'data': data,
-            'created_at': item.created_at.isoformat()
-        })
-        
-    return jsonify(results)
+    return jsonify(hydrate(items))
 
 @user_bp.route('/wishlist', methods=['POST'])
 @login_required
@@ -74,21 +36,14 @@ def add_wishlist():
     if not item_type:
         return jsonify({'error': 'Item type required'}), 400
 
+    # Link destinations, hotels and flights to their DB rows when an ID is provided
     new_item = SavedItem(
         user_id=current_user.id,
         item_type=item_type,
-        item_data=json.dumps(item_data_raw)
+        item_data=dump_snapshot(item_data_raw),
+        **link_ids(item_type, item_data_raw)
     )
-    
-    # Handle specific types
-    if item_type == 'destination' and 'id' in item_data_raw:
-         # Try to link to DB ID if provided
-        try:
-            dest_id = int(item_data_raw['id'])
-            new_item.destination_id = dest_id
-        except:
-            pass # Keep as unlinked if ID is weird
-            
+
     # Save
     db.session.add(new_item)
     db.session.commit()
@@ -1,10 +1,26 @@
 import os
 from datetime import timedelta
 
+def database_url():
+    url = os.environ.get('POSTGRES_URL') or os.environ.get('DATABASE_URL') or 'sqlite:///world_tour_v3.db'
+    if url.startswith('postgres://'):
+        url = url.replace('postgres://', 'postgresql://', 1)
+    return url
+
+def env_flag(name, default=False):
+    value = os.environ.get(name)
+    return default if value is None else value.lower() in ['true', 'on', '1']
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
-    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///world_tour.db'
+    SQLALCHEMY_DATABASE_URI = database_url()
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Run db.create_all() when the app is created; otherwise use `flask create-db` / `flask db upgrade`
+    AUTO_CREATE_SCHEMA = env_flag('AUTO_CREATE_SCHEMA')
+
+    # Static files are fingerprinted by the frontend build
+    SEND_FILE_MAX_AGE_DEFAULT = 31536000
     
     # Email configuration
     MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
@@ -31,6 +47,8 @@ class Config:
 class DevelopmentConfig(Config):
     DEBUG = True
     TESTING = False
+    AUTO_CREATE_SCHEMA = env_flag('AUTO_CREATE_SCHEMA', True)
+    TEMPLATES_AUTO_RELOAD = True
 
 class ProductionConfig(Config):
     DEBUG = False
@@ -52,11 +70,12 @@ class TestingConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    AUTO_CREATE_SCHEMA = True
 
 # Configuration dictionary
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
     'testing': TestingConfig,
-    'default': DevelopmentConfig
+    'default': ProductionConfig     # development is opt-in: FLASK_ENV=development
 } 
\ No newline at end of file
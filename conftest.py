@@ -0,0 +1,23 @@
+import pytest
+
+from app import create_app
+
+
+@pytest.fixture
+def app():
+    """A fresh app on its own in-memory database (TestingConfig), with process-wide caches reset"""
+    from services.catalog import destination_catalog
+    from services.destination_matcher import destination_matcher
+    from services.response_cache import response_cache
+    from services.search_index import catalog_search
+    from services.shared_store import shared_store
+    from services.user_summary import GENERATION_KEY
+
+    app = create_app('testing')
+    # Singletons may still hold rows from the previous test's database
+    destination_catalog.invalidate()
+    destination_matcher.invalidate()
+    catalog_search.mark_changed({'Destination': None, 'Hotel': None})
+    response_cache.clear()
+    shared_store.incr(GENERATION_KEY)
+    return app
@@ -1,5 +1,6 @@
 from functools import wraps
-from flask import current_app
+from flask import current_app, jsonify
+from flask_login import current_user
 
 def cache_result(timeout=300):
     """Caching decorator using Flask-Caching"""
@@ -15,4 +16,14 @@ def cache_result(timeout=300):
             cache.set(cache_key, result, timeout=timeout)
             return result
         return decorated_function
-    return decorator 
\ No newline at end of file
+    return decorator
+
+
+def admin_api_required(f):
+    """JSON 403 unless the logged-in user is an admin (API counterpart of admin.admin_required)"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated or not getattr(current_user, 'is_admin', False):
+            return jsonify({'error': 'Admin privileges required'}), 403
+        return f(*args, **kwargs)
+    return decorated_function
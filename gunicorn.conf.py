@@ -0,0 +1,30 @@
+"""
+Gunicorn settings, picked up automatically from the working directory.
+Long-lived responses (AI chat streaming, slow upstream APIs) need a worker
+class that can hold many connections open. The default is threaded workers
+(WEB_CONCURRENCY processes x GUNICORN_THREADS threads), which works with every
+database driver as-is. GUNICORN_WORKER_CLASS=gevent holds far more idle
+connections per worker, but only pays off when psycopg2 cooperates with the
+event loop: post_fork patches it with psycogreen, and without psycogreen
+every query blocks the whole worker.
+"""
+import os
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 200))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+keepalive = 5
+
+
+def post_fork(server, worker):
+    if worker_class != 'gevent':
+        return
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        server.log.warning("gevent workers without psycogreen: database queries will block the worker")
+        return
+    patch_psycopg()
@@ -0,0 +1,40 @@
+"""composite indexes for catalog list filters
+
+Revision ID: 3f1c9a2b7d10
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a2b7d10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Tables are created by db.create_all(), which already builds these indexes on
+# fresh databases, so creation is guarded with IF NOT EXISTS.
+INDEXES = [
+    ('ix_destination_available_category', 'destination', ['available', 'category']),
+    ('ix_destination_available_country', 'destination', ['available', 'country']),
+    ('ix_destination_available_price', 'destination', ['available', 'price', 'id']),
+    ('ix_destination_available_rating', 'destination', ['available', 'rating', 'id']),
+    ('ix_destination_lat_lng', 'destination', ['latitude', 'longitude']),
+    ('ix_hotel_destination_price', 'hotel', ['destination_id', 'price', 'id']),
+    ('ix_hotel_price', 'hotel', ['price', 'id']),
+    ('ix_flight_route_departure', 'flight', ['origin', 'destination', 'departure_time']),
+    ('ix_flight_departure', 'flight', ['departure_time', 'id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,39 @@
+"""per-user profile summary table
+
+Revision ID: 5a9d3b7e2c48
+Revises: e2a5c8f0d913
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a9d3b7e2c48'
+down_revision = 'e2a5c8f0d913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows are built lazily on first profile read, so there is nothing to backfill
+    if sa.inspect(op.get_bind()).has_table('user_summaries'):
+        return
+    op.create_table(
+        'user_summaries',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('saved_count', sa.Integer(), nullable=False),
+        sa.Column('booking_count', sa.Integer(), nullable=False),
+        sa.Column('plan', sa.String(length=20), nullable=True),
+        sa.Column('subscription_status', sa.String(length=20), nullable=True),
+        sa.Column('current_period_end', sa.DateTime(), nullable=True),
+        sa.Column('cancel_at_period_end', sa.Boolean(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('user_summaries')
@@ -0,0 +1,36 @@
+"""liteapi city id resolution table
+
+Revision ID: 8b2e4d6f1a35
+Revises: 3f1c9a2b7d10
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6f1a35'
+down_revision = '3f1c9a2b7d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have created the table on this database
+    if sa.inspect(op.get_bind()).has_table('liteapi_city'):
+        return
+    op.create_table(
+        'liteapi_city',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name_key', sa.String(length=200), nullable=False),
+        sa.Column('city_id', sa.String(length=50), nullable=True),
+        sa.Column('source', sa.String(length=20), nullable=True),
+        sa.Column('resolved_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name_key')
+    )
+
+
+def downgrade():
+    op.drop_table('liteapi_city')
@@ -0,0 +1,48 @@
+"""indexes for webhook, click and lookup hot paths
+
+Revision ID: 9c3f5e7a1d24
+Revises: 5a9d3b7e2c48
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c3f5e7a1d24'
+down_revision = '5a9d3b7e2c48'
+branch_labels = None
+depends_on = None
+
+# Destination.available, Hotel.destination_id, the Flight route and
+# SavedItem.user_id are already served by the leading columns of the composite
+# indexes from 3f1c9a2b7d10 and e2a5c8f0d913.
+INDEXES = [
+    ('ix_user_stripe_customer_id', 'user', ['stripe_customer_id'], True),
+    ('ix_subscriptions_stripe_subscription_id', 'subscriptions', ['stripe_subscription_id'], False),
+    ('ix_affiliate_clicks_clicked_at', 'affiliate_clicks', ['clicked_at'], False),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    # The payments code has always used user.stripe_customer_id; older databases lack the column
+    if 'stripe_customer_id' not in {c['name'] for c in inspector.get_columns('user')}:
+        op.add_column('user', sa.Column('stripe_customer_id', sa.String(length=100), nullable=True))
+
+    # db.create_all() builds these on fresh databases
+    for name, table, columns, unique in INDEXES:
+        if not inspector.has_table(table):
+            continue
+        if name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns, unique in reversed(INDEXES):
+        if inspector.has_table(table) and name in {index['name'] for index in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_column('stripe_customer_id')
@@ -0,0 +1,34 @@
+"""soft-delete flag for hotels and flights
+
+Revision ID: b6e1d4a8c3f7
+Revises: 9c3f5e7a1d24
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e1d4a8c3f7'
+down_revision = '9c3f5e7a1d24'
+branch_labels = None
+depends_on = None
+
+TABLES = ('hotel', 'flight')
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table in TABLES:
+        # db.create_all() adds the column on fresh databases
+        if 'available' in {c['name'] for c in inspector.get_columns(table)}:
+            continue
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('available', sa.Boolean(), nullable=True, server_default=sa.true()))
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('available')
@@ -0,0 +1,52 @@
+"""affiliate click rollups per day, affiliate type and destination
+
+Revision ID: c4d7e9a1b2f6
+Revises: 8b2e4d6f1a35
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d7e9a1b2f6'
+down_revision = '8b2e4d6f1a35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table('affiliate_click_rollups'):
+        op.create_table(
+            'affiliate_click_rollups',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('affiliate_type', sa.String(length=50), nullable=False),
+            sa.Column('destination', sa.String(length=200), nullable=False),
+            sa.Column('clicks', sa.Integer(), nullable=False),
+            sa.Column('conversions', sa.Integer(), nullable=False),
+            sa.Column('commission', sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('day', 'affiliate_type', 'destination', name='uq_affiliate_rollup_key')
+        )
+
+    if not inspector.has_table('affiliate_clicks'):
+        return
+    # Backfill from existing history; later days are kept current by the click writer
+    day = 'date(clicked_at)' if bind.dialect.name == 'sqlite' else 'CAST(clicked_at AS DATE)'
+    op.execute("DELETE FROM affiliate_click_rollups")
+    op.execute(f"""
+        INSERT INTO affiliate_click_rollups (day, affiliate_type, destination, clicks, conversions, commission)
+        SELECT {day}, COALESCE(affiliate_type, 'unknown'), COALESCE(destination, ''), COUNT(*),
+               SUM(CASE WHEN converted THEN 1 ELSE 0 END), COALESCE(SUM(commission_earned), 0)
+        FROM affiliate_clicks
+        WHERE clicked_at IS NOT NULL
+        GROUP BY {day}, COALESCE(affiliate_type, 'unknown'), COALESCE(destination, '')
+    """)
+
+
+def downgrade():
+    op.drop_table('affiliate_click_rollups')
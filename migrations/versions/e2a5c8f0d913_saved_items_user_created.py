@@ -0,0 +1,45 @@
+"""saved_items (user_id, created_at) index and compact snapshots
+
+Revision ID: e2a5c8f0d913
+Revises: c4d7e9a1b2f6
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a5c8f0d913'
+down_revision = 'c4d7e9a1b2f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() builds the index on fresh databases
+    op.execute("CREATE INDEX IF NOT EXISTS ix_saved_items_user_created ON saved_items (user_id, created_at)")
+
+    # Re-encode existing snapshots without whitespace
+    bind = op.get_bind()
+    saved_items = sa.table('saved_items', sa.column('id', sa.Integer), sa.column('item_data', sa.Text))
+    updates = []
+    for item_id, raw in bind.execute(sa.select(saved_items.c.id, saved_items.c.item_data)):
+        try:
+            compact = json.dumps(json.loads(raw), separators=(',', ':'))
+        except (TypeError, ValueError):
+            continue
+        if compact != raw:
+            updates.append({'item_id': item_id, 'item_data': compact})
+    if updates:
+        bind.execute(
+            saved_items.update().where(saved_items.c.id == sa.bindparam('item_id'))
+            .values(item_data=sa.bindparam('item_data')),
+            updates
+        )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_saved_items_user_created")
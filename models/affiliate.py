@@ -11,9 +11,29 @@ class AffiliateClick(db.Model):
     affiliate_type = db.Column(db.String(50), nullable=False)  # 'booking', 'skyscanner', 'insurance'
     destination = db.Column(db.String(200))
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
-    clicked_at = db.Column(db.DateTime, default=datetime.utcnow)
+    clicked_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     converted = db.Column(db.Boolean, default=False)  # Track if click led to booking
     commission_earned = db.Column(db.Float, default=0.0)
     
     def __repr__(self):
         return f'<AffiliateClick {self.affiliate_type} - {self.destination}>'
+
+
+class AffiliateClickRollup(db.Model):
+    """Click/conversion totals per day x affiliate_type x destination"""
+    __tablename__ = 'affiliate_click_rollups'
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    affiliate_type = db.Column(db.String(50), nullable=False)
+    destination = db.Column(db.String(200), nullable=False, default='')  # '' when the click had none
+    clicks = db.Column(db.Integer, nullable=False, default=0)
+    conversions = db.Column(db.Integer, nullable=False, default=0)
+    commission = db.Column(db.Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        db.UniqueConstraint('day', 'affiliate_type', 'destination', name='uq_affiliate_rollup_key'),
+    )
+
+    def __repr__(self):
+        return f'<AffiliateClickRollup {self.day} {self.affiliate_type} - {self.destination}>'
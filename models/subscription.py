@@ -16,7 +16,7 @@ class Subscription(db.Model):
     
     # Stripe integration
     stripe_customer_id = db.Column(db.String(100))
-    stripe_subscription_id = db.Column(db.String(100))
+    stripe_subscription_id = db.Column(db.String(100), index=True)
     
     # Billing
     current_period_start = db.Column(db.DateTime)
@@ -57,6 +57,7 @@ class User(db.Model, UserMixin):
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(128))
+    stripe_customer_id = db.Column(db.String(100), unique=True, index=True)  # looked up by Stripe webhooks
     bookings = db.relationship('Booking', backref='user', lazy=True)
     saved_items = db.relationship('SavedItem', backref='user', lazy=True)
 
@@ -78,6 +79,14 @@ class Destination(db.Model):
     available = db.Column(db.Boolean, default=True)
     bookings = db.relationship('Booking', backref='destination', lazy=True)
 
+    __table_args__ = (
+        db.Index('ix_destination_available_category', 'available', 'category'),
+        db.Index('ix_destination_available_country', 'available', 'country'),
+        db.Index('ix_destination_available_price', 'available', 'price', 'id'),
+        db.Index('ix_destination_available_rating', 'available', 'rating', 'id'),
+        db.Index('ix_destination_lat_lng', 'latitude', 'longitude'),
+    )
+
 class Hotel(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -87,6 +96,13 @@ class Hotel(db.Model):
     image_url = db.Column(db.String(500))
     description = db.Column(db.Text)
     destination_id = db.Column(db.Integer, db.ForeignKey('destination.id'))
+    # Unlisted rather than deleted so bookings and saved items keep their link
+    available = db.Column(db.Boolean, default=True)
+
+    __table_args__ = (
+        db.Index('ix_hotel_destination_price', 'destination_id', 'price', 'id'),
+        db.Index('ix_hotel_price', 'price', 'id'),
+    )
 
 class Flight(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -97,6 +113,12 @@ class Flight(db.Model):
     departure_time = db.Column(db.DateTime)
     duration = db.Column(db.String(20))
     flight_number = db.Column(db.String(20))
+    available = db.Column(db.Boolean, default=True)
+
+    __table_args__ = (
+        db.Index('ix_flight_route_departure', 'origin', 'destination', 'departure_time'),
+        db.Index('ix_flight_departure', 'departure_time', 'id'),
+    )
 
 class Booking(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -151,3 +173,28 @@ class SavedItem(db.Model):
     external_id = db.Column(db.String(100), nullable=True) # For API items
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_saved_items_user_created', 'user_id', 'created_at'),
+    )
+
+class LiteAPICity(db.Model):
+    """Resolved LiteAPI city ids; city_id is NULL for names LiteAPI does not know"""
+    __tablename__ = 'liteapi_city'
+    id = db.Column(db.Integer, primary_key=True)
+    name_key = db.Column(db.String(200), unique=True, nullable=False)  # normalized destination name
+    city_id = db.Column(db.String(50), nullable=True)
+    source = db.Column(db.String(20), default='api')  # 'curated', 'api'
+    resolved_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class UserSummary(db.Model):
+    """Per-user profile counters and subscription state, kept in step by services.user_summary"""
+    __tablename__ = 'user_summaries'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    saved_count = db.Column(db.Integer, nullable=False, default=0)
+    booking_count = db.Column(db.Integer, nullable=False, default=0)
+    plan = db.Column(db.String(20), nullable=True)  # NULL when the user never subscribed
+    subscription_status = db.Column(db.String(20), nullable=True)
+    current_period_end = db.Column(db.DateTime, nullable=True)
+    cancel_at_period_end = db.Column(db.Boolean, default=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -2,13 +2,52 @@
 Affiliate Service - Centralized affiliate link generation and tracking
 Supports: Booking.com, Skyscanner, GetYourGuide, World Nomads
 """
+import os
+from datetime import datetime
+
+from db import db
+from models.affiliate import AffiliateClick
+from services.background_writer import BatchWriter
+from services.link_templates import AFFILIATE_IDS, build_link
+
+
+def write_clicks(batch):
+    """
+    Bulk-insert queued clicks and bump their rollups in one transaction.
+    Spool replays carry clicked_at as an ISO string.
+    """
+    from services.affiliate_stats import count_batch, increment_rollups
+
+    rows = []
+    for click in batch:
+        clicked_at = click['clicked_at']
+        if isinstance(clicked_at, str):
+            clicked_at = datetime.fromisoformat(clicked_at)
+        rows.append(dict(click, clicked_at=clicked_at))
+    db.session.bulk_insert_mappings(AffiliateClick, rows)
+    increment_rollups(count_batch(rows))
+    db.session.commit()
+
+
+# affiliate_type values a click may carry (redirect types plus frontend-tracked ones)
+AFFILIATE_TYPES = {'booking', 'skyscanner', 'google_flights', 'activity', 'insurance', 'credit_card'}
+MAX_DESTINATION_LENGTH = 200    # AffiliateClick.destination column size
+
+
+# Retries failed batches; AFFILIATE_SPOOL_DIR adds a disk spool so clicks survive restarts
+click_writer = BatchWriter(
+    'affiliate-click-writer', write_clicks,
+    max_batch=500, max_delay=1.0, retry=True,
+    spool_dir=os.environ.get('AFFILIATE_SPOOL_DIR')
+)
+
 
 class AffiliateService:
-    # Affiliate IDs (Replace with your actual IDs after signing up)
-    BOOKING_COM_AID = "YOUR_BOOKING_COM_AFFILIATE_ID"
-    SKYSCANNER_AID = "YOUR_SKYSCANNER_AFFILIATE_ID"
-    GETYOURGUIDE_AID = "YOUR_GETYOURGUIDE_PARTNER_ID"
-    WORLD_NOMADS_AID = "YOUR_WORLD_NOMADS_AFFILIATE_ID"
+    # Affiliate IDs (set via BOOKING_COM_AID, SKYSCANNER_AID, GETYOURGUIDE_AID, WORLD_NOMADS_AID)
+    BOOKING_COM_AID = AFFILIATE_IDS['booking']
+    SKYSCANNER_AID = AFFILIATE_IDS['skyscanner']
+    GETYOURGUIDE_AID = AFFILIATE_IDS['getyourguide']
+    WORLD_NOMADS_AID = AFFILIATE_IDS['worldnomads']
     
     @staticmethod
     def get_hotel_link(destination, checkin=None, checkout=None, guests=2):
@@ -16,21 +55,9 @@ class AffiliateService:
         Generate Booking.com affiliate link
         Commission: 25-40% of booking value
         """
-        base_url = "https://www.booking.com/searchresults.html"
-        
-        params = {
-            'ss': destination,
-            'aid': AffiliateService.BOOKING_COM_AID,
-            'no_rooms': 1,
-            'group_adults': guests
-        }
-        
-        if checkin and checkout:
-            params['checkin'] = checkin
-            params['checkout'] = checkout
-        
-        from urllib.parse import urlencode
-        return f"{base_url}?{urlencode(params)}"
+        if not (checkin and checkout):
+            checkin = checkout = None
+        return build_link('booking', destination=destination, checkin=checkin, checkout=checkout, guests=guests)
     
     @staticmethod
     def get_flight_link(origin, destination, date, return_date=None):
@@ -38,17 +65,9 @@ class AffiliateService:
         Generate Skyscanner affiliate link
         Commission: Revenue per click + booking bonuses
         """
-        base_url = "https://www.skyscanner.com/transport/flights"
-        
-        # Format: /origin/destination/date/return_date
-        path = f"/{origin}/{destination}/{date}"
         if return_date:
-            path += f"/{return_date}"
-        
-        # Add affiliate tracking
-        params = f"?associateid={AffiliateService.SKYSCANNER_AID}"
-        
-        return f"{base_url}{path}{params}"
+            return build_link('skyscanner_return', origin=origin, destination=destination, date=date, return_date=return_date)
+        return build_link('skyscanner', origin=origin, destination=destination, date=date)
     
     @staticmethod
     def get_activity_link(activity_id, destination):
@@ -56,12 +75,9 @@ class AffiliateService:
         Generate GetYourGuide affiliate link
         Commission: 8% of booking value
         """
-        base_url = "https://www.getyourguide.com"
-        
-        # Add affiliate parameters
-        params = f"?partner_id={AffiliateService.GETYOURGUIDE_AID}&utm_medium=online_publisher"
-        
-        return f"{base_url}/activity/{activity_id}{params}"
+        if activity_id:
+            return build_link('getyourguide_activity', activity_id=activity_id)
+        return build_link('getyourguide', destination=destination)
     
     @staticmethod
     def get_insurance_link(destination, trip_cost, travelers=1):
@@ -69,35 +85,29 @@ class AffiliateService:
         Generate World Nomads insurance affiliate link
         Commission: 10-15% of policy cost
         """
-        base_url = "https://www.worldnomads.com/travel-insurance"
-        
-        from urllib.parse import urlencode
-        params = {
-            'affiliate': AffiliateService.WORLD_NOMADS_AID,
-            'destination': destination,
-            'travelers': travelers,
-            'trip_cost': trip_cost
-        }
-        
-        return f"{base_url}?{urlencode(params)}"
+        return build_link('worldnomads', destination=destination, travelers=travelers, trip_cost=trip_cost)
     
     @staticmethod
     def track_click(affiliate_type, destination, user_id=None):
         """
-        Track affiliate link clicks for analytics
-        Store in database for conversion tracking
+        Queue an affiliate click for analytics and conversion tracking.
+        Written to the database in batches by click_writer; returns False
+        only if the queue is full. Raises ValueError for input the
+        affiliate_clicks table would reject, so it never reaches the writer.
         """
-        from models import db, AffiliateClick
-        from datetime import datetime
-        
-        click = AffiliateClick(
-            affiliate_type=affiliate_type,
-            destination=destination,
-            user_id=user_id,
-            clicked_at=datetime.utcnow()
-        )
-        
-        db.session.add(click)
-        db.session.commit()
-        
-        return click.id
+        if affiliate_type not in AFFILIATE_TYPES:
+            raise ValueError(f"Unknown affiliate type: {affiliate_type!r}")
+        if destination is not None:
+            if not isinstance(destination, str):
+                raise ValueError('destination must be a string')
+            destination = destination[:MAX_DESTINATION_LENGTH] or None
+        if user_id is not None:
+            if isinstance(user_id, bool) or not isinstance(user_id, (int, str)) or not str(user_id).isdigit():
+                raise ValueError('userId must be an integer')
+            user_id = int(user_id)
+        return click_writer.submit({
+            'affiliate_type': affiliate_type,
+            'destination': destination,
+            'user_id': user_id,
+            'clicked_at': datetime.utcnow()
+        })
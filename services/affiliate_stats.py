@@ -0,0 +1,152 @@
+"""
+Affiliate Stats - Click rollups per day x affiliate_type x destination
+The click writer increments rollups in the same transaction as the raw
+inserts; rebuild_rollups() recomputes a date range from affiliate_clicks to
+backfill history and pick up conversions recorded after the click.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import case, func
+
+from db import db
+from models.affiliate import AffiliateClick, AffiliateClickRollup
+
+GROUP_COLUMNS = {
+    'day': AffiliateClickRollup.day,
+    'affiliate_type': AffiliateClickRollup.affiliate_type,
+    'destination': AffiliateClickRollup.destination,
+}
+
+
+def rollup_key(affiliate_type, destination, clicked_at):
+    return clicked_at.date(), affiliate_type or 'unknown', (destination or '')[:200]
+
+
+def _upsert_statement(rows):
+    """INSERT ... ON CONFLICT DO UPDATE adding to the existing counters"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    table = AffiliateClickRollup.__table__
+    stmt = insert(table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=['day', 'affiliate_type', 'destination'],
+        set_={
+            'clicks': table.c.clicks + stmt.excluded.clicks,
+            'conversions': table.c.conversions + stmt.excluded.conversions,
+            'commission': table.c.commission + stmt.excluded.commission,
+        }
+    )
+
+
+def increment_rollups(counts):
+    """Add click counts {(day, affiliate_type, destination): n}; caller commits"""
+    if not counts:
+        return
+    rows = [
+        {'day': day, 'affiliate_type': kind, 'destination': dest, 'clicks': n, 'conversions': 0, 'commission': 0.0}
+        for (day, kind, dest), n in counts.items()
+    ]
+    stmt = _upsert_statement(rows)
+    if stmt is not None:
+        db.session.execute(stmt)
+        return
+
+    for row in rows:
+        updated = (
+            AffiliateClickRollup.query
+            .filter_by(day=row['day'], affiliate_type=row['affiliate_type'], destination=row['destination'])
+            .update({AffiliateClickRollup.clicks: AffiliateClickRollup.clicks + row['clicks']}, synchronize_session=False)
+        )
+        if not updated:
+            db.session.add(AffiliateClickRollup(**row))
+
+
+def count_batch(rows):
+    """Rollup increments for a batch of click mappings"""
+    counts = defaultdict(int)
+    for row in rows:
+        counts[rollup_key(row['affiliate_type'], row.get('destination'), row['clicked_at'])] += 1
+    return counts
+
+
+def _as_date(value):
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def rebuild_rollups(start, end):
+    """Recompute rollups for days start..end (inclusive) from the raw clicks; returns rows written"""
+    lower = datetime.combine(start, datetime.min.time())
+    upper = datetime.combine(end + timedelta(days=1), datetime.min.time())
+    day = func.date(AffiliateClick.clicked_at)
+    grouped = (
+        db.session.query(
+            day,
+            AffiliateClick.affiliate_type,
+            func.coalesce(AffiliateClick.destination, ''),
+            func.count(AffiliateClick.id),
+            func.sum(case((AffiliateClick.converted.is_(True), 1), else_=0)),
+            func.coalesce(func.sum(AffiliateClick.commission_earned), 0.0),
+        )
+        .filter(AffiliateClick.clicked_at >= lower, AffiliateClick.clicked_at < upper)
+        .group_by(day, AffiliateClick.affiliate_type, func.coalesce(AffiliateClick.destination, ''))
+        .all()
+    )
+
+    AffiliateClickRollup.query.filter(
+        AffiliateClickRollup.day >= start, AffiliateClickRollup.day <= end
+    ).delete(synchronize_session=False)
+    db.session.bulk_insert_mappings(AffiliateClickRollup, [
+        {
+            'day': _as_date(d), 'affiliate_type': kind or 'unknown', 'destination': (dest or '')[:200],
+            'clicks': clicks, 'conversions': int(conversions or 0), 'commission': float(commission or 0)
+        }
+        for d, kind, dest, clicks, conversions, commission in grouped
+    ])
+    db.session.commit()
+    return len(grouped)
+
+
+def query_stats(start=None, end=None, group_by=()):
+    """Totals (and optional per-group rows) read from the rollups only"""
+    filters = []
+    if start:
+        filters.append(AffiliateClickRollup.day >= start)
+    if end:
+        filters.append(AffiliateClickRollup.day <= end)
+
+    sums = (
+        func.coalesce(func.sum(AffiliateClickRollup.clicks), 0),
+        func.coalesce(func.sum(AffiliateClickRollup.conversions), 0),
+        func.coalesce(func.sum(AffiliateClickRollup.commission), 0.0),
+    )
+    clicks, conversions, commission = db.session.query(*sums).filter(*filters).one()
+    stats = {
+        'total_clicks': int(clicks),
+        'conversions': int(conversions),
+        'conversion_rate': (conversions / clicks * 100) if clicks else 0,
+        'total_commission': float(commission)
+    }
+
+    if group_by:
+        columns = [GROUP_COLUMNS[name] for name in group_by]
+        rows = (
+            db.session.query(*columns, *sums)
+            .filter(*filters)
+            .group_by(*columns)
+            .order_by(*columns)
+            .all()
+        )
+        stats['groups'] = [
+            dict(
+                {name: (value.isoformat() if isinstance(value, date) else value) for name, value in zip(group_by, row)},
+                clicks=int(row[-3]), conversions=int(row[-2]), commission=float(row[-1])
+            )
+            for row in rows
+        ]
+    return stats
@@ -1,40 +1,30 @@
 import os
-import requests
+from services.http_client import http_client
 import json
-from new_models import Destination
+from services.destination_matcher import destination_matcher
+from services.response_cache import response_cache
 
 class AIEngine:
     def __init__(self):
         self.api_key = os.getenv('OPENAI_API_KEY')
-        self.api_url = "https://api.openai.com/v1/chat/completions"
+        self.api_url = os.getenv('OPENAI_API_URL', "https://api.openai.com/v1/chat/completions")
         self.model = "gpt-4o"
     
-    def generate_response(self, user_message, context=None):
-        """Generate AI response using OpenAI API with local database knowledge"""
-        
-        # 1. Try to find local information first
-        local_info = ""
-        msg_lower = user_message.lower()
-        
+    def match_destinations(self, user_message):
+        """Ids of catalog destinations named in the message (single pass)"""
         try:
-            # Avoid circular import by accessing app context differently
-            from flask import current_app
-            with current_app.app_context():
-                all_dest = Destination.query.all()
-                for d in all_dest:
-                    if d.name.lower() in msg_lower:
-                        local_info += f"\n- We have a featured destination: {d.name}, {d.country}. {d.description} Starting from ${d.price}. Best time to visit: {d.best_time_to_visit or 'Contact us for details'}."
+            return destination_matcher.match(user_message)
         except Exception as e:
-            # Fallback for testing outside of flask context
-            try:
-                from app import app
-                with app.app_context():
-                    all_dest = Destination.query.all()
-                    for d in all_dest:
-                        if d.name.lower() in msg_lower:
-                            local_info += f"\n- Featured destination: {d.name}. {d.description}"
-            except:
-                pass
+            print(f"AI Engine destination lookup error: {e}")
+            return []
+
+    def build_messages(self, user_message, context=None, matched=None):
+        """Build the chat-completions message list. Returns (messages, local_info)."""
+        
+        # 1. Describe every catalog destination named in the message
+        if matched is None:
+            matched = self.match_destinations(user_message)
+        local_info = destination_matcher.local_info(user_message, matched) if matched else ""
 
         # Enhanced system prompt for natural conversation
         system_prompt = f"""You are a knowledgeable and friendly AI travel assistant for World Tour. 
@@ -70,44 +60,144 @@ Guidelines:
             messages.append({"role": "system", "content": f"User Context: {json.dumps(context)}"})
             
         messages.append({"role": "user", "content": user_message})
-        
+        return messages, local_info
+
+    @staticmethod
+    def cache_scope(context):
+        """
+        Cache scope for an answer: the prompt carries a signed-in user's context,
+        so their answers are cached for them alone; guests share one scope.
+        """
+        user_id = (context or {}).get('user_id')
+        return None if user_id in (None, 'guest') else user_id
+
+    def cached_response(self, user_message, matched, bypass_cache=False, scope=None):
+        if bypass_cache or response_cache.is_bypassed_for(scope):
+            response_cache.record_bypass()
+            return None
+        return response_cache.get(user_message, matched, scope)
+
+    def store_response(self, user_message, matched, content, scope=None):
+        if not response_cache.is_bypassed_for(scope):
+            response_cache.set(user_message, matched, content, scope)
+
+    def generate_response(self, user_message, context=None, bypass_cache=False):
+        """Generate AI response using OpenAI API with local database knowledge"""
+        matched = self.match_destinations(user_message)
+        scope = self.cache_scope(context)
+        cached = self.cached_response(user_message, matched, bypass_cache, scope)
+        if cached is not None:
+            return cached
+
+        messages, local_info = self.build_messages(user_message, context, matched)
+
         try:
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}"
-            }
-            
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": 0.7,
-                "max_tokens": 800
-            }
-            
-            response = requests.post(
+            response = http_client.post(
                 self.api_url,
-                headers=headers,
-                json=payload,
+                headers=self._headers(),
+                json=self._payload(messages),
                 timeout=30
             )
             
             if response.status_code == 200:
                 data = response.json()
                 if 'choices' in data and data['choices']:
-                    return data['choices'][0]['message']['content']
+                    content = data['choices'][0]['message']['content']
+                    # Only real completions are cached, never the local fallbacks
+                    self.store_response(user_message, matched, content, scope)
+                    return content
             else:
                 print(f"OpenAI API Error: {response.status_code} - {response.text}")
             
             # If API fails or is slow, return a smart local response
-            if local_info:
-                return f"I'd love to help you with that! Regarding your interest, here's what we have available: {local_info}\n\nWould you like me to book a flight or find a hotel for you there? ✈️"
-            
-            return "That's a great question! I'm seeing some exciting options for you. Most travelers love places like Paris or the Maasai Mara. What kind of vibe are you looking for? 🌍"
+            return self._fallback_response(local_info)
 
         except Exception as e:
             print(f"AI Engine Error: {e}")
+            return self._fallback_response(local_info, connection_error=True)
+
+    def stream_response(self, user_message, context=None, bypass_cache=False):
+        """
+        Yield response text chunks as the upstream API streams them.
+        Falls back to the local answer as a single chunk if the API is unavailable.
+        """
+        matched = self.match_destinations(user_message)
+        scope = self.cache_scope(context)
+        cached = self.cached_response(user_message, matched, bypass_cache, scope)
+        if cached is not None:
+            yield cached
+            return
+
+        messages, local_info = self.build_messages(user_message, context, matched)
+
+        try:
+            response = http_client.post(
+                self.api_url,
+                headers=self._headers(),
+                json=self._payload(messages, stream=True),
+                timeout=(5, 30),
+                stream=True
+            )
+        except Exception as e:
+            print(f"AI Engine Error: {e}")
+            yield self._fallback_response(local_info, connection_error=True)
+            return
+
+        with response:
+            if response.status_code != 200:
+                print(f"OpenAI API Error: {response.status_code} - {response.text}")
+                yield self._fallback_response(local_info)
+                return
+
+            chunks = []
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith('data:'):
+                        continue
+                    data = line[len('data:'):].strip()
+                    if data == '[DONE]':
+                        break
+                    choices = json.loads(data).get('choices') or []
+                    delta = choices[0].get('delta', {}).get('content') if choices else None
+                    if delta:
+                        chunks.append(delta)
+                        yield delta
+            except Exception as e:
+                print(f"AI Engine Stream Error: {e}")
+                if not chunks:
+                    yield self._fallback_response(local_info, connection_error=True)
+                return
+
+            content = ''.join(chunks)
+            if content:
+                self.store_response(user_message, matched, content, scope)
+
+    def _headers(self):
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        }
+
+    def _payload(self, messages, stream=False):
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": 800
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    def _fallback_response(self, local_info, connection_error=False):
+        if connection_error:
             if local_info:
                 return f"I'm experiencing some connectivity issues, but I can tell you that we have great deals for your destination! {local_info}\n\nWould you like more details? 🏨"
             return "I'm having a bit of trouble connecting to my travel database, but I'm here to help! Could you tell me more about where you'd like to go? ✈️"
 
+        if local_info:
+            return f"I'd love to help you with that! Regarding your interest, here's what we have available: {local_info}\n\nWould you like me to book a flight or find a hotel for you there? ✈️"
+
+        return "That's a great question! I'm seeing some exciting options for you. Most travelers love places like Paris or the Maasai Mara. What kind of vibe are you looking for? 🌍"
+
 ai_engine = AIEngine()
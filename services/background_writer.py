@@ -0,0 +1,223 @@
+"""
+Background Writer - Batches fire-and-forget database writes off the request path
+"""
+import fcntl
+import glob
+import json
+import os
+import queue
+import threading
+import time
+
+from sqlalchemy.exc import DataError, IntegrityError
+
+# Errors retrying cannot fix: the rows themselves are bad
+PERMANENT_ERRORS = (IntegrityError, DataError)
+
+
+class BatchWriter:
+    """
+    Collects items on an in-memory queue and hands them to `flush_fn(batch)` on a
+    daemon thread inside an app context. A batch is flushed once it reaches
+    `max_batch` items or `max_delay` seconds after its first item arrived.
+
+    With `retry=True` a batch that fails with a transient error is retried
+    with backoff until it succeeds instead of being dropped. A batch the
+    database rejects outright (PERMANENT_ERRORS) is bisected down to the bad
+    items, which are set aside (`<spool_dir>/<name>.rejected.jsonl`, or
+    logged) so the rest of the batch and everything behind it still gets
+    written. With `spool_dir` every queued item is also appended to a
+    per-process spool file, and spools left behind by dead processes are
+    replayed by the writer thread when it starts, giving at-least-once
+    delivery across crashes and restarts.
+    """
+
+    def __init__(self, name, flush_fn, max_batch=100, max_delay=2.0, max_queue=10000,
+                 retry=False, max_backoff=30.0, spool_dir=None):
+        self.name = name
+        self.flush_fn = flush_fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        # A spool only promises at-least-once if failed batches are retried
+        self.retry = retry or bool(spool_dir)
+        self.max_backoff = max_backoff
+        self.spool_dir = spool_dir
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._app = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._spool = None
+        self._spool_lock = threading.Lock()
+        self._spooled = 0       # lines appended to the current spool file
+        self._flushed = 0       # of those, lines known to be written
+        self.stats = {'queued': 0, 'written': 0, 'dropped': 0, 'failed_batches': 0, 'replayed': 0, 'rejected': 0}
+
+    def _ensure_started(self):
+        from flask import current_app
+        # Flush through whichever app queued last (one per process in production)
+        self._app = current_app._get_current_object()
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                if self.spool_dir:
+                    self._open_spool()
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def submit(self, item):
+        """Queue an item; never blocks the caller"""
+        self._ensure_started()
+        with self._spool_lock:
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self.stats['dropped'] += 1
+                return False
+            if self._spool is not None:
+                # Same lock as the enqueue, so spool order matches queue order
+                self._spool.write(json.dumps(item, default=str) + '\n')
+                self._spool.flush()
+                self._spooled += 1
+        self.stats['queued'] += 1
+        return True
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch):
+        """'written', 'rejected' (permanent error) or 'failed' (worth retrying)"""
+        with self._app.app_context():
+            try:
+                self.flush_fn(batch)
+                self.stats['written'] += len(batch)
+                return 'written'
+            except Exception as e:
+                self.stats['failed_batches'] += 1
+                print(f"{self.name} flush error: {e}")
+                return 'rejected' if isinstance(e, PERMANENT_ERRORS) else 'failed'
+
+    def _deliver(self, batch, retry):
+        """
+        Write a batch, bisecting a rejected one until the bad items are isolated.
+        False when a transient failure is left unretried.
+        """
+        backoff = 0.5
+        while True:
+            outcome = self._flush(batch)
+            if outcome == 'written':
+                return True
+            if outcome == 'rejected':
+                if len(batch) == 1:
+                    self._reject(batch[0])
+                    return True
+                middle = len(batch) // 2
+                return self._deliver(batch[:middle], retry) and self._deliver(batch[middle:], retry)
+            if not retry:
+                return False
+            time.sleep(backoff)
+            backoff = min(self.max_backoff, backoff * 2)
+
+    def _reject(self, item):
+        self.stats['rejected'] += 1
+        line = json.dumps(item, default=str)
+        if not self.spool_dir:
+            print(f"{self.name} rejected item: {line}")
+            return
+        with open(os.path.join(self.spool_dir, f"{self.name}.rejected.jsonl"), 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+    def _write(self, batch):
+        self._deliver(batch, self.retry)
+        if self._spool is not None:
+            self._checkpoint(len(batch))
+
+    def _run(self):
+        if self.spool_dir:
+            self._replay_orphans()
+        while True:
+            batch = self._collect()
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def wait_idle(self, timeout=5.0):
+        """Block until everything queued so far has been flushed"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    # Disk spool: <spool_dir>/<name>-<pid>-<ms>.jsonl holds queued items in order and
+    # <file>.ckpt the number of leading lines already written. Each live process
+    # holds an exclusive flock on its own spool.
+
+    def _spool_path(self):
+        # Start time keeps names unique when a restarted container reuses the pid
+        return os.path.join(self.spool_dir, f"{self.name}-{os.getpid()}-{int(time.time() * 1000)}.jsonl")
+
+    def _open_spool(self):
+        os.makedirs(self.spool_dir, exist_ok=True)
+        path = self._spool_path()
+        self._spool = open(path, 'a', encoding='utf-8')
+        fcntl.flock(self._spool, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._write_checkpoint(path, 0)
+
+    @staticmethod
+    def _write_checkpoint(path, count):
+        tmp = f"{path}.ckpt.tmp"
+        with open(tmp, 'w') as f:
+            f.write(str(count))
+        os.replace(tmp, f"{path}.ckpt")
+
+    def _checkpoint(self, count):
+        path = self._spool.name
+        with self._spool_lock:
+            self._flushed += count
+            if self._flushed >= self._spooled and self._queue.qsize() == 0:
+                # Everything spooled has been written; start the file over
+                self._spool.truncate(0)
+                self._spooled = self._flushed = 0
+            self._write_checkpoint(path, self._flushed)
+
+    def _replay_orphans(self):
+        """Write out items spooled by processes that died before flushing them"""
+        for path in glob.glob(os.path.join(self.spool_dir, f"{self.name}-*.jsonl")):
+            try:
+                handle = open(path, 'r+', encoding='utf-8')
+            except OSError:
+                continue
+            with handle:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    continue    # owner is still alive
+                try:
+                    with open(f"{path}.ckpt") as f:
+                        done = int(f.read().strip() or 0)
+                except (OSError, ValueError):
+                    done = 0
+                items = [json.loads(line) for line in handle.read().splitlines()[done:] if line.strip()]
+                for start in range(0, len(items), self.max_batch):
+                    batch = items[start:start + self.max_batch]
+                    if not self._deliver(batch, retry=False):
+                        # Leave the file for the next process to try again
+                        self._write_checkpoint(path, done + start)
+                        break
+                    self.stats['replayed'] += len(batch)
+                else:
+                    os.remove(path)
+                    if os.path.exists(f"{path}.ckpt"):
+                        os.remove(f"{path}.ckpt")
@@ -0,0 +1,394 @@
+"""
+Catalog Service - Change tracking and precomputed catalog snapshots
+The destination list is served from a pre-serialized snapshot that is rebuilt
+only when Destination rows change. Converted-currency variants are cached per
+(currency, exchange-rate version) on top of it. A snapshot can also be written
+to a file at deploy time and mapped in on boot, so a cold worker serves the
+catalog before it has connected to the database.
+"""
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+
+from flask import Response, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from new_models import Destination, Hotel, Flight
+
+# Models whose writes are broadcast to catalog listeners
+TRACKED_MODELS = {'Destination': Destination, 'Hotel': Hotel, 'Flight': Flight}
+
+# Written by `flask build-catalog-snapshot`, read by DestinationCatalog.load_file()
+SNAPSHOT_FILE = os.environ.get('CATALOG_SNAPSHOT_FILE') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'catalog_snapshot.bin')
+SNAPSHOT_MAGIC = b'WTCATALOG1\n'
+
+_listeners = []
+
+
+def on_catalog_change(callback):
+    """
+    Register callback(changes) to run after a commit touching catalog tables.
+    `changes` maps model name -> set of row ids, or None when the rows are
+    unknown (bulk update/delete).
+    """
+    _listeners.append(callback)
+    return callback
+
+
+def notify_catalog_change(changes):
+    for callback in list(_listeners):
+        try:
+            callback(changes)
+        except Exception as e:
+            print(f"Catalog listener error: {e}")
+
+
+def _record_change(session, model_name, row_id):
+    pending = session.info.setdefault('catalog_changes', {})
+    if model_name in pending and pending[model_name] is None:
+        return
+    pending.setdefault(model_name, set()).add(row_id)
+
+
+def _make_row_listener(model_name):
+    def listener(mapper, connection, target):
+        session = Session.object_session(target)
+        if session is not None:
+            _record_change(session, model_name, target.id)
+    return listener
+
+
+for _name, _model in TRACKED_MODELS.items():
+    for _event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _event_name, _make_row_listener(_name))
+
+
+def _bulk_listener(context):
+    model_name = context.mapper.class_.__name__
+    if model_name in TRACKED_MODELS:
+        context.session.info.setdefault('catalog_changes', {})[model_name] = None
+
+
+event.listen(Session, 'after_bulk_update', _bulk_listener)
+event.listen(Session, 'after_bulk_delete', _bulk_listener)
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session):
+    changes = session.info.pop('catalog_changes', None)
+    if changes:
+        notify_catalog_change(changes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop('catalog_changes', None)
+
+
+def serialize_destination(d):
+    return {
+        'id': d.id,
+        'name': d.name,
+        'country': d.country,
+        'image_url': d.image_url,
+        'price': d.price,
+        'rating': d.rating or 4.5,
+        'category': d.category,
+        'quote': d.quote,
+        'latitude': d.latitude,
+        'longitude': d.longitude
+    }
+
+
+def serialize_hotel(h):
+    return {
+        'id': h.id,
+        'name': h.name,
+        'location': h.location,
+        'price': h.price,
+        'rating': h.rating,
+        'image_url': h.image_url,
+        'description': h.description,
+        'destination_id': h.destination_id
+    }
+
+
+def serialize_flight(f):
+    return {
+        'id': f.id,
+        'airline': f.airline,
+        'origin': f.origin,
+        'destination': f.destination,
+        'price': f.price,
+        'departure': f.departure_time.strftime('%I:%M %p') if f.departure_time else '10:00 AM',
+        'departure_time': f.departure_time.isoformat() if f.departure_time else None,
+        'duration': f.duration
+    }
+
+
+def parse_currency(value):
+    """'eur' -> 'EUR'; None when absent. Raises ValueError for codes we have no rate for."""
+    from services.currency import currency_service
+
+    if value in (None, ''):
+        return None
+    code = value.strip().upper()
+    if code not in currency_service.get_rates():
+        raise ValueError(f"unsupported currency: {value}")
+    return code
+
+
+def convert_prices(items, currency):
+    """Copies of serialized catalog items with 'price' converted from USD in one pass"""
+    from services.currency import currency_service
+
+    prices = currency_service.convert_many([item.get('price') for item in items], 'USD', currency)
+    return [dict(item, price=price, currency=currency) for item, price in zip(items, prices)]
+
+
+class CatalogSnapshot:
+    """Immutable, pre-serialized view of the catalog"""
+
+    def __init__(self, version, payload):
+        self.version = version
+        self.payload = payload
+        self.body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        self.gzip_body = gzip.compress(self.body, compresslevel=6)
+        # Content-derived so every worker hands out the same ETag for the same catalog
+        self.etag = hashlib.sha1(self.body).hexdigest()[:20]
+        self.built_at = time.time()
+
+    def to_response(self, max_age=60):
+        """Serve the snapshot, honouring If-None-Match and Accept-Encoding"""
+        if request.if_none_match.contains(self.etag):
+            response = Response(status=304)
+        elif request.accept_encodings['gzip']:
+            response = Response(self.gzip_body, mimetype='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = Response(self.body, mimetype='application/json')
+
+        response.set_etag(self.etag)
+        response.headers['Cache-Control'] = f'public, max-age={max_age}'
+        response.vary.add('Accept-Encoding')
+        return response
+
+
+class MappedSnapshot(CatalogSnapshot):
+    """
+    Snapshot served straight from a memory-mapped snapshot file: body and
+    gzip_body are slices of the mapping, so pages are read in on first use and
+    shared between processes mapping the same file. The payload is only
+    parsed if a currency conversion needs it.
+    """
+
+    def __init__(self, version, etag, mapped, body_range, gzip_range):
+        self.version = version
+        self.etag = etag
+        self._mapped = mapped       # kept open for the life of the snapshot
+        self._body_range = body_range
+        self._gzip_range = gzip_range
+        # Fresh from load time: max_age bounds how long a booted worker trusts the file
+        self.built_at = time.time()
+        self._payload = None
+
+    @property
+    def body(self):
+        return self._mapped[slice(*self._body_range)]
+
+    @property
+    def gzip_body(self):
+        return self._mapped[slice(*self._gzip_range)]
+
+    @property
+    def payload(self):
+        if self._payload is None:
+            self._payload = json.loads(self.body)
+        return self._payload
+
+
+def write_snapshot_file(snapshot, path, shared_version=None):
+    """
+    Layout: magic line, JSON header line, body, gzip body. Written to a temp
+    file and renamed so a reader never sees half a snapshot.
+    """
+    header = {
+        'version': snapshot.version,
+        'etag': snapshot.etag,
+        'shared_version': shared_version,
+        'built_at': snapshot.built_at,
+        'body_length': len(snapshot.body),
+        'gzip_length': len(snapshot.gzip_body),
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(json.dumps(header, separators=(',', ':')).encode('utf-8') + b'\n')
+        f.write(snapshot.body)
+        f.write(snapshot.gzip_body)
+    os.replace(tmp_path, path)
+    return header
+
+
+def read_snapshot_file(path):
+    """(header, MappedSnapshot) from a snapshot file, or None when it is missing or malformed"""
+    mapped = None
+    try:
+        with open(path, 'rb') as f:
+            # The mapping outlives the file object; a later rewrite (os.replace) leaves it intact
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError('not a catalog snapshot')
+        header_end = mapped.find(b'\n', len(SNAPSHOT_MAGIC))
+        header = json.loads(mapped[len(SNAPSHOT_MAGIC):header_end])
+        start = header_end + 1
+        middle = start + header['body_length']
+        end = middle + header['gzip_length']
+        if end != len(mapped):
+            raise ValueError('truncated catalog snapshot')
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        if mapped is not None:
+            mapped.close()
+        print(f"Catalog Snapshot File Error: {e}")
+        return None
+    return header, MappedSnapshot(header['version'], header['etag'], mapped, (start, middle), (middle, end))
+
+
+class DestinationCatalog:
+    """
+    Versioned in-memory snapshot of available destinations.
+    Local writes invalidate it through the commit hook above. Writes from other
+    workers are picked up through a shared version counter in Redis when
+    REDIS_URL is set, otherwise through a maximum snapshot age.
+    """
+    VERSION_KEY = 'catalog:destinations:version'
+
+    def __init__(self, max_age=None, check_interval=1.0):
+        self.max_age = max_age if max_age is not None else int(os.environ.get('CATALOG_SNAPSHOT_TTL', 300))
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._local_version = 0
+        self._shared_version = None
+        self._checked_at = 0.0
+        self._dirty = True
+        self._converted = {}    # (currency, rates version) -> CatalogSnapshot of the current base
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        from services.redis_client import get_redis
+
+        self._local_version += 1
+        self._dirty = True
+        client = get_redis()
+        if client is not None:
+            try:
+                client.incr(self.VERSION_KEY)
+            except Exception as e:
+                print(f"Catalog Redis Error: {e}")
+
+    def _read_shared_version(self):
+        from services.redis_client import get_redis
+
+        client = get_redis()
+        if client is None:
+            return None
+        try:
+            value = client.get(self.VERSION_KEY)
+            return int(value) if value is not None else 0
+        except Exception as e:
+            print(f"Catalog Redis Error: {e}")
+            return None
+
+    def _is_stale(self):
+        if self._dirty or self._snapshot is None:
+            return True
+        now = time.time()
+        if self.max_age and now - self._snapshot.built_at > self.max_age:
+            return True
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            shared = self._read_shared_version()
+            if shared is not None and shared != self._shared_version:
+                self._dirty = True
+                return True
+        return False
+
+    def build(self):
+        rows = Destination.query.filter_by(available=True).order_by(Destination.id).all()
+        self._shared_version = self._read_shared_version()
+        version = f"{self._local_version}.{self._shared_version or 0}"
+        return CatalogSnapshot(version, [serialize_destination(d) for d in rows])
+
+    def save_file(self, path=None):
+        """Build from the database and write a snapshot file (deploy step); returns its header"""
+        snapshot = self.build()
+        return write_snapshot_file(snapshot, path or SNAPSHOT_FILE, self._shared_version)
+
+    def load_file(self, path=None):
+        """
+        Serve a snapshot file until the first local change, shared version bump
+        or max_age, without querying the database. False when the file is
+        missing, unreadable, or older than a change already recorded in Redis.
+        """
+        loaded = read_snapshot_file(path or SNAPSHOT_FILE)
+        if loaded is None:
+            return False
+        header, snapshot = loaded
+        shared = self._read_shared_version()
+        if shared is not None and header.get('shared_version') is not None and shared != header['shared_version']:
+            return False
+        with self._lock:
+            self._snapshot = snapshot
+            self._converted = {}
+            self._shared_version = shared
+            self._checked_at = time.time()
+            self._dirty = False
+        return True
+
+    def get_snapshot(self, currency=None):
+        """USD snapshot, or a converted copy cached until the catalog or the rates change"""
+        if self._is_stale():
+            with self._lock:
+                if self._is_stale():
+                    self._dirty = False
+                    self._snapshot = self.build()
+                    self._converted = {}
+        base = self._snapshot
+        if not currency or currency == 'USD':
+            return base
+
+        from services.currency import currency_service
+        key = (currency, currency_service.version)
+        snapshot = self._converted.get(key)
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            # Concurrent first requests for a currency build its copy once
+            converted = self._converted
+            snapshot = converted.get(key)
+            if snapshot is None or self._snapshot is not base:
+                snapshot = CatalogSnapshot(f"{base.version}:{currency}:{key[1]}", convert_prices(base.payload, currency))
+                if self._snapshot is base:
+                    if len(converted) >= 64:
+                        # Entries for superseded rate versions; cheap to rebuild
+                        converted.clear()
+                    converted[key] = snapshot
+        return snapshot
+
+
+destination_catalog = DestinationCatalog()
+
+
+@on_catalog_change
+def _invalidate_destinations(changes):
+    if 'Destination' in changes:
+        destination_catalog.invalidate()
@@ -0,0 +1,167 @@
+"""
+City Resolver - Maps destination names to LiteAPI city ids
+Lookups go through an in-process LRU, then the liteapi_city table, and only
+then the /hotels/cities API. Misses are remembered too, with a shorter TTL,
+so unknown names stop costing an upstream call on every search.
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from flask import has_app_context
+
+from services.search_index import normalize
+
+# Ids we have verified by hand; they never expire
+CURATED_CITY_IDS = {
+    'paris': '10471',
+    'london': '15538',
+    'new york': '11162',
+    'dubai': '12411',
+    'tokyo': '12517',
+    'nairobi': '11264',
+    'mombasa': '11265',
+    'diani': '11266',
+    'bali': '12518',
+    'santorini': '10472'
+}
+
+
+def city_key(name):
+    """'  New-York ' -> 'new york'"""
+    return ' '.join(re.findall(r'[a-z0-9]+', normalize(name or '')))
+
+
+class CityResolver:
+    def __init__(self, lookup, max_entries=None, ttl=None, negative_ttl=None):
+        # lookup(name) -> city id or None; raises on transport errors
+        self.lookup = lookup
+        self.max_entries = max_entries or int(os.environ.get('CITY_CACHE_SIZE', 2000))
+        self.ttl = ttl or int(os.environ.get('CITY_CACHE_TTL', 30 * 86400))
+        self.negative_ttl = negative_ttl or int(os.environ.get('CITY_CACHE_NEGATIVE_TTL', 86400))
+        self._entries = OrderedDict()   # key -> (city_id or None, expires_at or None)
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'db_hits': 0, 'api_lookups': 0, 'negative_hits': 0}
+        for key, city_id in CURATED_CITY_IDS.items():
+            self._remember(key, city_id, None)
+
+    def _remember(self, key, city_id, expires_at):
+        with self._lock:
+            self._entries[key] = (city_id, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _from_memory(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[1] is not None and entry[1] <= time.time():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[0]
+
+    def _expires_at(self, city_id, resolved_at):
+        ttl = self.ttl if city_id else self.negative_ttl
+        return (resolved_at or datetime.utcnow()) + timedelta(seconds=ttl)
+
+    def _from_db(self, key):
+        from new_models import LiteAPICity
+        if not has_app_context():
+            return False, None
+        try:
+            row = LiteAPICity.query.filter_by(name_key=key).first()
+        except Exception as e:
+            print(f"City cache read error: {e}")
+            return False, None
+        if row is None:
+            return False, None
+        if row.source != 'curated':
+            expires = self._expires_at(row.city_id, row.resolved_at)
+            if expires <= datetime.utcnow():
+                return False, None
+            remaining = (expires - datetime.utcnow()).total_seconds()
+            self._remember(key, row.city_id, time.time() + remaining)
+        else:
+            self._remember(key, row.city_id, None)
+        return True, row.city_id
+
+    def _store(self, key, city_id, source='api'):
+        from db import db
+        from new_models import LiteAPICity
+        ttl = self.ttl if city_id else self.negative_ttl
+        self._remember(key, city_id, None if source == 'curated' else time.time() + ttl)
+        if not has_app_context():
+            return
+        try:
+            row = LiteAPICity.query.filter_by(name_key=key).first()
+            if row is None:
+                row = LiteAPICity(name_key=key)
+                db.session.add(row)
+            row.city_id = city_id
+            row.source = source
+            row.resolved_at = datetime.utcnow()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"City cache write error: {e}")
+
+    def resolve(self, name):
+        """City id for name, or None when LiteAPI has no such city"""
+        key = city_key(name)
+        if not key:
+            return None
+
+        found, city_id = self._from_memory(key)
+        if found:
+            self.stats['memory_hits' if city_id else 'negative_hits'] += 1
+            return city_id
+
+        found, city_id = self._from_db(key)
+        if found:
+            self.stats['db_hits' if city_id else 'negative_hits'] += 1
+            return city_id
+
+        self.stats['api_lookups'] += 1
+        try:
+            city_id = self.lookup(name)
+        except Exception as e:
+            # Transport failures are not evidence the city is unknown; don't cache them
+            print(f"City lookup error: {e}")
+            return None
+        self._store(key, str(city_id) if city_id else None)
+        return str(city_id) if city_id else None
+
+    def prewarm(self):
+        """Resolve every destination in the catalog; returns {'resolved', 'missing', 'cached'}"""
+        from new_models import Destination
+
+        counts = {'resolved': 0, 'missing': 0, 'cached': 0}
+        for key, city_id in CURATED_CITY_IDS.items():
+            found, _ = self._from_db(key)
+            if not found:
+                self._store(key, city_id, source='curated')
+
+        for (name,) in Destination.query.with_entities(Destination.name).distinct():
+            key = city_key(name)
+            if not key:
+                continue
+            found, _ = self._from_memory(key)
+            if not found:
+                found, _ = self._from_db(key)
+            if found:
+                counts['cached'] += 1
+                continue
+            counts['resolved' if self.resolve(name) else 'missing'] += 1
+        return counts
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        for key, city_id in CURATED_CITY_IDS.items():
+            self._remember(key, city_id, None)
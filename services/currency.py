@@ -1,66 +1,127 @@
-import requests
-from datetime import datetime, timedelta
-import json
+from services.http_client import http_client
+from services.shared_store import shared_store
+from datetime import datetime
+import os
+import random
+import threading
+import time
+
+# Used until the first successful fetch lands in the shared store
+FALLBACK_RATES = {
+    'USD': 1.0,
+    'EUR': 0.85,
+    'GBP': 0.73,
+    'JPY': 110.5,
+    'AUD': 1.35,
+    'CAD': 1.25,
+    'CHF': 0.92,
+    'CNY': 6.45,
+    'INR': 74.5,
+    'KES': 130.0,
+    'ZAR': 18.5
+}
 
 class CurrencyService:
-    def __init__(self):
+    """
+    Exchange rates (USD base) kept fresh by a background refresher.
+    The refresher publishes versioned snapshots to the shared store so every
+    worker reads the same rates; readers only ever touch memory or the
+    store, never the upstream API.
+    """
+    STORE_KEY = 'currency:rates'
+    LOCK_KEY = 'currency:rates:lock'
+    VERSION_KEY = 'currency:rates:version'
+
+    def __init__(self, fetch=None, refresh_interval=None, sync_interval=60):
         self.api_url = "https://api.exchangerate-api.com/v4/latest/USD"
+        self._fetch = fetch or self.fetch_rates
+        self.refresh_interval = refresh_interval or int(os.environ.get('CURRENCY_REFRESH_INTERVAL', 6 * 3600))
+        self.sync_interval = sync_interval      # how often readers re-check the shared snapshot
         self.rates = {}
+        self.version = 0
         self.last_update = None
-        self.cache_duration = timedelta(hours=24)
-    
-    def get_rates(self):
-        """Get exchange rates, using cache if available"""
-        now = datetime.now()
-        
-        # Check if cache is still valid
-        if self.rates and self.last_update and (now - self.last_update) < self.cache_duration:
-            return self.rates
-        
-        # Fetch new rates
+        self._synced_at = 0.0
+        self._refresher = None
+        self._lock = threading.Lock()
+
+    def fetch_rates(self):
+        response = http_client.get(self.api_url, timeout=10)
+        response.raise_for_status()
+        return response.json().get('rates', {})
+
+    def _apply(self, snapshot):
+        if snapshot and snapshot.get('rates') and snapshot.get('version') != self.version:
+            self.rates = snapshot['rates']
+            self.version = snapshot['version']
+            self.last_update = datetime.fromtimestamp(snapshot['fetched_at'])
+
+    def _sync(self, force=False):
+        now = time.time()
+        if force or now - self._synced_at >= self.sync_interval:
+            self._synced_at = now
+            self._apply(shared_store.get_json(self.STORE_KEY))
+
+    def refresh(self, force=False):
+        """Fetch and publish new rates unless another worker did so recently; returns True on publish"""
+        self._sync(force=True)
+        if not force and self.last_update and time.time() - self.last_update.timestamp() < self.refresh_interval:
+            return False
+        if not shared_store.add(self.LOCK_KEY, '1', ttl=60):
+            return False
         try:
-            response = requests.get(self.api_url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            self.rates = data.get('rates', {})
-            self.last_update = now
-            
-            return self.rates
+            rates = self._fetch()
+            if not rates:
+                return False
+            snapshot = {'version': shared_store.incr(self.VERSION_KEY), 'rates': rates, 'fetched_at': time.time()}
+            shared_store.set_json(self.STORE_KEY, snapshot)
+            self._apply(snapshot)
+            return True
         except Exception as e:
             print(f"Error fetching exchange rates: {e}")
-            # Return cached rates if available, otherwise default rates
-            if self.rates:
-                return self.rates
-            
-            # Fallback rates if API fails
-            return {
-                'USD': 1.0,
-                'EUR': 0.85,
-                'GBP': 0.73,
-                'JPY': 110.5,
-                'AUD': 1.35,
-                'CAD': 1.25,
-                'CHF': 0.92,
-                'CNY': 6.45,
-                'INR': 74.5,
-                'KES': 130.0,
-                'ZAR': 18.5
-            }
-    
+            return False
+        finally:
+            shared_store.delete(self.LOCK_KEY)
+
+    def _run(self):
+        while True:
+            self.refresh()
+            # Retry soon while we have no real rates; jitter keeps workers from waking in lockstep
+            interval = 60 if not self.rates else min(self.refresh_interval, 3600)
+            time.sleep(interval * random.uniform(0.8, 1.0))
+
+    def start_refresher(self):
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        with self._lock:
+            if self._refresher is None or not self._refresher.is_alive():
+                self._refresher = threading.Thread(target=self._run, name='currency-refresher', daemon=True)
+                self._refresher.start()
+
+    def get_rates(self):
+        """Current rates; never blocks on the network (fallback rates until the first fetch lands)"""
+        self.start_refresher()
+        self._sync()
+        return self.rates or FALLBACK_RATES
+
+    def rate(self, from_currency='USD', to_currency='USD', rates=None):
+        """Multiplier taking an amount in from_currency to to_currency"""
+        if from_currency == to_currency:
+            return 1.0
+        rates = rates or self.get_rates()
+        return rates.get(to_currency, 1.0) / rates.get(from_currency, 1.0)
+
     def convert(self, amount, from_currency='USD', to_currency='USD'):
         """Convert amount from one currency to another"""
-        rates = self.get_rates()
-        
         if from_currency == to_currency:
             return amount
-        
-        # Convert to USD first if needed
-        if from_currency != 'USD':
-            amount = amount / rates.get(from_currency, 1.0)
-        
-        # Convert from USD to target currency
-        return amount * rates.get(to_currency, 1.0)
+        return amount * self.rate(from_currency, to_currency)
+
+    def convert_many(self, amounts, from_currency='USD', to_currency='USD', ndigits=2):
+        """Convert a list of amounts with a single rate lookup; None entries pass through"""
+        factor = self.rate(from_currency, to_currency)
+        if ndigits is None:
+            return [None if a is None else a * factor for a in amounts]
+        return [None if a is None else round(a * factor, ndigits) for a in amounts]
 
 # Global instance
 currency_service = CurrencyService()
@@ -0,0 +1,138 @@
+"""
+Destination Matcher - Finds every destination mentioned in a chat message
+An Aho-Corasick automaton over destination names scans the message once,
+regardless of how many destinations are in the catalog.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from services.catalog import on_catalog_change
+from services.search_index import normalize
+
+
+class AhoCorasick:
+    """Multi-pattern matcher; patterns map to arbitrary values"""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]     # state -> [(pattern_length, value)]
+        for pattern, value in patterns.items():
+            self._add(pattern, value)
+        self._build()
+
+    def _add(self, pattern, value):
+        state = 0
+        for char in pattern:
+            nxt = self.goto[state].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][char] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = nxt
+        self.output[state].append((len(pattern), value))
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(char, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def find_all(self, text):
+        """Yield (start, end, value) for every pattern occurrence in text"""
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for length, value in self.output[state]:
+                yield i - length + 1, i + 1, value
+
+
+def _is_boundary(text, index):
+    return index < 0 or index >= len(text) or not text[index].isalnum()
+
+
+def featured_snippet(d):
+    return (
+        f"\n- We have a featured destination: {d.name}, {d.country}. {d.description} "
+        f"Starting from ${d.price}. Best time to visit: {d.best_time_to_visit or 'Contact us for details'}."
+    )
+
+
+class DestinationMatcher:
+    """
+    Cached automaton plus per-destination prompt snippets. Rebuilt after
+    destination commits, or after max_age seconds to pick up other workers.
+    """
+
+    def __init__(self, max_age=None):
+        self.max_age = max_age if max_age is not None else int(os.environ.get('CATALOG_SNAPSHOT_TTL', 300))
+        self._automaton = None
+        self._snippets = {}
+        self._built_at = 0.0
+        self._dirty = True
+        self._lock = threading.Lock()
+
+    def invalidate(self, changes=None):
+        if changes is None or 'Destination' in changes:
+            self._dirty = True
+
+    def _build(self):
+        from new_models import Destination
+
+        patterns, snippets = {}, {}
+        for d in Destination.query.filter_by(available=True).all():
+            name = normalize(d.name).strip()
+            if not name:
+                continue
+            patterns[name] = d.id
+            snippets[d.id] = featured_snippet(d)
+        return AhoCorasick(patterns), snippets
+
+    def _ensure_fresh(self):
+        expired = self.max_age and time.time() - self._built_at > self.max_age
+        if self._dirty or self._automaton is None or expired:
+            with self._lock:
+                if self._dirty or self._automaton is None or expired:
+                    self._dirty = False
+                    self._automaton, self._snippets = self._build()
+                    self._built_at = time.time()
+
+    def match(self, message):
+        """Ids of destinations named in message, in order of first mention"""
+        self._ensure_fresh()
+        text = normalize(message)
+
+        spans = []
+        for start, end, dest_id in self._automaton.find_all(text):
+            if _is_boundary(text, start - 1) and _is_boundary(text, end):
+                spans.append((start, end, dest_id))
+
+        # Drop names nested inside a longer mention ("York" within "New York")
+        found = []
+        for start, end, dest_id in spans:
+            nested = any(s <= start and end <= e and (e - s) > (end - start) for s, e, _ in spans)
+            if not nested and dest_id not in found:
+                found.append(dest_id)
+        return found
+
+    def local_info(self, message, matched=None):
+        """Prompt snippet describing every destination mentioned in message"""
+        if matched is None:
+            matched = self.match(message)
+        return ''.join(self._snippets[dest_id] for dest_id in matched if dest_id in self._snippets)
+
+
+destination_matcher = DestinationMatcher()
+on_catalog_change(destination_matcher.invalidate)
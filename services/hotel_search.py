@@ -0,0 +1,233 @@
+"""
+Hotel Search Aggregator - Fans a live hotel search out to every provider
+LiteAPI and Hotelbeds are queried concurrently while the local Hotel table is
+searched on the request thread. Whatever has arrived when the global deadline
+passes is de-duplicated and merge-ranked; slow providers are simply left out.
+"""
+import math
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from flask import current_app, has_app_context
+
+from services.search_index import normalize
+from services.shared_store import MemoryStore, SharedStore
+from services.swr_cache import SWRCache
+
+# Words that vary between providers for the same property
+NAME_NOISE = {'the', 'hotel', 'hotels', 'resort', 'and', 'spa', 'by', 'a', 'an', 'de', 'la', 'le'}
+SAME_PLACE_KM = 1.0
+
+_executor = ThreadPoolExecutor(max_workers=int(os.environ.get('HOTEL_SEARCH_WORKERS', 16)),
+                               thread_name_prefix='hotel-search')
+
+
+def normalize_hotel_name(name):
+    tokens = re.findall(r'[a-z0-9]+', normalize(name))
+    return ' '.join(t for t in tokens if t not in NAME_NOISE) or ' '.join(tokens)
+
+
+def search_key(destination, guests, checkin, checkout):
+    """'  New-York ', '2', '2026-11-01', None -> 'new york|2|2026-11-01|'"""
+    from services.city_resolver import city_key
+    try:
+        guests = int(guests)
+    except (TypeError, ValueError):
+        guests = 2
+    return '|'.join([city_key(destination), str(guests), (checkin or '').strip(), (checkout or '').strip()])
+
+
+def distance_km(a, b):
+    """Haversine distance between two (lat, lng) pairs"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(h))
+
+
+def _coords(hotel):
+    try:
+        return float(hotel['latitude']), float(hotel['longitude'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def search_liteapi(destination, guests, checkin, checkout):
+    from services.liteapi_service import liteapi_service
+    return liteapi_service.search_hotels(destination, guests, checkin, checkout)
+
+
+def search_hotelbeds(destination, guests, checkin, checkout):
+    from services.hotelbeds_service import hotelbeds_service
+    code = hotelbeds_service.destination_code(destination)
+    if not code or not checkin or not checkout:
+        # Hotelbeds availability needs a destination code and concrete dates
+        return []
+    return hotelbeds_service.search_hotels(code, checkin, checkout, int(guests))
+
+
+def search_local(destination):
+    from new_models import Destination, Hotel
+    from services.catalog import serialize_hotel
+
+    # Wildcards typed by the user match literally
+    escaped = destination.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    pattern = f"%{escaped}%"
+    rows = (
+        Hotel.query
+        .outerjoin(Destination, Hotel.destination_id == Destination.id)
+        .filter(Hotel.available.is_(True))
+        .filter(Hotel.location.ilike(pattern, escape='\\') | Destination.name.ilike(pattern, escape='\\'))
+        .limit(50)
+        .all()
+    )
+    return [serialize_hotel(h) for h in rows]
+
+
+def _call_with_app(app, fn, *args):
+    # Providers may read cached lookups from the database
+    if app is None:
+        return fn(*args)
+    with app.app_context():
+        return fn(*args)
+
+
+REMOTE_PROVIDERS = {
+    'liteapi': search_liteapi,
+    'hotelbeds': search_hotelbeds,
+}
+
+
+def _price(value):
+    """Provider price as a float ('123.40' from Hotelbeds minRate included); None when unusable"""
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def merge_results(results_by_provider):
+    """
+    De-duplicate hotels offered by several providers (same normalised name,
+    and within SAME_PLACE_KM when both sides have coordinates), keeping the
+    cheapest offer and recording every provider that listed it. Prices come
+    out as floats (or None).
+    """
+    merged = []
+    by_name = {}
+    for provider, hotels in results_by_provider.items():
+        for hotel in hotels or []:
+            if not hotel or not hotel.get('name'):
+                continue
+            key = normalize_hotel_name(hotel['name'])
+            price = _price(hotel.get('price'))
+            offer = {'provider': provider, 'id': hotel.get('id'), 'price': price}
+            match = None
+            for existing in by_name.get(key, []):
+                a, b = _coords(existing), _coords(hotel)
+                if a is None or b is None or distance_km(a, b) <= SAME_PLACE_KM:
+                    match = existing
+                    break
+
+            if match is None:
+                entry = dict(hotel, price=price, sources=[provider], offers=[offer])
+                by_name.setdefault(key, []).append(entry)
+                merged.append(entry)
+                continue
+
+            match['offers'].append(offer)
+            if provider not in match['sources']:
+                match['sources'].append(provider)
+            if price is not None and (match.get('price') is None or price < match['price']):
+                match['price'] = price
+            for field in ('image_url', 'description', 'latitude', 'longitude', 'rating'):
+                if match.get(field) is None and hotel.get(field) is not None:
+                    match[field] = hotel[field]
+    return merged
+
+
+def rank_results(hotels):
+    """Higher rating first, more providers confirming it next, then cheaper"""
+    def score(h):
+        try:
+            rating = float(h.get('rating') or 0)
+        except (TypeError, ValueError):
+            rating = 0.0
+        price = h.get('price')
+        return (-rating, -len(h.get('sources', ())), price if isinstance(price, (int, float)) else math.inf)
+    return sorted(hotels, key=score)
+
+
+def _cache_store():
+    # HOTEL_CACHE_BACKEND=memory keeps results per process even when Redis is configured
+    if os.environ.get('HOTEL_CACHE_BACKEND', '').lower() == 'memory':
+        return SharedStore(MemoryStore())
+    return None
+
+
+class HotelSearchAggregator:
+    def __init__(self, deadline=None):
+        self.deadline = deadline or float(os.environ.get('HOTEL_SEARCH_DEADLINE', 4.0))
+        self.cache = SWRCache(
+            'hotels',
+            ttl=int(os.environ.get('HOTEL_CACHE_TTL', 120)),
+            stale_ttl=int(os.environ.get('HOTEL_CACHE_STALE_TTL', 600)),
+            store=_cache_store()
+        )
+        self.partial_ttl = int(os.environ.get('HOTEL_CACHE_PARTIAL_TTL', 20))
+
+    def _ttl_for(self, result):
+        _, status = result
+        if not any(state == 'ok' for state in status.values()):
+            return 0
+        # Keep results missing a provider only briefly so the next search can fill them in
+        return None if all(state == 'ok' for state in status.values()) else min(self.partial_ttl, self.cache.ttl)
+
+    def cached_search(self, destination, guests=2, checkin=None, checkout=None):
+        """search() behind the result cache; returns (hotels, provider_status, cache_state)"""
+        key = search_key(destination, guests, checkin, checkout)
+        (hotels, status), state = self.cache.get(
+            key, lambda: self.search(destination, guests, checkin, checkout), self._ttl_for
+        )
+        return hotels, status, state
+
+    def search(self, destination, guests=2, checkin=None, checkout=None, deadline=None):
+        """Returns (hotels, provider_status) where status is ok/error/timeout per provider"""
+        started = time.monotonic()
+        budget = deadline or self.deadline
+
+        app = current_app._get_current_object() if has_app_context() else None
+        futures = {
+            _executor.submit(_call_with_app, app, fn, destination, guests, checkin, checkout): name
+            for name, fn in REMOTE_PROVIDERS.items()
+        }
+
+        results, status = {}, {}
+        try:
+            results['local'] = search_local(destination)
+            status['local'] = 'ok'
+        except Exception as e:
+            print(f"Local hotel search error: {e}")
+            status['local'] = 'error'
+
+        remaining = max(0.0, budget - (time.monotonic() - started))
+        done, pending = wait(futures, timeout=remaining)
+        for future in done:
+            name = futures[future]
+            try:
+                results[name] = future.result() or []
+                status[name] = 'ok'
+            except Exception as e:
+                print(f"{name} hotel search error: {e}")
+                status[name] = 'error'
+        for future in pending:
+            # Left running in the pool; its result is discarded
+            status[futures[future]] = 'timeout'
+
+        # Remote providers first so live offers win ties over catalog rows
+        ordered = {name: results[name] for name in list(REMOTE_PROVIDERS) + ['local'] if name in results}
+        return rank_results(merge_results(ordered)), status
+
+
+hotel_search = HotelSearchAggregator()
@@ -1,4 +1,4 @@
-import requests
+from services.http_client import http_client
 import time
 import hashlib
 import os
@@ -29,6 +29,26 @@ class HotelbedsService:
             headers["X-Signature"] = signature
         return headers
 
+    # Hotelbeds destination codes for the cities we feature most
+    DESTINATION_CODES = {
+        'paris': 'PAR',
+        'london': 'LON',
+        'new york': 'NYC',
+        'dubai': 'DXB',
+        'tokyo': 'TYO',
+        'nairobi': 'NBO',
+        'mombasa': 'MBA',
+        'bali': 'BAI',
+        'santorini': 'JTR'
+    }
+
+    def destination_code(self, destination_name):
+        """Map a city name to a Hotelbeds destination code; accepts raw 3-letter codes"""
+        name = (destination_name or '').strip()
+        if len(name) == 3 and name.isalpha() and name.isupper():
+            return name
+        return self.DESTINATION_CODES.get(name.lower())
+
     def search_hotels(self, destination_code, checkin, checkout, guests=2):
         """
         Search for hotels using Hotelbeds API.
@@ -57,7 +77,7 @@ class HotelbedsService:
         }
 
         try:
-            response = requests.post(url, headers=self.get_headers(), json=payload)
+            response = http_client.post(url, headers=self.get_headers(), json=payload)
             data = response.json()
             
             if data.get('hotels') and data['hotels'].get('hotels'):
@@ -85,7 +105,9 @@ class HotelbedsService:
                         'price': h.get('minRate', 120),
                         'rating': float(h.get('categoryCode', '4').replace('ST', '')),
                         'image_url': image_url,
-                        'description': 'Luxury stay via Hotelbeds'
+                        'description': 'Luxury stay via Hotelbeds',
+                        'latitude': h.get('latitude'),
+                        'longitude': h.get('longitude')
                     })
                 return results
             
@@ -0,0 +1,215 @@
+"""
+HTTP Client - Shared outbound client for every third-party integration
+Keeps one pooled keep-alive session per host, applies default timeouts,
+retries with jittered exponential backoff, trips a per-host circuit breaker
+after repeated failures and records per-host latency/error metrics.
+"""
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+DEFAULT_TIMEOUT = (3.05, 10)            # (connect, read) seconds
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+RETRY_STATUSES = {502, 503, 504}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without touching the network while a host's circuit is open"""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._trial_in_flight:
+                # Let a single trial request through to probe the host
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """End a trial that produced no verdict on the host (e.g. a non-network error)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+
+class HostMetrics:
+    __slots__ = ('requests', 'errors', 'retries', 'short_circuited', 'total_ms', 'max_ms')
+
+    def __init__(self):
+        self.requests = self.errors = self.retries = self.short_circuited = 0
+        self.total_ms = self.max_ms = 0.0
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'short_circuited': self.short_circuited,
+            'avg_ms': round(self.total_ms / self.requests, 2) if self.requests else 0.0,
+            'max_ms': round(self.max_ms, 2)
+        }
+
+
+def _connect_failed(error):
+    """True when the request never reached the server, so any method is safe to retry"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class HttpClient:
+    def __init__(self, pool_size=20, max_retries=2, backoff_base=0.2, backoff_cap=2.0,
+                 failure_threshold=5, reset_timeout=30.0):
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url):
+        host = urlsplit(url).netloc
+        entry = self._hosts.get(host)
+        if entry is None:
+            with self._lock:
+                entry = self._hosts.get(host)
+                if entry is None:
+                    session = requests.Session()
+                    # urllib3 retries are disabled; retry policy lives in request()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    entry = {
+                        'session': session,
+                        'breaker': CircuitBreaker(self.failure_threshold, self.reset_timeout),
+                        'metrics': HostMetrics(),
+                        'lock': threading.Lock()
+                    }
+                    self._hosts[host] = entry
+        return host, entry
+
+    def _backoff(self, attempt):
+        # Full jitter: sleep a random amount up to the exponential ceiling
+        ceiling = min(self.backoff_cap, self.backoff_base * (2 ** attempt))
+        time.sleep(random.uniform(0, ceiling))
+
+    def _record(self, entry, elapsed_ms, failed, retried=False):
+        metrics = entry['metrics']
+        with entry['lock']:
+            metrics.requests += 1
+            metrics.total_ms += elapsed_ms
+            metrics.max_ms = max(metrics.max_ms, elapsed_ms)
+            if failed:
+                metrics.errors += 1
+            if retried:
+                metrics.retries += 1
+
+    def request(self, method, url, retries=None, **kwargs):
+        """
+        Send a request through the host's pooled session.
+        Idempotent methods are retried on connection errors and 502/503/504;
+        other methods only when the connection was never established.
+        """
+        method = method.upper()
+        kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+        max_retries = self.max_retries if retries is None else retries
+        host, entry = self._host(url)
+        breaker = entry['breaker']
+
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                with entry['lock']:
+                    entry['metrics'].short_circuited += 1
+                raise CircuitOpenError(f"Circuit open for {host}")
+
+            started = time.perf_counter()
+            response, network_error = None, False
+            try:
+                response = entry['session'].request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                network_error = True
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                breaker.record_failure()
+                can_retry = method in IDEMPOTENT_METHODS or _connect_failed(e)
+                if attempt < max_retries and can_retry:
+                    self._record(entry, elapsed_ms, failed=True, retried=True)
+                    self._backoff(attempt)
+                    attempt += 1
+                    continue
+                self._record(entry, elapsed_ms, failed=True)
+                raise
+            finally:
+                if response is None and not network_error:
+                    # Any other exception says nothing about the host; never leave a half-open trial stuck
+                    breaker.release_trial()
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if response.status_code >= 500:
+                breaker.record_failure()
+                if attempt < max_retries and method in IDEMPOTENT_METHODS and response.status_code in RETRY_STATUSES:
+                    self._record(entry, elapsed_ms, failed=True, retried=True)
+                    response.close()
+                    self._backoff(attempt)
+                    attempt += 1
+                    continue
+                self._record(entry, elapsed_ms, failed=True)
+            else:
+                breaker.record_success()
+                self._record(entry, elapsed_ms, failed=False)
+            return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def stats(self):
+        return {
+            host: dict(entry['metrics'].to_dict(), circuit=entry['breaker'].state)
+            for host, entry in list(self._hosts.items())
+        }
+
+
+http_client = HttpClient()
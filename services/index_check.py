@@ -0,0 +1,109 @@
+"""
+Index Check - Reports Model.query.filter_by(...) lookups no index can serve
+Call sites are found by parsing the source; a lookup is covered when some
+index, unique constraint or primary key on the model's table starts with one
+of the filtered columns.
+"""
+import ast
+import glob
+import os
+
+from sqlalchemy import inspect as sa_inspect
+
+from db import db
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATHS = ('blueprints', 'services')
+
+
+def _query_model(node):
+    """'Destination' for Destination.query[.with_entities(...)...].filter_by"""
+    while True:
+        if isinstance(node, ast.Call):
+            node = node.func
+        elif isinstance(node, ast.Attribute):
+            if node.attr == 'query' and isinstance(node.value, ast.Name):
+                return node.value.id
+            node = node.value
+        else:
+            return None
+
+
+def find_lookups(paths=DEFAULT_PATHS, root=ROOT):
+    """[(model name, filtered columns, 'file:line'), ...] for every filter_by under paths"""
+    lookups = []
+    for path in paths:
+        for filename in sorted(glob.glob(os.path.join(root, path, '**', '*.py'), recursive=True)):
+            with open(filename, encoding='utf-8-sig') as f:
+                tree = ast.parse(f.read(), filename)
+            for node in ast.walk(tree):
+                if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'filter_by'):
+                    continue
+                model = _query_model(node.func.value)
+                columns = tuple(sorted(k.arg for k in node.keywords if k.arg))
+                if model and columns:
+                    lookups.append((model, columns, f"{os.path.relpath(filename, root)}:{node.lineno}"))
+    return lookups
+
+
+def _models():
+    return {mapper.class_.__name__: mapper.class_ for mapper in db.Model.registry.mappers}
+
+
+def declared_leading_columns(table):
+    """First column of every index, unique constraint and primary key declared on a Table"""
+    leading = set()
+    for index in table.indexes:
+        leading.add(list(index.columns)[0].name)
+    for constraint in table.constraints:
+        columns = list(constraint.columns)
+        if columns and constraint.__class__.__name__ in ('PrimaryKeyConstraint', 'UniqueConstraint'):
+            leading.add(columns[0].name)
+    return leading
+
+
+def live_leading_columns(inspector, table_name):
+    """Same as declared_leading_columns, read from the connected database"""
+    leading = set()
+    for index in inspector.get_indexes(table_name):
+        if index['column_names'] and index['column_names'][0]:
+            leading.add(index['column_names'][0])
+    for unique in inspector.get_unique_constraints(table_name):
+        if unique['column_names']:
+            leading.add(unique['column_names'][0])
+    pk = inspector.get_pk_constraint(table_name).get('constrained_columns') or []
+    if pk:
+        leading.add(pk[0])
+    return leading
+
+
+def missing_indexes(paths=DEFAULT_PATHS, live=False):
+    """
+    Lookups with no usable index, as dicts with model, table, columns and
+    locations. live=True checks the connected database instead of the models.
+    """
+    models = _models()
+    inspector = sa_inspect(db.engine) if live else None
+    leading_cache = {}
+    missing = {}
+    for model_name, columns, location in find_lookups(paths):
+        model = models.get(model_name)
+        if model is None:
+            continue
+        table = model.__table__
+        if table.name not in leading_cache:
+            if live:
+                exists = inspector.has_table(table.name)
+                leading_cache[table.name] = live_leading_columns(inspector, table.name) if exists else None
+            else:
+                leading_cache[table.name] = declared_leading_columns(table)
+        leading = leading_cache[table.name]
+        # Column names can differ from attribute names
+        names = {model.__mapper__.attrs[c].columns[0].name if c in model.__mapper__.attrs else c for c in columns}
+        if leading is not None and leading & names:
+            continue
+        entry = missing.setdefault((model_name, columns), {
+            'model': model_name, 'table': table.name, 'columns': list(columns), 'locations': []
+        })
+        entry['locations'].append(location)
+    return list(missing.values())
@@ -0,0 +1,201 @@
+"""
+Link Templates - Compiled outbound affiliate URL templates
+Each provider's URL is parsed once into literal and placeholder parts, with
+constant query pairs pre-encoded, so building a link is a join over a few
+strings. Links for a destination page are cached per destination and trip
+on first request.
+"""
+import os
+import string
+import threading
+from collections import OrderedDict
+from urllib.parse import quote, quote_plus
+
+# Affiliate IDs (Replace with your actual IDs after signing up)
+AFFILIATE_IDS = {
+    'booking': os.environ.get('BOOKING_COM_AID', 'YOUR_BOOKING_COM_AFFILIATE_ID'),
+    'skyscanner': os.environ.get('SKYSCANNER_AID', 'YOUR_SKYSCANNER_AFFILIATE_ID'),
+    'getyourguide': os.environ.get('GETYOURGUIDE_AID', 'YOUR_GETYOURGUIDE_PARTNER_ID'),
+    'worldnomads': os.environ.get('WORLD_NOMADS_AID', 'YOUR_WORLD_NOMADS_AFFILIATE_ID'),
+}
+
+_formatter = string.Formatter()
+
+
+def _yymmdd(value):
+    """'2026-11-05' -> '261105'"""
+    return value.replace('-', '')[2:]
+
+
+def _compile(pattern, encode, encode_literals=True):
+    """'Flights to {destination}' -> [('Flights+to+', None), ('', 'destination')] with literals pre-encoded"""
+    parts = []
+    for literal, field, _, _ in _formatter.parse(pattern):
+        if literal:
+            parts.append((encode(literal) if encode_literals else literal, None))
+        if field is not None:
+            parts.append(('', field))
+    return parts, encode
+
+
+def _fields(pattern):
+    return [field for _, field, _, _ in _formatter.parse(pattern) if field is not None]
+
+
+def _render(compiled, values):
+    parts, encode = compiled
+    return ''.join(literal if field is None else encode(str(values[field])) for literal, field in parts)
+
+
+class LinkTemplate:
+    """
+    base: URL up to the path; path: pattern with {field} placeholders (each
+    value quoted as one path segment); query: (key, value) pairs where value
+    is a constant, a pattern, or a tuple of patterns tried in order. Pairs
+    whose fields are missing are skipped; fields in `required` must be given.
+    """
+
+    def __init__(self, provider, affiliate_type, base, path='', query=(), required=(), transforms=None):
+        self.provider = provider
+        self.affiliate_type = affiliate_type
+        self.required = tuple(required)
+        self.transforms = transforms or {}
+        self._path = _compile(path, lambda v: quote(v, safe=''), encode_literals=False)
+        self._prefix = base
+        self._constant_query = []
+        self._query = []    # (encoded key, [(fields, compiled pattern), ...alternatives])
+        for key, value in query:
+            patterns = value if isinstance(value, tuple) else (value,)
+            if not _fields(patterns[0]):
+                self._constant_query.append(f"{quote_plus(key)}={quote_plus(patterns[0])}")
+                continue
+            self._query.append((quote_plus(key), [(_fields(p), _compile(p, quote_plus)) for p in patterns]))
+
+    def build(self, **values):
+        values = {k: v for k, v in values.items() if v not in (None, '')}
+        missing = [f for f in self.required if f not in values]
+        if missing:
+            raise ValueError(f"{self.provider} link needs {', '.join(missing)}")
+        for field, transform in self.transforms.items():
+            if field in values:
+                values[field] = transform(str(values[field]))
+
+        pairs = []
+        for key, alternatives in self._query:
+            for fields, compiled in alternatives:
+                if all(f in values for f in fields):
+                    pairs.append(f"{key}={_render(compiled, values)}")
+                    break
+        url = self._prefix + _render(self._path, values)
+        query = '&'.join(pairs + self._constant_query)
+        return f"{url}?{query}" if query else url
+
+
+LINK_TEMPLATES = {
+    # Commission: 25-40% of booking value
+    'booking': LinkTemplate(
+        'booking', 'booking', 'https://www.booking.com/searchresults.html',
+        query=[('ss', '{destination}'), ('checkin', '{checkin}'), ('checkout', '{checkout}'),
+               ('group_adults', '{guests}'), ('no_rooms', '1'), ('aid', AFFILIATE_IDS['booking'])],
+        required=('destination',)
+    ),
+    # Revenue per click + booking bonuses
+    'skyscanner': LinkTemplate(
+        'skyscanner', 'skyscanner', 'https://www.skyscanner.com',
+        path='/transport/flights/{origin}/{destination}/{date}/',
+        query=[('associateid', AFFILIATE_IDS['skyscanner'])],
+        required=('origin', 'destination', 'date'),
+        transforms={'origin': str.lower, 'destination': str.lower, 'date': _yymmdd}
+    ),
+    # Plain search link (no affiliate id) used by the booking redirects
+    'skyscanner_search': LinkTemplate(
+        'skyscanner', 'skyscanner', 'https://www.skyscanner.net',
+        path='/transport/flights/{origin}/{destination}/{date}/',
+        required=('origin', 'destination', 'date'),
+        transforms={'origin': str.lower, 'destination': str.lower, 'date': _yymmdd}
+    ),
+    'skyscanner_return': LinkTemplate(
+        'skyscanner', 'skyscanner', 'https://www.skyscanner.com',
+        path='/transport/flights/{origin}/{destination}/{date}/{return_date}/',
+        query=[('associateid', AFFILIATE_IDS['skyscanner'])],
+        required=('origin', 'destination', 'date', 'return_date'),
+        transforms={'origin': str.lower, 'destination': str.lower, 'date': _yymmdd, 'return_date': _yymmdd}
+    ),
+    # 8% of booking value
+    'getyourguide': LinkTemplate(
+        'getyourguide', 'activity', 'https://www.getyourguide.com/s/',
+        query=[('q', '{destination}'), ('partner_id', AFFILIATE_IDS['getyourguide']), ('utm_medium', 'online_publisher')],
+        required=('destination',)
+    ),
+    'getyourguide_activity': LinkTemplate(
+        'getyourguide', 'activity', 'https://www.getyourguide.com',
+        path='/activity/{activity_id}',
+        query=[('partner_id', AFFILIATE_IDS['getyourguide']), ('utm_medium', 'online_publisher')],
+        required=('activity_id',)
+    ),
+    # 10-15% of policy cost
+    'worldnomads': LinkTemplate(
+        'worldnomads', 'insurance', 'https://www.worldnomads.com/travel-insurance',
+        query=[('affiliate', AFFILIATE_IDS['worldnomads']), ('destination', '{destination}'),
+               ('travelers', '{travelers}'), ('trip_cost', '{trip_cost}')],
+        required=('destination',)
+    ),
+    'google_flights': LinkTemplate(
+        'google_flights', 'google_flights', 'https://www.google.com/travel/flights',
+        query=[('q', ('Flights to {destination} from {origin} on {date}', 'Flights to {destination} from {origin}',
+                      'Flights to {destination}'))],
+        required=('destination',)
+    ),
+}
+
+# Templates shown on a destination page, in display order
+PAGE_PROVIDERS = ('booking', 'skyscanner', 'google_flights', 'getyourguide', 'worldnomads')
+
+
+def build_link(provider, **values):
+    return LINK_TEMPLATES[provider].build(**values)
+
+
+def is_iata(code):
+    return bool(code) and len(code) == 3 and code.isalpha()
+
+
+class DestinationLinks:
+    """LRU of every page link for a destination and trip parameters"""
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, destination, destination_code=None, **trip):
+        """Links keyed by provider; None where the trip lacks what a provider needs"""
+        trip = {k: str(v) for k, v in trip.items() if v not in (None, '')}
+        key = (destination, destination_code, tuple(sorted(trip.items())))
+        with self._lock:
+            links = self._entries.get(key)
+            if links is not None:
+                self._entries.move_to_end(key)
+                return links
+
+        links = {}
+        for provider in PAGE_PROVIDERS:
+            values = dict(trip, destination=destination)
+            if provider == 'skyscanner':
+                # Skyscanner paths only take airport/city codes
+                if not (is_iata(destination_code) and is_iata(trip.get('origin'))):
+                    links[provider] = None
+                    continue
+                values['destination'] = destination_code
+            try:
+                links[provider] = build_link(provider, **values)
+            except ValueError:
+                links[provider] = None      # e.g. Skyscanner without a date
+        with self._lock:
+            self._entries[key] = links
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return links
+
+
+destination_links = DestinationLinks()
@@ -1,4 +1,5 @@
-import requests
+from services.http_client import http_client
+from services.city_resolver import CityResolver
 import os
 
 class LiteAPIService:
@@ -12,6 +13,17 @@ class LiteAPIService:
             "X-API-Key": self.api_key,
             "Content-Type": "application/json"
         }
+        self.cities = CityResolver(self.lookup_city_id)
+
+    def lookup_city_id(self, destination_name):
+        """Ask LiteAPI for a city id; None when it has no match, raises on HTTP errors"""
+        city_url = f"{self.base_url}/hotels/cities"
+        city_response = http_client.get(city_url, headers=self.headers, params={"name": destination_name})
+        city_response.raise_for_status()
+        city_data = city_response.json()
+        if not city_data.get('data'):
+            return None
+        return city_data['data'][0]['id']
 
     def search_hotels(self, destination_name, guests=2, checkin=None, checkout=None):
         """
@@ -19,35 +31,12 @@ class LiteAPIService:
         Note: LiteAPI usually requires a cityId or geocodes.
         We'll first resolve the destination to a cityId if possible or use a proxy search.
         """
-        # Step 1: Search for the city to get coordinates/ID
+        # Step 1: Resolve the destination to a cityId (memory -> liteapi_city table -> API)
         try:
-            # Curated mapping for elite destinations to ensure reliability
-            city_mapping = {
-                'paris': '10471',
-                'london': '15538',
-                'new york': '11162',
-                'dubai': '12411',
-                'tokyo': '12517',
-                'nairobi': '11264',
-                'mombasa': '11265',
-                'diani': '11266',
-                'bali': '12518',
-                'santorini': '10472'
-            }
-            
-            city_id = city_mapping.get(destination_name.lower())
-            
+            city_id = self.cities.resolve(destination_name)
             if not city_id:
-                # First, try to find the city via API if not in mapping
-                city_url = f"{self.base_url}/hotels/cities"
-                city_params = {"name": destination_name}
-                city_response = requests.get(city_url, headers=self.headers, params=city_params)
-                
-                city_data = city_response.json()
-                if not city_data.get('data'):
-                    return []
-                city_id = city_data['data'][0]['id']
-            
+                return []
+
             # Step 2: Search hotels in that city
             search_url = f"{self.base_url}/hotels/list-by-city"
             search_params = {
@@ -57,7 +46,7 @@ class LiteAPIService:
             if checkin: search_params["checkIn"] = checkin
             if checkout: search_params["checkOut"] = checkout
             
-            response = requests.get(search_url, headers=self.headers, params=search_params)
+            response = http_client.get(search_url, headers=self.headers, params=search_params)
             data = response.json()
             if data.get('data'):
                 # Format to our Hotel interface
@@ -94,9 +83,12 @@ class LiteAPIService:
                         'price': h.get('price', 150),
                         'rating': h.get('rating', 4.5),
                         'image_url': image_url,
-                        'description': h.get('description', f'Luxury accommodation in {destination_name}')
+                        'description': h.get('description', f'Luxury accommodation in {destination_name}'),
+                        'latitude': h.get('latitude'),
+                        'longitude': h.get('longitude')
                     })
                 return results
+            return []
         except Exception as e:
             print(f"LiteAPI Error: {str(e)}")
             return []
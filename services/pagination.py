@@ -0,0 +1,117 @@
+"""
+Keyset Pagination - Cursor-based paging for list endpoints
+Pages are fetched with `WHERE (sort, id) > (last_sort, last_id)` instead of
+OFFSET, so every page costs the same no matter how deep the client scrolls.
+"""
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def encode_cursor(values):
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != 2:
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def parse_limit(value):
+    if value in (None, ''):
+        return DEFAULT_LIMIT
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError('limit must be an integer')
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def parse_float(args, name):
+    value = args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f'{name} must be a number')
+
+
+def parse_int(args, name):
+    value = args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+
+
+def parse_datetime(args, name):
+    value = args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an ISO 8601 date or datetime')
+
+
+def resolve_sort(value, sort_columns, default):
+    """Map ?sort=price / ?sort=-price onto (key, column, descending)"""
+    value = value or default
+    descending = value.startswith('-')
+    key = value.lstrip('-')
+    if key not in sort_columns:
+        raise ValueError(f"sort must be one of: {', '.join(sorted(sort_columns))}")
+    return key, sort_columns[key], descending
+
+
+def keyset_paginate(query, sort_column, id_column, limit, cursor=None, descending=False):
+    """
+    Return (rows, next_cursor) ordered by (sort_column, id_column).
+    `cursor` is the opaque value handed out as next_cursor on the previous page.
+    """
+    nullable = sort_column.property.columns[0].nullable
+
+    if cursor:
+        last_value, last_id = decode_cursor(cursor)
+        if isinstance(last_value, str) and sort_column.type.python_type is datetime:
+            last_value = datetime.fromisoformat(last_value)
+        beyond = sort_column < last_value if descending else sort_column > last_value
+        tie = id_column < last_id if descending else id_column > last_id
+
+        if last_value is None:
+            # Already inside the trailing block of NULL sort keys
+            query = query.filter(sort_column.is_(None), tie)
+        elif nullable:
+            query = query.filter(or_(beyond, and_(sort_column == last_value, tie), sort_column.is_(None)))
+        else:
+            query = query.filter(or_(beyond, and_(sort_column == last_value, tie)))
+
+    # NULL sort keys always come last so the cursor conditions above stay valid
+    if descending:
+        query = query.order_by(sort_column.desc().nullslast(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc().nullslast(), id_column.asc())
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, sort_column.key), getattr(last, id_column.key)])
+    return rows, next_cursor
@@ -1,8 +1,12 @@
 """
 PayPal Service - Simple Payment Processing
 """
+import hashlib
 import os
-import requests
+import threading
+import time
+from services.http_client import http_client
+from services.shared_store import shared_store
 
 class PayPalService:
     # PayPal API endpoints
@@ -16,42 +20,61 @@ class PayPalService:
         return PayPalService.LIVE_API if is_live else PayPalService.SANDBOX_API
     
     @staticmethod
-    def get_access_token():
-        """Get PayPal access token"""
+    def fetch_access_token():
+        """Request a new client-credentials token. Returns (token, expires_in)."""
         client_id = os.getenv('PAYPAL_CLIENT_ID')
         client_secret = os.getenv('PAYPAL_CLIENT_SECRET')
         
         if not client_id or not client_secret:
-            return None
+            return None, 0
         
         url = f"{PayPalService.get_api_url()}/v1/oauth2/token"
         headers = {"Accept": "application/json"}
         data = {"grant_type": "client_credentials"}
         
         try:
-            response = requests.post(
+            response = http_client.post(
                 url,
                 headers=headers,
                 data=data,
                 auth=(client_id, client_secret)
             )
-            return response.json().get('access_token')
+            body = response.json()
+            return body.get('access_token'), int(body.get('expires_in', 0))
         except Exception as e:
             print(f"PayPal Error: {e}")
-            return None
+            return None, 0
     
     @staticmethod
-    def create_payment(amount, description, return_url, cancel_url):
-        """Create a PayPal payment"""
+    def get_access_token():
+        """Get PayPal access token (cached until shortly before it expires)"""
+        return paypal_tokens.get_token()
+    
+    @staticmethod
+    def authorized_post(url, **kwargs):
+        """POST with the cached bearer token, refreshing once if PayPal answers 401"""
         access_token = PayPalService.get_access_token()
         if not access_token:
-            return None, None
+            return None
         
+        headers = dict(kwargs.pop('headers', {}))
+        headers["Authorization"] = f"Bearer {access_token}"
+        response = http_client.post(url, headers=headers, **kwargs)
+        
+        if response.status_code == 401:
+            paypal_tokens.invalidate(access_token)
+            access_token = PayPalService.get_access_token()
+            if not access_token:
+                return response
+            headers["Authorization"] = f"Bearer {access_token}"
+            response = http_client.post(url, headers=headers, **kwargs)
+        return response
+    
+    @staticmethod
+    def create_payment(amount, description, return_url, cancel_url):
+        """Create a PayPal payment"""
         url = f"{PayPalService.get_api_url()}/v2/checkout/orders"
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {access_token}"
-        }
+        headers = {"Content-Type": "application/json"}
         
         payload = {
             "intent": "CAPTURE",
@@ -69,7 +92,9 @@ class PayPalService:
         }
         
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = PayPalService.authorized_post(url, json=payload, headers=headers)
+            if response is None:
+                return None, None
             data = response.json()
             
             # Get approval URL
@@ -87,19 +112,116 @@ class PayPalService:
     @staticmethod
     def capture_payment(order_id):
         """Capture/complete a PayPal payment"""
-        access_token = PayPalService.get_access_token()
-        if not access_token:
-            return False
-        
         url = f"{PayPalService.get_api_url()}/v2/checkout/orders/{order_id}/capture"
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {access_token}"
-        }
+        headers = {"Content-Type": "application/json"}
         
         try:
-            response = requests.post(url, headers=headers)
-            return response.status_code == 201
+            # Captures can take a while on PayPal's side; allow a longer read timeout
+            response = PayPalService.authorized_post(url, headers=headers, timeout=(3.05, 30))
+            return response is not None and response.status_code == 201
         except Exception as e:
             print(f"PayPal Error: {e}")
             return False
+
+
+class PayPalTokenManager:
+    """
+    Caches the client-credentials token in process memory and in the shared
+    store, so one OAuth round-trip serves every worker until the token nears
+    expiry. Tokens inside the refresh window are still handed out while a
+    background thread fetches the next one.
+    """
+    REFRESH_MARGIN = 300    # refresh this many seconds before expires_in (half of it at most)
+    EXPIRY_SKEW = 30        # never hand out a token this close to expiry
+    LOCK_TTL = 10
+
+    def __init__(self, fetch=None):
+        self._fetch = fetch or PayPalService.fetch_access_token
+        self._token = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def _store_key(self):
+        mode = os.getenv('PAYPAL_MODE', 'sandbox')
+        client = hashlib.sha1((os.getenv('PAYPAL_CLIENT_ID') or '').encode()).hexdigest()[:12]
+        return f"paypal:token:{mode}:{client}"
+
+    def _usable(self, expires_at, now):
+        return expires_at - self.EXPIRY_SKEW > now
+
+    def _load_shared(self, now):
+        cached = shared_store.get_json(self._store_key())
+        if cached and self._usable(cached.get('expires_at', 0), now):
+            self._token, self._expires_at = cached['access_token'], cached['expires_at']
+            self._refresh_at = cached.get('refresh_at', self._expires_at - self.REFRESH_MARGIN)
+            return True
+        return False
+
+    def _refresh(self):
+        """Fetch a token; only one worker at a time does so via a shared lock"""
+        key = self._store_key()
+        lock_key = f"{key}:lock"
+        have_lock = shared_store.add(lock_key, '1', ttl=self.LOCK_TTL)
+        if not have_lock:
+            # Another worker is refreshing; give it a moment, then use its token
+            deadline = time.time() + 3
+            while time.time() < deadline:
+                if self._load_shared(time.time()) and self._refresh_at > time.time():
+                    return self._token
+                time.sleep(0.1)
+
+        try:
+            token, expires_in = self._fetch()
+            if token:
+                self._token, self._expires_at = token, time.time() + expires_in
+                # Short-lived tokens would otherwise be inside the margin from the start
+                self._refresh_at = self._expires_at - min(self.REFRESH_MARGIN, expires_in // 2)
+                shared_store.set_json(
+                    key,
+                    {'access_token': token, 'expires_at': self._expires_at, 'refresh_at': self._refresh_at},
+                    ttl=max(1, expires_in)
+                )
+            return token
+        finally:
+            if have_lock:
+                shared_store.delete(lock_key)
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self._refresh()
+            except Exception as e:
+                print(f"PayPal token refresh error: {e}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name='paypal-token-refresh', daemon=True).start()
+
+    def get_token(self):
+        now = time.time()
+        if not (self._token and self._usable(self._expires_at, now)) and not self._load_shared(now):
+            return self._refresh()
+
+        token = self._token
+        if self._refresh_at <= now:
+            self._refresh_in_background()
+        return token
+
+    def invalidate(self, token):
+        """Drop a token PayPal rejected, locally and in the shared store"""
+        if self._token == token:
+            self._token, self._expires_at, self._refresh_at = None, 0.0, 0.0
+        cached = shared_store.get_json(self._store_key())
+        if cached and cached.get('access_token') == token:
+            shared_store.delete(self._store_key())
+
+
+paypal_tokens = PayPalTokenManager()
+
@@ -0,0 +1,242 @@
+"""
+Rate Limiter - Sliding-window request limiting with pluggable backends
+Supports: in-process bucketed counters, Redis (shared across gunicorn workers)
+"""
+import math
+import os
+import threading
+import time
+from functools import wraps
+
+from flask import jsonify, request
+
+
+class RateLimitBackend:
+    """Interface for rate-limit storage backends"""
+    name = 'base'
+
+    def hit(self, key, limit, window):
+        """Record one request for key. Returns (allowed, remaining)."""
+        raise NotImplementedError
+
+    def stats(self):
+        """Return hit/deny counters"""
+        raise NotImplementedError
+
+
+class _Window:
+    """Fixed-size ring of bucket counters covering one window for one key"""
+    __slots__ = ('counts', 'last_bucket', 'total')
+
+    def __init__(self, buckets):
+        self.counts = [0] * buckets
+        self.last_bucket = 0
+        self.total = 0
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Approximate sliding window kept in process memory.
+    Each key holds `buckets` counters instead of a list of timestamps, so memory
+    per client is constant. Keys are spread over sharded locks and idle keys are
+    swept out once their window has fully elapsed.
+    """
+    name = 'memory'
+
+    def __init__(self, buckets=10, shards=16, sweep_interval=30):
+        self.buckets = buckets
+        self.sweep_interval = sweep_interval
+        self._shards = [
+            {'lock': threading.Lock(), 'windows': {}, 'hits': 0, 'denied': 0, 'last_sweep': 0.0}
+            for _ in range(shards)
+        ]
+
+    def _shard(self, key):
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _advance(self, win, bucket):
+        """Zero out buckets that slid out of the window since the last hit"""
+        elapsed = bucket - win.last_bucket
+        if elapsed >= self.buckets:
+            win.counts = [0] * self.buckets
+            win.total = 0
+        else:
+            for b in range(win.last_bucket + 1, bucket + 1):
+                idx = b % self.buckets
+                win.total -= win.counts[idx]
+                win.counts[idx] = 0
+        win.last_bucket = bucket
+
+    def _sweep(self, shard, now):
+        """Drop keys whose last bucket is older than a full window"""
+        stale = [
+            key for key, (win, width) in shard['windows'].items()
+            if (now / width) - win.last_bucket > self.buckets
+        ]
+        for key in stale:
+            del shard['windows'][key]
+        shard['last_sweep'] = now
+
+    def hit(self, key, limit, window):
+        now = time.time()
+        width = window / self.buckets
+        bucket = int(now / width)
+        shard = self._shard(key)
+
+        with shard['lock']:
+            if now - shard['last_sweep'] > self.sweep_interval:
+                self._sweep(shard, now)
+
+            entry = shard['windows'].get(key)
+            if entry is None:
+                win = _Window(self.buckets)
+                win.last_bucket = bucket
+                shard['windows'][key] = (win, width)
+            else:
+                win = entry[0]
+                if bucket > win.last_bucket:
+                    self._advance(win, bucket)
+
+            if win.total >= limit:
+                shard['denied'] += 1
+                return False, 0
+
+            win.counts[bucket % self.buckets] += 1
+            win.total += 1
+            shard['hits'] += 1
+            return True, limit - win.total
+
+    def stats(self):
+        hits = denied = keys = 0
+        for shard in self._shards:
+            with shard['lock']:
+                hits += shard['hits']
+                denied += shard['denied']
+                keys += len(shard['windows'])
+        return {'backend': self.name, 'allowed': hits, 'denied': denied, 'tracked_keys': keys}
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Sliding-window counter in Redis, shared by every worker.
+    Uses the previous and current fixed windows weighted by overlap, evaluated in
+    a single Lua script so check-and-increment is atomic. Window keys expire on
+    their own after two windows of inactivity.
+    """
+    name = 'redis'
+
+    SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local weight = tonumber(ARGV[3])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+if math.floor(previous * weight) + current >= limit then
+    redis.call('HINCRBY', KEYS[3], 'denied', 1)
+    return {0, 0}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], window * 2)
+end
+redis.call('HINCRBY', KEYS[3], 'allowed', 1)
+return {1, limit - math.floor(previous * weight) - current}
+"""
+
+    def __init__(self, client, prefix='ratelimit', fallback=None):
+        self.client = client
+        self.prefix = prefix
+        self.stats_key = f"{prefix}:stats"
+        self.fallback = fallback or MemoryRateLimitBackend()
+        self._script = client.register_script(self.SCRIPT)
+
+    def hit(self, key, limit, window):
+        window = max(1, int(math.ceil(window)))
+        now = time.time()
+        current_window = int(now // window)
+        weight = 1 - (now % window) / window
+
+        try:
+            allowed, remaining = self._script(
+                keys=[
+                    f"{self.prefix}:{key}:{current_window}",
+                    f"{self.prefix}:{key}:{current_window - 1}",
+                    self.stats_key
+                ],
+                args=[limit, window, weight]
+            )
+            return bool(allowed), max(0, int(remaining))
+        except Exception as e:
+            # Keep serving if Redis is unreachable; limits become per-worker
+            print(f"Rate Limit Redis Error: {e}")
+            return self.fallback.hit(key, limit, window)
+
+    def stats(self):
+        try:
+            raw = self.client.hgetall(self.stats_key)
+            counters = {k.decode(): int(v) for k, v in raw.items()}
+        except Exception as e:
+            print(f"Rate Limit Redis Error: {e}")
+            counters = {}
+        return {
+            'backend': self.name,
+            'allowed': counters.get('allowed', 0),
+            'denied': counters.get('denied', 0),
+            'fallback': self.fallback.stats()
+        }
+
+
+def create_backend():
+    """Pick the backend from RATE_LIMIT_BACKEND, defaulting to Redis when REDIS_URL is set"""
+    from services.redis_client import get_redis
+
+    choice = os.environ.get('RATE_LIMIT_BACKEND', 'auto').lower()
+    if choice in ('auto', 'redis'):
+        client = get_redis()
+        if client is not None:
+            try:
+                return RedisRateLimitBackend(client)
+            except Exception as e:
+                print(f"Rate Limit Redis Error: {e}")
+    return MemoryRateLimitBackend()
+
+
+class RateLimiter:
+    def __init__(self, backend=None):
+        self._backend = backend
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = create_backend()
+        return self._backend
+
+    def hit(self, key, limit, window):
+        return self.backend.hit(key, limit, window)
+
+    def stats(self):
+        return self.backend.stats()
+
+
+rate_limiter = RateLimiter()
+
+
+def rate_limit(max_requests=100, window=60, scope=None):
+    """Rate limiting decorator - max_requests per window (seconds)"""
+    def decorator(f):
+        key_scope = scope or f.__name__
+
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            client_ip = request.remote_addr or 'unknown'
+            allowed, remaining = rate_limiter.hit(f"{key_scope}:{client_ip}", max_requests, window)
+
+            if not allowed:
+                response = jsonify({'error': 'Rate limit exceeded. Please try again later.'})
+                response.status_code = 429
+                response.headers['Retry-After'] = str(int(math.ceil(window)))
+                return response
+
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
@@ -0,0 +1,33 @@
+"""
+Shared Redis connection - lazily created from REDIS_URL
+"""
+import os
+import threading
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_redis():
+    """Return a shared Redis client, or None when REDIS_URL is not configured"""
+    global _client
+
+    url = os.environ.get('REDIS_URL')
+    if not url:
+        return None
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                try:
+                    import redis
+                    _client = redis.Redis.from_url(
+                        url,
+                        socket_timeout=0.5,
+                        socket_connect_timeout=0.5,
+                        health_check_interval=30
+                    )
+                except Exception as e:
+                    print(f"Redis Error: {e}")
+                    return None
+    return _client
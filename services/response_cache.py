@@ -0,0 +1,162 @@
+"""
+Response Cache - Reuses AI answers for repeated or near-identical questions
+Entries are keyed on the normalized message, the set of catalog
+destinations it mentions and a scope: None for answers any visitor may share,
+the user id for answers generated with that user's context. TTL + LRU
+eviction. A similarity lookup comparing hashed character n-gram vectors within
+the same destinations and scope is off by default; AI_CACHE_SIMILARITY=0.9
+turns it on (it can conflate prompts like "bali in june" / "bali in july").
+Users can opt out of the cache entirely (set_user_bypass).
+"""
+import hashlib
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from services.catalog import on_catalog_change
+from services.search_index import normalize
+from services.shared_store import shared_store
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+VECTOR_DIMENSIONS = 1024
+
+
+def normalize_message(message):
+    """'Best time to visit Bali??' -> 'best time to visit bali'"""
+    return ' '.join(WORD_RE.findall(normalize(message)))
+
+
+def ngram_vector(text, n=3):
+    """L2-normalised sparse vector of hashed character n-grams"""
+    padded = f" {text} "
+    counts = {}
+    for i in range(len(padded) - n + 1):
+        gram = padded[i:i + n]
+        bucket = int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=4).digest(), 'big') % VECTOR_DIMENSIONS
+        counts[bucket] = counts.get(bucket, 0) + 1
+    norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+    return {k: v / norm for k, v in counts.items()}
+
+
+def cosine(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+class ResponseCache:
+    def __init__(self, max_entries=None, ttl=None, similarity=None):
+        self.max_entries = max_entries or int(os.environ.get('AI_CACHE_SIZE', 1000))
+        self.ttl = ttl or int(os.environ.get('AI_CACHE_TTL', 6 * 3600))
+        # 0 (default) keeps exact matching only; e.g. 0.9 also serves near-identical prompts
+        self.similarity = similarity if similarity is not None else float(os.environ.get('AI_CACHE_SIMILARITY', 0))
+        self._entries = OrderedDict()   # key -> (response, vector, expires_at)
+        self._groups = {}               # (destination set, scope) -> {key}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'similar_hits': 0, 'misses': 0, 'bypassed': 0, 'stores': 0, 'evictions': 0}
+
+    @staticmethod
+    def make_key(message, destinations, scope=None):
+        return normalize_message(message), frozenset(destinations or ()), scope
+
+    @staticmethod
+    def _group(key):
+        return key[1], key[2]
+
+    def _drop(self, key):
+        self._entries.pop(key, None)
+        group = self._groups.get(self._group(key))
+        if group is not None:
+            group.discard(key)
+            if not group:
+                del self._groups[self._group(key)]
+
+    def get(self, message, destinations=(), scope=None):
+        key = self.make_key(message, destinations, scope)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[2] > now:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return entry[0]
+                self._drop(key)
+
+            if self.similarity and key[0]:
+                vector = ngram_vector(key[0])
+                best_key, best_score = None, self.similarity
+                for candidate in list(self._groups.get(self._group(key), ())):
+                    response, candidate_vector, expires_at = self._entries[candidate]
+                    if expires_at <= now:
+                        self._drop(candidate)
+                        continue
+                    score = cosine(vector, candidate_vector)
+                    if score >= best_score:
+                        best_key, best_score = candidate, score
+                if best_key is not None:
+                    self._entries.move_to_end(best_key)
+                    self.stats['similar_hits'] += 1
+                    return self._entries[best_key][0]
+
+            self.stats['misses'] += 1
+            return None
+
+    def set(self, message, destinations, response, scope=None):
+        key = self.make_key(message, destinations, scope)
+        if not key[0] or not response:
+            return
+        vector = ngram_vector(key[0]) if self.similarity else None
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (response, vector, time.time() + self.ttl)
+            self._groups.setdefault(self._group(key), set()).add(key)
+            self.stats['stores'] += 1
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.stats['evictions'] += 1
+
+    @staticmethod
+    def _bypass_key(user_id):
+        return f"ai_cache:bypass:{user_id}"
+
+    def set_user_bypass(self, user_id, enabled):
+        """Per-user opt-out, shared across workers: the user's answers are never read from or stored in the cache"""
+        if enabled:
+            shared_store.set(self._bypass_key(user_id), '1')
+        else:
+            shared_store.delete(self._bypass_key(user_id))
+
+    def is_bypassed_for(self, user_id):
+        return user_id is not None and shared_store.get(self._bypass_key(user_id)) is not None
+
+    def record_bypass(self):
+        with self._lock:
+            self.stats['bypassed'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._groups.clear()
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['similar_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['similar_hits']) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+response_cache = ResponseCache()
+
+
+@on_catalog_change
+def _clear_on_destination_change(changes):
+    # Cached answers quote destination prices and descriptions
+    if 'Destination' in changes:
+        response_cache.clear()
@@ -0,0 +1,318 @@
+"""
+Search Index - In-process inverted index over destinations and hotels
+Supports exact, prefix and typo-tolerant (edit distance) term matching for
+typeahead. The index refreshes the rows touched by each catalog commit.
+"""
+import bisect
+import os
+import re
+import threading
+import time
+import unicodedata
+
+from flask import current_app
+
+from services.catalog import on_catalog_change
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Field weights: a hit in the name counts far more than one in the description
+DESTINATION_FIELDS = {'name': 5.0, 'country': 3.0, 'category': 2.0, 'climate': 1.5, 'quote': 0.5, 'description': 1.0}
+HOTEL_FIELDS = {'name': 4.0, 'location': 2.0}
+
+EXACT, PREFIX, FUZZY = 1.0, 0.6, 0.4
+
+
+def normalize(text):
+    """Lowercase and strip accents so 'Réunion' matches 'reunion'"""
+    text = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(normalize(text))
+
+
+def _deletes(term):
+    """All variants of term with one character removed"""
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def edit_distance(a, b, limit=2):
+    """Optimal string alignment distance, giving up once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class SearchIndex:
+    def __init__(self):
+        self.postings = {}      # term -> {doc_key: weight}
+        self.terms = []         # sorted term list for prefix scans
+        self.deletes = {}       # one-deletion variant -> {term}
+        self.documents = {}     # doc_key -> (payload, boost, terms)
+
+    def add_document(self, doc_key, fields, weights, payload, boost=0.0):
+        self.remove_document(doc_key)
+        doc_terms = {}
+        for field, weight in weights.items():
+            for token in tokenize(fields.get(field)):
+                doc_terms[token] = max(doc_terms.get(token, 0.0), weight)
+
+        for term, weight in doc_terms.items():
+            if term not in self.postings:
+                self.postings[term] = {}
+                bisect.insort(self.terms, term)
+                for variant in _deletes(term):
+                    self.deletes.setdefault(variant, set()).add(term)
+            self.postings[term][doc_key] = weight
+        self.documents[doc_key] = (payload, boost, set(doc_terms))
+
+    def remove_document(self, doc_key):
+        entry = self.documents.pop(doc_key, None)
+        if entry is None:
+            return
+        for term in entry[2]:
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_key, None)
+            if not postings:
+                del self.postings[term]
+                idx = bisect.bisect_left(self.terms, term)
+                if idx < len(self.terms) and self.terms[idx] == term:
+                    self.terms.pop(idx)
+                for variant in _deletes(term):
+                    bucket = self.deletes.get(variant)
+                    if bucket:
+                        bucket.discard(term)
+                        if not bucket:
+                            del self.deletes[variant]
+
+    def _prefix_terms(self, prefix, limit=50):
+        idx = bisect.bisect_left(self.terms, prefix)
+        found = []
+        while idx < len(self.terms) and self.terms[idx].startswith(prefix) and len(found) < limit:
+            found.append(self.terms[idx])
+            idx += 1
+        return found
+
+    def _fuzzy_terms(self, token):
+        if len(token) < 4:
+            return []
+        max_distance = 1 if len(token) < 8 else 2
+        candidates = set(self.deletes.get(token, ()))
+        if token in self.postings:
+            candidates.add(token)
+        for variant in _deletes(token):
+            if variant in self.postings:
+                candidates.add(variant)
+            candidates.update(self.deletes.get(variant, ()))
+        return [t for t in candidates if edit_distance(token, t, max_distance) <= max_distance]
+
+    def _match_token(self, token, allow_prefix):
+        """Return {doc_key: score} for one query token, best match type per doc"""
+        scores = {}
+
+        def add(term, factor):
+            for doc_key, weight in self.postings.get(term, {}).items():
+                score = weight * factor
+                if score > scores.get(doc_key, 0.0):
+                    scores[doc_key] = score
+
+        add(token, EXACT)
+        if allow_prefix:
+            for term in self._prefix_terms(token):
+                if term != token:
+                    add(term, PREFIX)
+        if not scores:
+            for term in self._fuzzy_terms(token):
+                add(term, FUZZY)
+        return scores
+
+    def search(self, query, limit=10, kinds=None):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        totals = None
+        for position, token in enumerate(tokens):
+            # Only the word being typed is matched as a prefix
+            matches = self._match_token(token, allow_prefix=(position == len(tokens) - 1))
+            if totals is None:
+                totals = matches
+            else:
+                totals = {k: totals[k] + v for k, v in matches.items() if k in totals}
+            if not totals:
+                return []
+
+        ranked = []
+        for doc_key, score in totals.items():
+            if kinds and doc_key[0] not in kinds:
+                continue
+            payload, boost, _ = self.documents[doc_key]
+            ranked.append((score + boost, doc_key, payload))
+        ranked.sort(key=lambda r: (-r[0], r[1]))
+        return [dict(payload, score=round(score, 3)) for score, _, payload in ranked[:limit]]
+
+
+def destination_document(d):
+    fields = {
+        'name': d.name, 'country': d.country, 'description': d.description,
+        'category': d.category, 'climate': d.climate, 'quote': d.quote
+    }
+    payload = {
+        'type': 'destination', 'id': d.id, 'name': d.name, 'country': d.country,
+        'category': d.category, 'image_url': d.image_url, 'rating': d.rating
+    }
+    # Small rating boost breaks ties between otherwise equal matches
+    return ('destination', d.id), fields, DESTINATION_FIELDS, payload, (d.rating or 0) * 0.1
+
+
+def hotel_document(h):
+    fields = {'name': h.name, 'location': h.location}
+    payload = {
+        'type': 'hotel', 'id': h.id, 'name': h.name, 'location': h.location,
+        'destination_id': h.destination_id, 'image_url': h.image_url, 'rating': h.rating
+    }
+    return ('hotel', h.id), fields, HOTEL_FIELDS, payload, (h.rating or 0) * 0.1
+
+
+class CatalogSearch:
+    """
+    Owns the live index. Commits touching Destination/Hotel rows queue their ids;
+    the next search reloads just those rows (SQL cannot run inside the commit
+    hook). Bulk changes trigger a full rebuild; writes made by other workers are
+    picked up by a rebuild on a background thread once the index is max_age
+    seconds old, while searches keep using the current one.
+    """
+
+    def __init__(self, max_age=None):
+        self.max_age = max_age if max_age is not None else int(os.environ.get('SEARCH_INDEX_TTL', 300))
+        self.index = None
+        self.built_at = 0.0
+        self._pending = {}
+        self._full_rebuild = True
+        self._lock = threading.Lock()          # index contents, pending changes
+        self._rebuild_lock = threading.Lock()  # one full rebuild at a time
+
+    def mark_changed(self, changes):
+        with self._lock:
+            for model_name in ('Destination', 'Hotel'):
+                if model_name not in changes:
+                    continue
+                ids = changes[model_name]
+                if ids is None:
+                    self._full_rebuild = True
+                else:
+                    self._pending.setdefault(model_name, set()).update(ids)
+
+    def rebuild(self):
+        """Build a fresh index from the database outside the lock, then swap it in"""
+        from new_models import Destination, Hotel
+
+        with self._lock:
+            # Changes committed from here on are queued and applied after the swap
+            self._pending = {}
+            self._full_rebuild = False
+        started = time.time()
+        try:
+            index = SearchIndex()
+            for d in Destination.query.filter_by(available=True).all():
+                index.add_document(*destination_document(d))
+            for h in Hotel.query.filter(Hotel.available.is_(True)).all():
+                index.add_document(*hotel_document(h))
+        except Exception:
+            with self._lock:
+                self._full_rebuild = True
+            raise
+        with self._lock:
+            self.index = index
+            self.built_at = started
+
+    def _apply_pending(self):
+        from new_models import Destination, Hotel
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        updates = []
+        for model, kind, to_document in (
+            (Destination, 'destination', destination_document),
+            (Hotel, 'hotel', hotel_document),
+        ):
+            ids = pending.get(model.__name__)
+            if not ids:
+                continue
+            rows = {row.id: row for row in model.query.filter(model.id.in_(ids)).all()}
+            for row_id in ids:
+                row = rows.get(row_id)
+                if row is None or getattr(row, 'available', True) is False:
+                    updates.append(((kind, row_id), None))
+                else:
+                    updates.append(((kind, row_id), to_document(row)))
+        with self._lock:
+            for doc_key, document in updates:
+                if document is None:
+                    self.index.remove_document(doc_key)
+                else:
+                    self.index.add_document(*document)
+
+    def _needs_rebuild(self):
+        return self.index is None or self._full_rebuild
+
+    def _expired(self):
+        return self.max_age and time.time() - self.built_at > self.max_age
+
+    def _rebuild_in_background(self):
+        if not self._rebuild_lock.acquire(blocking=False):
+            return
+        app = current_app._get_current_object()
+
+        def run():
+            try:
+                with app.app_context():
+                    self.rebuild()
+            except Exception as e:
+                print(f"Search index rebuild error: {e}")
+            finally:
+                self._rebuild_lock.release()
+
+        threading.Thread(target=run, name='search-index-rebuild', daemon=True).start()
+
+    def _ensure_fresh(self):
+        if self._needs_rebuild():
+            # One thread rebuilds; the rest keep searching the current index
+            # (only the very first build makes them wait)
+            if self._rebuild_lock.acquire(blocking=self.index is None):
+                try:
+                    if self._needs_rebuild():
+                        self.rebuild()
+                finally:
+                    self._rebuild_lock.release()
+        elif self._expired():
+            # Pending changes wait for the swap, which picks them up
+            self._rebuild_in_background()
+        elif self._pending:
+            self._apply_pending()
+
+    def search(self, query, limit=10, kinds=None):
+        self._ensure_fresh()
+        # Lookups take well under a millisecond; the lock only keeps them from
+        # interleaving with incremental updates and the index swap
+        with self._lock:
+            return self.index.search(query, limit=limit, kinds=kinds)
+
+
+catalog_search = CatalogSearch()
+on_catalog_change(catalog_search.mark_changed)
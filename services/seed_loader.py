@@ -0,0 +1,227 @@
+"""
+Seed Loader - Declarative catalog fixtures applied in bulk
+A fixture (seeds/<name>.json, or .yaml when PyYAML is installed) lists the
+rows to apply per table:
+
+    {"tables": [{"model": "destinations", "prune": true, "update": ["price"], "rows": [...]}]}
+
+Rows are matched to existing ones by natural key and diffed, so only new rows
+and changed fields are written (bulk, one transaction) and primary keys stay
+stable. Per table:
+  insert  - add rows that don't exist yet (default true)
+  update  - true for every given field, a list of fields, or false (default true)
+  prune   - unlist existing rows not in the fixture (default false): soft-deleted
+            via `available`, so bookings, saved items and route segments that
+            point at them keep working (models without the flag are deleted)
+Hotels may name their destination ("destination": "Paris") instead of giving
+destination_id; flights may give departure_in_hours instead of departure_time.
+"""
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+from db import db
+from new_models import Destination, Hotel, Flight
+from services.catalog import notify_catalog_change
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+SEEDS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'seeds')
+
+# Fixture table name -> (model, natural key)
+TABLES = {
+    'destinations': (Destination, ('name', 'country')),
+    'hotels': (Hotel, ('name', 'location')),
+    'flights': (Flight, ('flight_number',)),
+}
+
+IN_CHUNK = 500
+
+
+class SeedError(ValueError):
+    pass
+
+
+def fixture_path(name):
+    """'catalog' -> seeds/catalog.json (or .yaml/.yml); paths are used as given"""
+    if os.path.exists(name):
+        return name
+    for ext in ('.json', '.yaml', '.yml'):
+        path = os.path.join(SEEDS_DIR, name + ext)
+        if os.path.exists(path):
+            return path
+    raise SeedError(f"No seed fixture named {name!r}")
+
+
+def read_fixture(path):
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise SeedError('PyYAML is required for YAML fixtures')
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def _prepare(name, row, now, destination_ids):
+    """Resolve references and relative times; None when a referenced row is missing"""
+    row = dict(row)
+    if name == 'hotels' and 'destination' in row:
+        destination_id = destination_ids.get(row.pop('destination'))
+        if destination_id is None:
+            return None
+        row['destination_id'] = destination_id
+    if name == 'flights' and 'departure_in_hours' in row:
+        row['departure_time'] = now + timedelta(hours=row.pop('departure_in_hours'))
+    return row
+
+
+def _existing_rows(model, key, fields):
+    """natural key -> {'id': ..., field: value} for the columns a fixture touches"""
+    names = ['id'] + sorted(set(fields) | set(key))
+    columns = [getattr(model, name) for name in names]
+    return {
+        tuple(row[names.index(k)] for k in key): dict(zip(names, row))
+        for row in model.query.with_entities(*columns)
+    }
+
+
+def _soft_deletes(model):
+    return 'available' in model.__table__.c
+
+
+def _prune(model, stale):
+    """Unlist (available=False) where the model supports it, otherwise delete"""
+    done = 0
+    for start in range(0, len(stale), IN_CHUNK):
+        query = model.query.filter(model.id.in_(stale[start:start + IN_CHUNK]))
+        if _soft_deletes(model):
+            done += query.update({model.available: False}, synchronize_session=False)
+        else:
+            done += query.delete(synchronize_session=False)
+    return done
+
+
+def _apply_table(spec, now, destination_ids):
+    """
+    Insert/update one table's rows, writing only fields whose values differ.
+    Returns (counts, changed ids, ids to prune).
+    """
+    name = spec['model']
+    model, key = TABLES[name]
+    insert = spec.get('insert', True)
+    update = spec.get('update', True)
+    prune = spec.get('prune', False)
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0, 'skipped': 0}
+
+    rows = {}
+    for raw in spec.get('rows', []):
+        row = _prepare(name, raw, now, destination_ids)
+        if row is None:
+            counts['skipped'] += 1
+            continue
+        missing = [k for k in key if row.get(k) is None]
+        if missing:
+            raise SeedError(f"{name} row is missing natural key field(s) {', '.join(missing)}: {raw}")
+        if prune and _soft_deletes(model):
+            # Listed rows are (re-)listed; unlisted ones are soft-deleted below
+            row.setdefault('available', True)
+        rows[tuple(row[k] for k in key)] = row     # later duplicates win
+
+    fields = set().union(*rows.values()) if rows else set()
+    existing = _existing_rows(model, key, fields)
+    inserts, updates = [], []
+    for natural_key, row in rows.items():
+        current = existing.get(natural_key)
+        if current is None:
+            if insert:
+                inserts.append(row)
+            else:
+                counts['skipped'] += 1
+            continue
+        allowed = row if update is True else {k: row[k] for k in (update or ()) if k in row}
+        if prune and 'available' in row:
+            allowed = dict(allowed, available=row['available'])
+        changed = {k: v for k, v in allowed.items() if current.get(k) != v}
+        if changed:
+            updates.append(dict(changed, id=current['id']))
+        else:
+            counts['unchanged'] += 1
+
+    changed_ids = {u['id'] for u in updates}
+    if inserts:
+        db.session.bulk_insert_mappings(model, inserts)
+        inserted_keys = {tuple(row[k] for k in key) for row in inserts}
+        changed_ids.update(
+            row['id'] for natural_key, row in _existing_rows(model, key, ()).items() if natural_key in inserted_keys
+        )
+    if updates:
+        db.session.bulk_update_mappings(model, updates)
+    counts['inserted'], counts['updated'] = len(inserts), len(updates)
+
+    stale = []
+    if prune:
+        stale = sorted(
+            row['id'] for natural_key, row in existing.items()
+            if natural_key not in rows and row.get('available', True) is not False
+        )
+    return counts, changed_ids, stale
+
+
+def load_fixture(name_or_doc):
+    """
+    Apply a fixture (name, path or already-parsed dict) in one transaction.
+    Returns {'tables': {table: counts}, 'changes': {model: [ids]}, 'timings_ms': {...},
+    'elapsed_ms': total}; re-applying an unchanged fixture writes and notifies nothing.
+    """
+    started = time.perf_counter()
+    doc = name_or_doc if isinstance(name_or_doc, dict) else read_fixture(fixture_path(name_or_doc))
+    specs = doc.get('tables', [])
+    for spec in specs:
+        if spec.get('model') not in TABLES:
+            raise SeedError(f"Unknown seed table {spec.get('model')!r}")
+    specs = sorted(specs, key=lambda spec: list(TABLES).index(spec['model']))
+
+    now = datetime.now()
+    report = {'tables': {}, 'timings_ms': {}}
+    try:
+        destination_ids = {}
+        prunes = []
+        changes = {}
+        for spec in specs:
+            table_started = time.perf_counter()
+            if spec.get('model') == 'hotels':
+                # Resolve names against destinations as they stand after this fixture's own writes
+                destination_ids = {}
+                # Resolve names to listed destinations first
+                listed = Destination.query.with_entities(Destination.id, Destination.name).order_by(
+                    Destination.available.is_(False), Destination.id)
+                for dest_id, dest_name in listed:
+                    destination_ids.setdefault(dest_name, dest_id)
+            model = TABLES[spec['model']][0]
+            report['tables'][spec['model']], changed_ids, stale = _apply_table(spec, now, destination_ids)
+            changes.setdefault(model.__name__, set()).update(changed_ids)
+            prunes.append((spec['model'], stale))
+            report['timings_ms'][spec['model']] = round((time.perf_counter() - table_started) * 1000, 2)
+
+        # Children (flights, hotels) are pruned before the destinations they point at
+        for name, stale in reversed(prunes):
+            if stale:
+                model = TABLES[name][0]
+                report['tables'][name]['deleted'] = _prune(model, stale)
+                changes[model.__name__].update(stale)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    # Bulk writes skip the mapper events, so tell catalog listeners exactly which rows moved
+    changes = {model_name: ids for model_name, ids in changes.items() if ids}
+    if changes:
+        notify_catalog_change(changes)
+    report['changes'] = {model_name: sorted(ids) for model_name, ids in changes.items()}
+    report['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return report
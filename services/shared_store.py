@@ -0,0 +1,133 @@
+"""
+Shared Store - Small key/value store shared across gunicorn workers
+Backed by Redis when REDIS_URL is set, otherwise by process memory (in which
+case "shared" only means shared between threads of one worker).
+"""
+import json
+import threading
+import time
+
+
+class MemoryStore:
+    name = 'memory'
+
+    def __init__(self):
+        self._data = {}     # key -> (value, expires_at or None)
+        self._lock = threading.Lock()
+
+    def _live(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= now:
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key, time.time())
+            return entry[0] if entry else None
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl if ttl else None)
+
+    def add(self, key, value, ttl=None):
+        """Set only if absent; returns True when this caller won"""
+        with self._lock:
+            if self._live(key, time.time()):
+                return False
+            self._data[key] = (value, time.time() + ttl if ttl else None)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            entry = self._live(key, time.time())
+            value = int(entry[0]) + 1 if entry else 1
+            self._data[key] = (value, entry[1] if entry else None)
+            return value
+
+
+class RedisStore:
+    name = 'redis'
+
+    def __init__(self, client, prefix='worldtour'):
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, key):
+        return f"{self.prefix}:{key}"
+
+    def get(self, key):
+        value = self.client.get(self._key(key))
+        return value.decode('utf-8') if isinstance(value, bytes) else value
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self._key(key), value, px=int(ttl * 1000) if ttl else None)
+
+    def add(self, key, value, ttl=None):
+        return bool(self.client.set(self._key(key), value, nx=True, px=int(ttl * 1000) if ttl else None))
+
+    def delete(self, key):
+        self.client.delete(self._key(key))
+
+    def incr(self, key):
+        return int(self.client.incr(self._key(key)))
+
+
+class SharedStore:
+    """Picks Redis lazily (unless a backend is given) and falls back to memory if Redis errors"""
+
+    def __init__(self, backend=None):
+        self._backend = backend
+        self._memory = MemoryStore()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            from services.redis_client import get_redis
+            client = get_redis()
+            self._backend = RedisStore(client) if client is not None else self._memory
+        return self._backend
+
+    def _call(self, method, *args, **kwargs):
+        try:
+            return getattr(self.backend, method)(*args, **kwargs)
+        except Exception as e:
+            print(f"Shared store error ({method}): {e}")
+            return getattr(self._memory, method)(*args, **kwargs)
+
+    def get(self, key):
+        return self._call('get', key)
+
+    def set(self, key, value, ttl=None):
+        return self._call('set', key, value, ttl)
+
+    def add(self, key, value, ttl=None):
+        return self._call('add', key, value, ttl)
+
+    def delete(self, key):
+        return self._call('delete', key)
+
+    def incr(self, key):
+        return self._call('incr', key)
+
+    def get_json(self, key):
+        raw = self.get(key)
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    def set_json(self, key, value, ttl=None):
+        return self.set(key, json.dumps(value), ttl)
+
+
+shared_store = SharedStore()
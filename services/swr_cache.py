@@ -0,0 +1,161 @@
+"""
+SWR Cache - Short-TTL result cache with stale-while-revalidate and single-flight
+Fresh entries are served as-is; stale ones are served immediately while one
+background refresh runs. Concurrent misses for the same key share a single
+computation: in-process through a flight map, across workers through an
+add-if-absent lock in the shared store.
+"""
+import threading
+import time
+
+from flask import current_app, has_app_context
+
+from services.shared_store import shared_store
+
+
+class _Flight:
+    __slots__ = ('event', 'value', 'ok')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.ok = False
+
+
+class SWRCache:
+    def __init__(self, namespace, ttl, stale_ttl, store=None, lock_timeout=15.0, wait_timeout=8.0, poll_interval=0.05):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.store = store or shared_store
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._flights = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'coalesced': 0, 'refreshes': 0, 'uncached': 0}
+
+    def _key(self, key):
+        return f"{self.namespace}:{key}"
+
+    def _lock_key(self, key):
+        return f"{self.namespace}:lock:{key}"
+
+    def _read(self, key):
+        entry = self.store.get_json(self._key(key))
+        return entry if isinstance(entry, dict) and 'value' in entry else None
+
+    def _write(self, key, value, ttl_for):
+        ttl = self.ttl if ttl_for is None else ttl_for(value)
+        if ttl is None:
+            ttl = self.ttl
+        if ttl <= 0:
+            self.stats['uncached'] += 1
+            return
+        now = time.time()
+        entry = {'value': value, 'fresh_until': now + ttl, 'stale_until': now + ttl + self.stale_ttl}
+        self.store.set_json(self._key(key), entry, ttl + self.stale_ttl)
+
+    def get(self, key, compute, ttl_for=None):
+        """
+        Returns (value, state) with state one of hit/stale/miss/coalesced.
+        ttl_for(value) may return a shorter TTL, or 0 to skip caching that value.
+        """
+        entry = self._read(key)
+        now = time.time()
+        if entry is not None and entry['fresh_until'] > now:
+            self.stats['hits'] += 1
+            return entry['value'], 'hit'
+        if entry is not None and entry['stale_until'] > now:
+            self.stats['stale_hits'] += 1
+            self._refresh_async(key, compute, ttl_for)
+            return entry['value'], 'stale'
+        return self._single_flight(key, compute, ttl_for)
+
+    def _single_flight(self, key, compute, ttl_for):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.event.wait(self.wait_timeout)
+            if flight.ok:
+                self.stats['coalesced'] += 1
+                return flight.value, 'coalesced'
+            # The leader failed or is too slow; compute on our own
+            self.stats['misses'] += 1
+            return compute(), 'miss'
+
+        try:
+            value, state = self._compute_once(key, compute, ttl_for)
+            flight.value, flight.ok = value, True
+            return value, state
+        finally:
+            flight.event.set()
+            with self._lock:
+                self._flights.pop(key, None)
+
+    def _compute_once(self, key, compute, ttl_for):
+        lock_key = self._lock_key(key)
+        if not self.store.add(lock_key, '1', ttl=self.lock_timeout):
+            # Another worker holds the lock; wait for it to publish the result
+            deadline = time.monotonic() + self.wait_timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                entry = self._read(key)
+                if entry is not None and entry['stale_until'] > time.time():
+                    self.stats['coalesced'] += 1
+                    return entry['value'], 'coalesced'
+            self.stats['misses'] += 1
+            return compute(), 'miss'
+
+        self.stats['misses'] += 1
+        try:
+            value = compute()
+            self._write(key, value, ttl_for)
+            return value, 'miss'
+        finally:
+            self.store.delete(lock_key)
+
+    def _refresh_async(self, key, compute, ttl_for):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        if not self.store.add(self._lock_key(key), '1', ttl=self.lock_timeout):
+            with self._lock:
+                self._refreshing.discard(key)
+            return
+
+        app = current_app._get_current_object() if has_app_context() else None
+
+        def run():
+            try:
+                if app is not None:
+                    with app.app_context():
+                        value = compute()
+                else:
+                    value = compute()
+                self._write(key, value, ttl_for)
+                self.stats['refreshes'] += 1
+            except Exception as e:
+                print(f"Cache refresh error ({self.namespace}): {e}")
+            finally:
+                self.store.delete(self._lock_key(key))
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"{self.namespace}-refresh", daemon=True).start()
+
+    def invalidate(self, key):
+        self.store.delete(self._key(key))
+
+    def metrics(self):
+        stats = dict(self.stats)
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses'] + stats['coalesced']
+        stats['hit_rate'] = round((lookups - stats['misses']) / lookups, 4) if lookups else 0.0
+        stats['backend'] = self.store.backend.name
+        return stats
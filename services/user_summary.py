@@ -0,0 +1,169 @@
+"""
+User Summary - Cached per-user profile counters and subscription state
+Rows in user_summaries are built on first read and then kept current by
+mapper events: SavedItem/Booking inserts and deletes adjust the counters in
+the same transaction, Subscription writes copy their state over. The
+serialized summary is cached in the shared store and invalidated per user
+after each commit that touches it.
+"""
+from datetime import datetime
+
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from db import db
+from models.subscription import Subscription
+from new_models import Booking, SavedItem, UserSummary
+from services.shared_store import shared_store
+
+CACHE_TTL = 300
+GENERATION_KEY = 'user_summary:gen'
+
+summaries = UserSummary.__table__
+
+# Model -> counter column it maintains
+COUNTERS = {SavedItem: 'saved_count', Booking: 'booking_count'}
+
+
+def _cache_key(user_id):
+    # Bulk writes bump the generation, dropping every cached summary at once
+    return f"user_summary:{shared_store.get(GENERATION_KEY) or 0}:{user_id}"
+
+
+def _touched(session, user_id):
+    session.info.setdefault('user_summary_changes', set()).add(user_id)
+
+
+def _make_counter_listener(column, delta):
+    def listener(mapper, connection, target):
+        connection.execute(
+            summaries.update()
+            .where(summaries.c.user_id == target.user_id)
+            .values({column: summaries.c[column] + delta, 'updated_at': datetime.utcnow()})
+        )
+        session = Session.object_session(target)
+        if session is not None:
+            _touched(session, target.user_id)
+    return listener
+
+
+for _model, _column in COUNTERS.items():
+    event.listen(_model, 'after_insert', _make_counter_listener(_column, 1))
+    event.listen(_model, 'after_delete', _make_counter_listener(_column, -1))
+
+
+def _subscription_state(subscription):
+    return {
+        'plan': subscription.plan,
+        'subscription_status': subscription.status,
+        'current_period_end': subscription.current_period_end,
+        'cancel_at_period_end': bool(subscription.cancel_at_period_end),
+    }
+
+
+@event.listens_for(Subscription, 'after_insert')
+@event.listens_for(Subscription, 'after_update')
+def _subscription_saved(mapper, connection, target):
+    connection.execute(
+        summaries.update()
+        .where(summaries.c.user_id == target.user_id)
+        .values(dict(_subscription_state(target), updated_at=datetime.utcnow()))
+    )
+    _touched(Session.object_session(target), target.user_id)
+
+
+@event.listens_for(Subscription, 'after_delete')
+def _subscription_deleted(mapper, connection, target):
+    # Rebuilt on next read; safe even when a replacement is inserted in the same flush
+    connection.execute(summaries.delete().where(summaries.c.user_id == target.user_id))
+    _touched(Session.object_session(target), target.user_id)
+
+
+def _bulk_listener(context):
+    # Affected users are unknown; drop every summary and start a new cache generation
+    if context.mapper.class_ in COUNTERS or context.mapper.class_ is Subscription:
+        context.session.execute(summaries.delete())
+        context.session.info['user_summary_reset'] = True
+
+
+event.listen(Session, 'after_bulk_update', _bulk_listener)
+event.listen(Session, 'after_bulk_delete', _bulk_listener)
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session):
+    if session.info.pop('user_summary_reset', False):
+        shared_store.incr(GENERATION_KEY)
+    for user_id in session.info.pop('user_summary_changes', ()):
+        invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop('user_summary_changes', None)
+    session.info.pop('user_summary_reset', None)
+
+
+def invalidate(user_id):
+    shared_store.delete(_cache_key(user_id))
+
+
+def _build(user_id):
+    """Compute a user's summary from source tables and persist it"""
+    saved = select(func.count(SavedItem.id)).where(SavedItem.user_id == user_id).scalar_subquery()
+    bookings = select(func.count(Booking.id)).where(Booking.user_id == user_id).scalar_subquery()
+    saved_count, booking_count = db.session.execute(select(saved, bookings)).one()
+    subscription = Subscription.query.filter_by(user_id=user_id).first()
+
+    row = UserSummary(user_id=user_id, saved_count=saved_count, booking_count=booking_count)
+    if subscription:
+        for name, value in _subscription_state(subscription).items():
+            setattr(row, name, value)
+    db.session.add(row)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another request built it first
+        db.session.rollback()
+        return UserSummary.query.get(user_id)
+    return row
+
+
+def serialize_summary(row):
+    active = (
+        row.subscription_status == 'active'
+        and row.current_period_end is not None
+        and row.current_period_end > datetime.utcnow()
+    )
+    return {
+        'subscription': {
+            'active': active,
+            'plan': row.plan if active else 'free',
+            'status': row.subscription_status,
+            'expires_at': row.current_period_end.isoformat() if row.current_period_end else None,
+            'cancel_at_period_end': bool(row.cancel_at_period_end)
+        },
+        'stats': {
+            'saved_trips': row.saved_count,
+            'bookings': row.booking_count
+        }
+    }
+
+
+def get_summary(user_id):
+    """Serialized summary: shared cache, then the user_summaries row, then a rebuild"""
+    key = _cache_key(user_id)
+    cached = shared_store.get_json(key)
+    if cached is not None:
+        return cached
+
+    row = UserSummary.query.get(user_id) or _build(user_id)
+    summary = serialize_summary(row)
+    # Period end is time-based, so don't cache an active state past it
+    ttl = CACHE_TTL
+    if summary['subscription']['active']:
+        remaining = (row.current_period_end - datetime.utcnow()).total_seconds()
+        ttl = max(1, min(ttl, int(remaining)))
+    shared_store.set_json(key, summary, ttl=ttl)
+    return summary
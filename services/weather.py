@@ -1,30 +1,74 @@
+"""
+Weather Service - Current conditions from OpenWeather with a per-location TTL cache
+Locations are cities or (lat, lon) pairs. Cache misses in a batch are fetched
+concurrently, and a background prefetch keeps every available destination
+warm so the destination grid is served entirely from cache.
+"""
 import os
-import requests
-from flask_caching import Cache
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.http_client import http_client
+from services.shared_store import shared_store
+
+DEMO_WEATHER = {
+    'temp': 20,
+    'condition': 'Sunny (Demo)',
+    'humidity': 50,
+    'description': 'Please set OPENWEATHER_API_KEY for real-time data.'
+}
+
+
+def location_key(city=None, lat=None, lon=None):
+    """Coordinates are rounded to ~1 km so nearby lookups share an entry"""
+    if lat is not None and lon is not None:
+        return f"coord:{round(float(lat), 2)},{round(float(lon), 2)}"
+    return f"city:{' '.join((city or '').lower().split())}"
+
+
+def key_for(location):
+    """location_key for a {'city': ...} or {'lat': ..., 'lon': ...} dict"""
+    if location.get('lat') is not None and location.get('lon') is not None:
+        return location_key(lat=location['lat'], lon=location['lon'])
+    return location_key(city=location.get('city'))
+
 
 class WeatherService:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, ttl=None, max_workers=8):
         self.api_key = api_key or os.environ.get('OPENWEATHER_API_KEY')
         self.base_url = "http://api.openweathermap.org/data/2.5/weather"
+        self.ttl = ttl or int(os.environ.get('WEATHER_CACHE_TTL', 600))
+        self._cache = {}    # key -> (weather, expires_at)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='weather')
+        self._prefetcher = None
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'errors': 0, 'prefetched': 0}
 
-    def get_weather(self, city):
-        if not self.api_key:
-            # Fallback mock data
-            return {
-                'temp': 20,
-                'condition': 'Sunny (Demo)',
-                'humidity': 50,
-                'description': 'Please set OPENWEATHER_API_KEY for real-time data.'
-            }
+    def _cached(self, key, ahead=0):
+        """Cached weather unless it expires within `ahead` seconds"""
+        deadline = time.time() + ahead
+        entry = self._cache.get(key)
+        if entry and entry[1] > deadline:
+            return entry[0]
+        shared = shared_store.get_json(f"weather:{key}")
+        if shared and shared['expires_at'] > deadline:
+            self._cache[key] = (shared['weather'], shared['expires_at'])
+            return shared['weather']
+        return None
+
+    def _remember(self, key, weather):
+        expires_at = time.time() + self.ttl
+        if len(self._cache) >= 5000:
+            # Arbitrary coordinates can come from clients; keep memory bounded
+            self._cache.clear()
+        self._cache[key] = (weather, expires_at)
+        shared_store.set_json(f"weather:{key}", {'weather': weather, 'expires_at': expires_at}, ttl=self.ttl)
 
-        params = {
-            'q': city,
-            'appid': self.api_key,
-            'units': 'metric'
-        }
-        
+    def _fetch(self, params):
+        params = dict(params, appid=self.api_key, units='metric')
         try:
-            response = requests.get(self.base_url, params=params, timeout=5)
+            response = http_client.get(self.base_url, params=params, timeout=5)
             response.raise_for_status()
             data = response.json()
             return {
@@ -36,6 +80,112 @@ class WeatherService:
             }
         except Exception as e:
             print(f"Weather API error: {e}")
+            self.stats['errors'] += 1
             return None
 
+    def _lookup(self, key, params, ahead=0):
+        weather = self._cached(key, ahead)
+        if weather is not None:
+            self.stats['hits'] += 1
+            return weather
+        self.stats['misses'] += 1
+        weather = self._fetch(params)
+        if weather is not None:
+            self._remember(key, weather)
+        return weather
+
+    def get_weather(self, city):
+        if not self.api_key:
+            return DEMO_WEATHER
+        return self._lookup(location_key(city=city), {'q': city})
+
+    def get_weather_at(self, lat, lon):
+        if not self.api_key:
+            return DEMO_WEATHER
+        return self._lookup(location_key(lat=lat, lon=lon), {'lat': lat, 'lon': lon})
+
+    def get_many(self, locations, ahead=0, fetch=True):
+        """
+        Weather for each location, keyed by location_key. Locations are
+        dicts with 'city' or 'lat'/'lon'; misses are fetched concurrently,
+        or left as None with fetch=False.
+        """
+        requested = {}
+        for loc in locations:
+            if loc.get('lat') is not None and loc.get('lon') is not None:
+                requested[key_for(loc)] = {'lat': loc['lat'], 'lon': loc['lon']}
+            elif loc.get('city'):
+                requested[key_for(loc)] = {'q': loc['city']}
+
+        if not self.api_key:
+            return {key: DEMO_WEATHER for key in requested}
+
+        results, misses = {}, {}
+        for key, params in requested.items():
+            weather = self._cached(key, ahead)
+            if weather is not None:
+                self.stats['hits'] += 1
+                results[key] = weather
+            else:
+                misses[key] = params
+
+        if not fetch:
+            self.stats['misses'] += len(misses)
+            results.update((key, None) for key in misses)
+            return results
+
+        futures = {key: self._executor.submit(self._lookup, key, params, ahead) for key, params in misses.items()}
+        for key, future in futures.items():
+            results[key] = future.result()
+        return results
+
+    def destination_locations(self):
+        """(destination id, location) for every available destination, by coordinates when known"""
+        from new_models import Destination
+
+        rows = (
+            Destination.query
+            .with_entities(Destination.id, Destination.name, Destination.latitude, Destination.longitude)
+            .filter_by(available=True)
+            .order_by(Destination.id)
+            .all()
+        )
+        return [
+            (dest_id, {'lat': lat, 'lon': lon} if lat is not None and lon is not None else {'city': name})
+            for dest_id, name, lat, lon in rows
+        ]
+
+    def prefetch_destinations(self):
+        """Warm the cache for every available destination; returns how many were refreshed"""
+        if not self.api_key:
+            return 0
+        locations = [loc for _, loc in self.destination_locations()]
+        # Entries that would expire before the next cycle are fetched again now
+        weather = self.get_many(locations, ahead=self.ttl * 0.5)
+        count = sum(1 for w in weather.values() if w is not None)
+        self.stats['prefetched'] += count
+        return count
+
+    def start_prefetcher(self, app):
+        """Refresh destination weather shortly before entries expire, in a daemon thread"""
+        if not self.api_key or (self._prefetcher is not None and self._prefetcher.is_alive()):
+            return
+
+        def run():
+            while True:
+                # Only one worker per cycle does the prefetch
+                if shared_store.add('weather:prefetch:lock', '1', ttl=max(1, int(self.ttl * 0.4))):
+                    try:
+                        with app.app_context():
+                            self.prefetch_destinations()
+                    except Exception as e:
+                        print(f"Weather prefetch error: {e}")
+                time.sleep(self.ttl * 0.4)
+
+        with self._lock:
+            if self._prefetcher is None or not self._prefetcher.is_alive():
+                self._prefetcher = threading.Thread(target=run, name='weather-prefetch', daemon=True)
+                self._prefetcher.start()
+
+
 weather_service = WeatherService()
@@ -0,0 +1,106 @@
+"""
+Wishlist - Saved item snapshots and batched hydration
+Linked destinations, hotels and flights are loaded with one IN query per type
+and their live fields are laid over the stored snapshot.
+"""
+import json
+from datetime import datetime
+
+from db import db
+from new_models import Destination, Hotel, Flight
+
+# SavedItem link column -> (model, live fields that override the snapshot)
+LINKED_TYPES = {
+    'destination_id': (Destination, ('id', 'name', 'country', 'image_url', 'rating')),
+    'hotel_id': (Hotel, ('id', 'name', 'location', 'price', 'rating', 'image_url', 'destination_id')),
+    'flight_id': (Flight, ('id', 'airline', 'origin', 'destination', 'price', 'departure_time', 'duration')),
+}
+
+# Stay well under SQLite's bound-parameter limit
+IN_CHUNK = 500
+
+
+def dump_snapshot(data):
+    """Compact JSON for SavedItem.item_data"""
+    return json.dumps(data or {}, separators=(',', ':'), default=str)
+
+
+def load_snapshot(raw):
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+    except (TypeError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def catalog_id(data):
+    """
+    The catalog row id a snapshot refers to, or None. Hotel search results say
+    where they came from ('sources', or 'source'); their 'id' belongs to the
+    first provider that listed them (a Hotelbeds code, a LiteAPI id), so only
+    the id of a 'local' offer is a catalog id.
+    """
+    sources = data.get('sources')
+    if sources is None and 'source' in data:
+        sources = [data['source']]
+    if sources is None:
+        return data.get('id')
+    for offer in data.get('offers') or ():
+        if isinstance(offer, dict) and offer.get('provider') == 'local':
+            return offer.get('id')
+    return data.get('id') if list(sources) == ['local'] else None
+
+
+def link_ids(item_type, data):
+    """{'destination_id': 3} for a snapshot of an existing catalog row"""
+    column = f"{item_type}_id"
+    if column not in LINKED_TYPES:
+        return {}
+    try:
+        row_id = int(catalog_id(data))
+    except (TypeError, ValueError):
+        return {}   # Keep as unlinked if ID is weird
+    model = LINKED_TYPES[column][0]
+    if db.session.get(model, row_id) is None:
+        return {}
+    return {column: row_id}
+
+
+def _load_rows(model, fields, ids):
+    columns = [getattr(model, name) for name in fields]
+    ids = sorted(ids)
+    rows = {}
+    for start in range(0, len(ids), IN_CHUNK):
+        chunk = ids[start:start + IN_CHUNK]
+        for row in model.query.with_entities(*columns).filter(model.id.in_(chunk)):
+            rows[row[0]] = {
+                name: value.isoformat() if isinstance(value, datetime) else value
+                for name, value in zip(fields, row)
+            }
+    return rows
+
+
+def hydrate(items):
+    """Serialize SavedItems, merging fresh catalog fields in one query per linked type"""
+    live = {}
+    for column, (model, fields) in LINKED_TYPES.items():
+        ids = {getattr(item, column) for item in items if getattr(item, column)}
+        live[column] = _load_rows(model, fields, ids) if ids else {}
+
+    results = []
+    for item in items:
+        data = load_snapshot(item.item_data)
+        for column, rows in live.items():
+            row = rows.get(getattr(item, column))
+            if row:
+                # Prefer DB data over the snapshot for these fields
+                data.update(row)
+        results.append({
+            'id': item.id,
+            'type': item.item_type,
+            'data': data,
+            'created_at': item.created_at.isoformat()
+        })
+    return results
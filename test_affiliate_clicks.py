@@ -0,0 +1,61 @@
+import json
+import os
+
+from app import db
+from models.affiliate import AffiliateClick
+from services.affiliate_service import click_writer
+from services.background_writer import BatchWriter
+
+def test_redirect_queues_click_and_writer_flushes_it(app):
+    client = app.test_client()
+    with app.app_context():
+        before = AffiliateClick.query.filter_by(destination='Queue Test').count()
+        response = client.get('/api/affiliate/redirect?type=hotel&destination=Queue%20Test')
+        assert response.status_code == 302
+        assert click_writer.wait_idle()
+        assert AffiliateClick.query.filter_by(destination='Queue Test').count() == before + 1
+        AffiliateClick.query.filter_by(destination='Queue Test').delete()
+        db.session.commit()
+
+def test_spool_left_by_dead_process_is_replayed(app, tmp_path):
+    # A spool whose first line was already written before the process died
+    orphan = tmp_path / 'clicks-999-1.jsonl'
+    orphan.write_text(''.join(json.dumps({'n': n}) + '\n' for n in range(3)))
+    (tmp_path / 'clicks-999-1.jsonl.ckpt').write_text('1')
+
+    written = []
+    writer = BatchWriter('clicks', lambda batch: written.extend(batch), max_delay=0.05, spool_dir=str(tmp_path))
+    with app.app_context():
+        writer.submit({'n': 3})
+    assert writer.wait_idle()
+
+    assert written == [{'n': 1}, {'n': 2}, {'n': 3}]
+    assert not orphan.exists()
+    spools = [p for p in os.listdir(tmp_path) if p.endswith('.jsonl')]
+    assert len(spools) == 1 and (tmp_path / spools[0]).read_text() == ''
+
+def test_track_rejects_bad_input(app):
+    client = app.test_client()
+    assert client.post('/api/affiliate/track', data='null', content_type='application/json').status_code == 400
+    assert client.post('/api/affiliate/track', json={'destination': 'Paris'}).status_code == 400
+    assert client.post('/api/affiliate/track', json={'affiliateType': 'spam'}).status_code == 400
+    assert client.post('/api/affiliate/track', json={'affiliateType': 'booking', 'userId': 'abc'}).status_code == 400
+
+def test_rejected_rows_are_set_aside_and_the_rest_written(app, tmp_path):
+    from sqlalchemy.exc import IntegrityError
+
+    written = []
+    def flush(batch):
+        if any(item['n'] < 0 for item in batch):
+            raise IntegrityError('INSERT', {}, Exception('NOT NULL constraint failed'))
+        written.extend(batch)
+
+    writer = BatchWriter('clicks', flush, max_delay=0.05, retry=True, spool_dir=str(tmp_path))
+    with app.app_context():
+        for n in (1, -1, 2, 3):
+            writer.submit({'n': n})
+    assert writer.wait_idle()
+
+    assert sorted(item['n'] for item in written) == [1, 2, 3]
+    assert writer.stats['rejected'] == 1
+    assert (tmp_path / 'clicks.rejected.jsonl').read_text() == '{"n": -1}\n'
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+from app import db
+from models.affiliate import AffiliateClick, AffiliateClickRollup
+from services.affiliate_service import write_clicks
+from services.affiliate_stats import rebuild_rollups
+
+def _cleanup():
+    AffiliateClick.query.filter(AffiliateClick.destination.like('Rollup Test%')).delete(synchronize_session=False)
+    AffiliateClickRollup.query.filter(AffiliateClickRollup.destination.like('Rollup Test%')).delete(synchronize_session=False)
+    db.session.commit()
+
+def test_writer_maintains_rollups_and_stats_read_them(app):
+    client = app.test_client()
+    day = datetime(2001, 2, 3, 12, 0)
+    with app.app_context():
+        _cleanup()
+        try:
+            write_clicks([
+                {'affiliate_type': 'booking', 'destination': 'Rollup Test A', 'user_id': None, 'clicked_at': day},
+                {'affiliate_type': 'booking', 'destination': 'Rollup Test A', 'user_id': None, 'clicked_at': day.isoformat()},
+            ])
+            write_clicks([
+                {'affiliate_type': 'skyscanner', 'destination': 'Rollup Test B', 'user_id': None, 'clicked_at': day + timedelta(days=1)},
+                {'affiliate_type': 'booking', 'destination': 'Rollup Test A', 'user_id': None, 'clicked_at': day},
+            ])
+
+            body = client.get('/api/affiliate/stats?from=2001-02-03&to=2001-02-04&group_by=day,destination').get_json()
+            assert body['total_clicks'] == 4
+            assert body['groups'] == [
+                {'day': '2001-02-03', 'destination': 'Rollup Test A', 'clicks': 3, 'conversions': 0, 'commission': 0.0},
+                {'day': '2001-02-04', 'destination': 'Rollup Test B', 'clicks': 1, 'conversions': 0, 'commission': 0.0},
+            ]
+
+            # A conversion recorded later is picked up by the compactor
+            click = AffiliateClick.query.filter_by(destination='Rollup Test B').first()
+            click.converted, click.commission_earned = True, 12.5
+            db.session.commit()
+            rebuild_rollups(day.date(), day.date() + timedelta(days=1))
+            body = client.get('/api/affiliate/stats?from=2001-02-04&to=2001-02-04').get_json()
+            assert (body['total_clicks'], body['conversions'], body['total_commission']) == (1, 1, 12.5)
+
+            assert client.get('/api/affiliate/stats?group_by=hour').status_code == 400
+        finally:
+            _cleanup()
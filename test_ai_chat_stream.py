@@ -0,0 +1,41 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from services.ai_engine import ai_engine
+
+class FakeCompletions(BaseHTTPRequestHandler):
+    """Stands in for the chat-completions API in streaming mode"""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        assert body['stream'] is True
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        for token in ['Hello', ' from', ' Bali']:
+            chunk = {'choices': [{'delta': {'content': token}}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def log_message(self, *args):
+        pass
+
+def test_chat_stream_relays_upstream_tokens(app, monkeypatch):
+    server = HTTPServer(('127.0.0.1', 0), FakeCompletions)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(ai_engine, 'api_url', f'http://127.0.0.1:{server.server_port}/v1/chat/completions')
+
+    try:
+        client = app.test_client()
+        response = client.post('/ai/api/chat/stream', json={'message': 'Tell me about Bali'})
+        assert response.mimetype == 'text/event-stream'
+
+        events = [e for e in response.get_data(as_text=True).split('\n\n') if e]
+        tokens = [json.loads(e[len('data: '):])['token'] for e in events if e.startswith('data: ')]
+        assert tokens == ['Hello', ' from', ' Bali']
+        assert events[-1].startswith('event: done')
+        assert json.loads(events[-1].split('data: ', 1)[1])['response'] == 'Hello from Bali'
+    finally:
+        server.shutdown()
@@ -0,0 +1,58 @@
+import json
+import subprocess
+import sys
+
+from app import create_app
+from new_models import Destination
+
+
+def test_create_app_from_config_name():
+    app = create_app('testing')
+    assert app.config['TESTING'] and app.config['SQLALCHEMY_DATABASE_URI'] == 'sqlite:///:memory:'
+    with app.app_context():
+        assert Destination.query.count() == 0    # schema created in the in-memory database
+
+    response = app.test_client().get('/healthz')
+    assert response.status_code == 200
+    assert response.headers['X-Frame-Options'] == 'SAMEORIGIN'
+    assert 'seed' in app.cli.commands
+
+
+def test_startup_skips_heavy_integrations():
+    probe = (
+        "import json, sys, app; app.create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'}); "
+        "print(json.dumps([m for m in ('stripe', 'requests', 'redis', 'celery', 'PIL', 'flask_mail', 'alembic') if m in sys.modules]))"
+    )
+    out = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True).stdout
+    assert json.loads(out.strip().splitlines()[-1]) == []
+
+
+def test_default_config_is_production(monkeypatch):
+    for name in ('APP_CONFIG', 'FLASK_ENV', 'AUTO_CREATE_SCHEMA'):
+        monkeypatch.delenv(name, raising=False)
+    app = create_app()
+    assert not app.debug and not app.config['DEBUG']
+    assert not app.config['AUTO_CREATE_SCHEMA']
+    assert 'SECURITY_HEADERS' in app.config
+
+
+def test_service_stats_are_admin_only(app, monkeypatch):
+    from db import db
+    from new_models import User
+
+    with app.app_context():
+        user = User(username='stats-test', email='stats-test@example.com')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+    endpoints = ['/api/rate-limit/stats', '/api/http-client/stats', '/api/hotel-cache/stats']
+    client = app.test_client()
+    assert [client.get(url).status_code for url in endpoints] == [403] * 3
+
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+    assert [client.get(url).status_code for url in endpoints] == [403] * 3
+
+    monkeypatch.setattr(User, 'is_admin', True, raising=False)
+    assert [client.get(url).status_code for url in endpoints] == [200] * 3
@@ -0,0 +1,59 @@
+import gzip
+import json
+
+import blueprints.booking.routes as booking_routes
+from app import create_app
+from db import db
+from new_models import Destination
+from services.catalog import DestinationCatalog, MappedSnapshot
+
+
+def _build_snapshot_file(path):
+    app = create_app('testing')
+    with app.app_context():
+        db.session.add_all([
+            Destination(name='Lisbon', country='Portugal', description='Hills', price=900, available=True),
+            Destination(name='Hidden', country='Nowhere', description='-', price=1, available=False),
+        ])
+        db.session.commit()
+        return DestinationCatalog().save_file(str(path))
+
+
+def test_snapshot_file_round_trip(tmp_path):
+    path = tmp_path / 'catalog.bin'
+    header = _build_snapshot_file(path)
+
+    catalog = DestinationCatalog()
+    assert catalog.load_file(str(path))
+    snapshot = catalog.get_snapshot()
+    assert snapshot.etag == header['etag']
+    assert [d['name'] for d in json.loads(snapshot.body)] == ['Lisbon']
+    assert gzip.decompress(snapshot.gzip_body) == snapshot.body
+    assert isinstance(snapshot, MappedSnapshot)
+
+    # Rebuilding the file in place leaves the mapped snapshot readable
+    _build_snapshot_file(path)
+    assert snapshot.etag == header['etag'] and json.loads(snapshot.body)[0]['name'] == 'Lisbon'
+
+    assert not DestinationCatalog().load_file(str(tmp_path / 'missing.bin'))
+    path.write_bytes(path.read_bytes()[:-5])
+    assert not DestinationCatalog().load_file(str(path))
+
+
+def test_cold_worker_serves_catalog_without_database(tmp_path, monkeypatch):
+    path = tmp_path / 'catalog.bin'
+    _build_snapshot_file(path)
+
+    # Any connection attempt to this database fails
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path}/missing/dir/app.db"}, lazy_schema=True)
+    catalog = DestinationCatalog()
+    assert catalog.load_file(str(path))
+    monkeypatch.setattr(booking_routes, 'destination_catalog', catalog)
+
+    client = app.test_client()
+    response = client.get('/booking/destinations?format=json')
+    assert response.status_code == 200
+    assert [d['name'] for d in response.get_json()] == ['Lisbon']
+    response = client.get('/booking/destinations?format=json&currency=EUR')
+    assert response.status_code == 200 and response.get_json()[0]['currency'] == 'EUR'
+    assert client.get('/healthz').status_code == 200
@@ -0,0 +1,30 @@
+from services.seed_loader import load_fixture
+
+
+def collect_pages(client, url):
+    items, cursor = [], None
+    while True:
+        page = client.get(url + (f'&cursor={cursor}' if cursor else '')).get_json()
+        items.extend(page['items'])
+        cursor = page['next_cursor']
+        if not cursor:
+            return items
+
+def test_keyset_pages_cover_every_row_once(app):
+    client = app.test_client()
+
+    with app.app_context():
+        load_fixture('catalog')
+        for endpoint, sort in [('destinations', '-rating'), ('hotels', 'price'), ('flights', 'departure')]:
+            everything = client.get(f'/booking/{endpoint}?format=json').get_json()
+            paged = collect_pages(client, f'/booking/{endpoint}?format=json&limit=2&sort={sort}')
+            assert len(everything) > 2
+            assert sorted(item['id'] for item in paged) == sorted(item['id'] for item in everything)
+
+def test_invalid_filters_are_rejected(app):
+    client = app.test_client()
+
+    with app.app_context():
+        assert client.get('/booking/destinations?format=json&bbox=1,2').status_code == 400
+        assert client.get('/booking/hotels?format=json&sort=name').status_code == 400
+        assert client.get('/booking/flights?format=json&departure_from=soon').status_code == 400
@@ -0,0 +1,51 @@
+import gzip
+import json
+
+from app import db, Destination
+
+def test_destinations_snapshot_etag_and_invalidation(app):
+    client = app.test_client()
+
+    with app.app_context():
+        first = client.get('/booking/destinations?format=json')
+        assert first.status_code == 200
+        etag = first.headers['ETag']
+
+        cached = client.get('/booking/destinations?format=json', headers={'If-None-Match': etag})
+        assert cached.status_code == 304
+
+        zipped = client.get('/booking/destinations?format=json', headers={'Accept-Encoding': 'gzip'})
+        assert zipped.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(zipped.data)) == first.get_json()
+
+        dest = Destination(name='Snapshot Test', country='Nowhere', description='test', price=1)
+        db.session.add(dest)
+        db.session.commit()
+        try:
+            changed = client.get('/booking/destinations?format=json', headers={'If-None-Match': etag})
+            assert changed.status_code == 200
+            assert 'Snapshot Test' in [d['name'] for d in changed.get_json()]
+        finally:
+            db.session.delete(dest)
+            db.session.commit()
+
+def test_destinations_converted_per_currency(app):
+    from services.currency import currency_service
+
+    client = app.test_client()
+    with app.app_context():
+        db.session.add_all([
+            Destination(name='Rate Alpha', country='Nowhere', description='-', price=100),
+            Destination(name='Rate Beta', country='Nowhere', description='-', price=33.33),
+        ])
+        db.session.commit()
+        usd = client.get('/booking/destinations?format=json').get_json()
+        eur = client.get('/booking/destinations?format=json&currency=eur')
+        assert eur.status_code == 200
+        items = eur.get_json()
+        factor = currency_service.rate('USD', 'EUR')
+        assert [d['name'] for d in usd] == ['Rate Alpha', 'Rate Beta']
+        assert [d['currency'] for d in items] == ['EUR', 'EUR']
+        assert [d['price'] for d in items] == [round(d['price'] * factor, 2) for d in usd]
+        assert client.get('/booking/destinations?format=json&currency=eur').headers['ETag'] == eur.headers['ETag']
+        assert client.get('/booking/destinations?format=json&currency=XXX').status_code == 400
@@ -0,0 +1,44 @@
+from services.city_resolver import CityResolver, city_key
+
+def test_curated_cities_skip_the_api():
+    calls = []
+    resolver = CityResolver(lambda name: calls.append(name) or '1')
+    assert resolver.resolve('  New-York ') == '11162'
+    assert calls == []
+
+def test_misses_are_cached_with_short_ttl_and_errors_are_not():
+    calls = []
+
+    def lookup(name):
+        calls.append(name)
+        if name == 'Atlantis':
+            return None
+        if name == 'Flaky':
+            raise ConnectionError('down')
+        return 4242
+
+    resolver = CityResolver(lookup, ttl=3600, negative_ttl=1)
+    assert resolver.resolve('Lisbon') == '4242'
+    assert resolver.resolve('lisbon') == '4242'
+    assert resolver.resolve('Atlantis') is None
+    assert resolver.resolve('atlantis') is None
+    assert resolver.resolve('Flaky') is None
+    assert resolver.resolve('Flaky') is None
+    assert calls == ['Lisbon', 'Atlantis', 'Flaky', 'Flaky']
+    assert resolver._entries[city_key('Atlantis')][1] < resolver._entries[city_key('Lisbon')][1]
+
+def test_resolutions_persist_across_processes(app):
+    from app import db
+    from new_models import LiteAPICity
+
+    with app.app_context():
+        LiteAPICity.query.filter_by(name_key='testville').delete()
+        db.session.commit()
+        CityResolver(lambda name: 'T-1').resolve('Testville')
+
+        fresh = CityResolver(lambda name: 'should-not-be-called')
+        assert fresh.resolve('Testville') == 'T-1'
+        assert fresh.stats['db_hits'] == 1
+
+        LiteAPICity.query.filter_by(name_key='testville').delete()
+        db.session.commit()
@@ -0,0 +1,36 @@
+import threading
+import time
+
+from services.currency import CurrencyService, FALLBACK_RATES
+from services.shared_store import shared_store
+
+def _reset_store():
+    for key in (CurrencyService.STORE_KEY, CurrencyService.LOCK_KEY):
+        shared_store.delete(key)
+
+def test_readers_never_wait_for_the_upstream():
+    _reset_store()
+    release = threading.Event()
+
+    def slow_fetch():
+        release.wait(5)
+        return {'USD': 1.0, 'EUR': 0.5}
+
+    service = CurrencyService(fetch=slow_fetch)
+    assert service.get_rates() == FALLBACK_RATES
+    release.set()
+    deadline = time.time() + 2
+    while service.rates != {'USD': 1.0, 'EUR': 0.5} and time.time() < deadline:
+        time.sleep(0.01)
+    assert service.get_rates()['EUR'] == 0.5
+
+def test_refresh_publishes_versioned_snapshot_to_other_workers():
+    _reset_store()
+    writer = CurrencyService(fetch=lambda: {'USD': 1.0, 'EUR': 0.5, 'GBP': 0.25})
+    assert writer.refresh()
+    # A second worker within the interval reuses the snapshot instead of fetching
+    reader = CurrencyService(fetch=lambda: {'USD': 1.0, 'EUR': 9.9})
+    assert not reader.refresh()
+    assert reader.version == writer.version
+    assert reader.convert(10, 'EUR', 'GBP') == 5.0
+    assert reader.convert_many([10, None, 3.333], 'USD', 'EUR') == [5.0, None, 1.67]
@@ -0,0 +1,27 @@
+from services.destination_matcher import AhoCorasick
+
+def test_automaton_finds_overlapping_patterns():
+    automaton = AhoCorasick({'he': 1, 'she': 2, 'his': 3, 'hers': 4})
+    assert sorted(automaton.find_all('ushers')) == [(1, 4, 2), (2, 4, 1), (2, 6, 4)]
+
+def test_matcher_finds_each_mentioned_destination():
+    from app import create_app
+    from db import db
+    from new_models import Destination
+    from services.destination_matcher import DestinationMatcher
+
+    app = create_app('testing')
+    with app.app_context():
+        rows = [Destination(name=name, country=country, description='-', price=100, available=available)
+                for name, country, available in [('Paris', 'France', True), ('Bali', 'Indonesia', True),
+                                                 ('York', 'UK', True), ('New York', 'USA', True),
+                                                 ('Atlantis', 'Nowhere', False)]]
+        db.session.add_all(rows)
+        db.session.commit()
+        ids = {d.name: d.id for d in rows}
+
+        matcher = DestinationMatcher()
+        matched = matcher.match('Should I pick PARIS or Bali? Not Parisian food though.')
+        assert matched == [ids['Paris'], ids['Bali']]
+        assert matcher.match('New York or Atlantis?') == [ids['New York']]
+        assert 'Paris, France' in matcher.local_info('paris in spring')
@@ -0,0 +1,55 @@
+import time
+
+from services import hotel_search as hs
+
+def test_merge_dedupes_by_name_and_proximity():
+    merged = hs.merge_results({
+        'liteapi': [{'id': 'L1', 'name': 'The Ritz Hotel', 'price': 300, 'latitude': 48.8681, 'longitude': 2.3290}],
+        'hotelbeds': [
+            {'id': 'H1', 'name': 'Ritz', 'price': 280, 'latitude': 48.8683, 'longitude': 2.3292},
+            # Same name in another city stays separate
+            {'id': 'H2', 'name': 'Ritz', 'price': 500, 'latitude': 51.5072, 'longitude': -0.1416},
+        ],
+        'local': [{'id': 7, 'name': 'Ritz Hotel', 'price': 320}],
+    })
+    assert len(merged) == 2
+    assert merged[0]['price'] == 280
+    assert merged[0]['sources'] == ['liteapi', 'hotelbeds', 'local']
+
+def test_merge_accepts_string_prices():
+    merged = hs.merge_results({
+        'liteapi': [{'name': 'Hotel Arts', 'price': 150}],
+        'hotelbeds': [{'name': 'Hotel Arts', 'price': '123.40'}, {'name': 'Casa Fuster', 'price': 'n/a'}],
+    })
+    assert merged[0]['price'] == 123.4
+    assert [o['price'] for o in merged[0]['offers']] == [150.0, 123.4]
+    assert merged[1]['price'] is None
+
+def test_search_returns_partial_results_at_deadline(monkeypatch):
+    def slow(*args):
+        time.sleep(1.0)
+        return [{'id': 'S', 'name': 'Slow Inn', 'price': 90}]
+
+    monkeypatch.setattr(hs, 'REMOTE_PROVIDERS', {'liteapi': lambda *a: [{'id': 'F', 'name': 'Fast Inn', 'price': 100, 'rating': 4}], 'hotelbeds': slow})
+    monkeypatch.setattr(hs, 'search_local', lambda destination: [])
+
+    started = time.monotonic()
+    hotels, status = hs.HotelSearchAggregator().search('Paris', deadline=0.3)
+    assert time.monotonic() - started < 0.8
+    assert [h['name'] for h in hotels] == ['Fast Inn']
+    assert status == {'local': 'ok', 'liteapi': 'ok', 'hotelbeds': 'timeout'}
+
+def test_local_search_matches_wildcards_literally(app):
+    from db import db
+    from new_models import Hotel
+
+    with app.app_context():
+        db.session.add_all([
+            Hotel(name='Percent Inn', location='100% Beach', price=90),
+            Hotel(name='Underscore Inn', location='Old_Town', price=80),
+            Hotel(name='Plain Inn', location='Oldstown Beach', price=70),
+        ])
+        db.session.commit()
+        assert [h['name'] for h in hs.search_local('%')] == ['Percent Inn']
+        assert [h['name'] for h in hs.search_local('Old_')] == ['Underscore Inn']
+        assert len(hs.search_local('Beach')) == 2
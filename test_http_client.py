@@ -0,0 +1,65 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from services.http_client import HttpClient, CircuitOpenError
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Returns 503 for the first `failures` requests, then 200"""
+    failures = 0
+    calls = 0
+
+    def do_GET(self):
+        FlakyHandler.calls += 1
+        status = 503 if FlakyHandler.calls <= FlakyHandler.failures else 200
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+def start_server(failures):
+    FlakyHandler.failures, FlakyHandler.calls = failures, 0
+    server = HTTPServer(('127.0.0.1', 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}/'
+
+def test_retries_transient_errors_and_records_metrics():
+    server, url = start_server(failures=2)
+    try:
+        client = HttpClient(max_retries=2, backoff_base=0.001)
+        assert client.get(url).status_code == 200
+        stats = client.stats()[f'127.0.0.1:{server.server_port}']
+        assert stats['requests'] == 3 and stats['retries'] == 2 and stats['circuit'] == 'closed'
+    finally:
+        server.shutdown()
+
+def test_circuit_opens_after_repeated_failures():
+    server, url = start_server(failures=100)
+    try:
+        client = HttpClient(max_retries=0, failure_threshold=2, reset_timeout=60)
+        assert client.get(url).status_code == 503
+        assert client.get(url).status_code == 503
+        with pytest.raises(CircuitOpenError):
+            client.get(url)
+        assert FlakyHandler.calls == 2
+    finally:
+        server.shutdown()
+
+def test_unexpected_error_during_trial_releases_the_circuit():
+    server, url = start_server(failures=100)
+    try:
+        client = HttpClient(max_retries=0, failure_threshold=1, reset_timeout=0.05)
+        assert client.get(url).status_code == 503
+        time.sleep(0.06)
+        # A bad argument fails inside requests without touching the host
+        with pytest.raises(TypeError):
+            client.get(url, bogus_option=True)
+        FlakyHandler.failures = 0
+        assert client.get(url).status_code == 200
+    finally:
+        server.shutdown()
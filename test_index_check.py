@@ -0,0 +1,12 @@
+from services.index_check import find_lookups, missing_indexes
+
+
+def test_filter_by_lookups_are_indexed(app):
+    lookups = find_lookups()
+    assert any(model == 'Subscription' and columns == ('stripe_subscription_id',) for model, columns, _ in lookups)
+    # Chained receivers resolve to the model too
+    assert any(model == 'Destination' and location.startswith('services/weather.py') for model, _, location in lookups)
+
+    with app.app_context():
+        assert missing_indexes() == []
+        assert missing_indexes(live=True) == []
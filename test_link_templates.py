@@ -0,0 +1,31 @@
+from services.link_templates import build_link, destination_links
+from services.redirect_service import redirect_service
+
+def test_templates_encode_every_value():
+    url = build_link('booking', destination='São Paulo & Co', checkin='2026-11-01', checkout='2026-11-05')
+    assert url.startswith('https://www.booking.com/searchresults.html?ss=S%C3%A3o+Paulo+%26+Co&checkin=2026-11-01')
+    assert build_link('skyscanner', origin='JFK', destination='CDG', date='2026-11-01') == \
+        'https://www.skyscanner.com/transport/flights/jfk/cdg/261101/?associateid=YOUR_SKYSCANNER_AFFILIATE_ID'
+    assert build_link('getyourguide_activity', activity_id='a/b').startswith('https://www.getyourguide.com/activity/a%2Fb?')
+    assert '?ss=New+York&' in redirect_service.get_booking_url('New York')
+    assert redirect_service.get_skyscanner_url('LHR', 'JFK', '2026-01-08') == \
+        'https://www.skyscanner.net/transport/flights/lhr/jfk/260108/'
+
+def test_destination_page_links_fall_back_without_codes():
+    links = destination_links.get('Cape Town', origin='NYC', date='2026-11-01')
+    assert links['skyscanner'] is None
+    assert links['google_flights'].endswith('?q=Flights+to+Cape+Town+from+NYC+on+2026-11-01')
+    assert destination_links.get('Cape Town', origin='NYC', date='2026-11-01') is links
+    assert destination_links.get('Cape Town', destination_code='CPT', origin='NYC', date='2026-11-01')['skyscanner'] \
+        .startswith('https://www.skyscanner.com/transport/flights/nyc/cpt/261101/')
+
+def test_links_endpoint_and_redirect(app):
+    client = app.test_client()
+    body = client.get('/api/affiliate/links?destination=Bali&travelers=2').get_json()
+    assert set(body['links']) == {'booking', 'skyscanner', 'google_flights', 'getyourguide', 'worldnomads'}
+    assert client.get('/api/affiliate/redirect?type=flight&origin=JFK').status_code == 400
+    assert client.get('/api/affiliate/redirect?type=activity&destination=Bali').status_code == 302
+    coded = client.get('/api/affiliate/redirect?type=flight&origin=JFK&destination=CDG&date=2026-11-01')
+    assert coded.headers['Location'].startswith('https://www.skyscanner.com/transport/flights/jfk/cdg/261101/')
+    named = client.get('/api/affiliate/redirect?type=flight&origin=New%20York&destination=Paris&date=2026-11-01')
+    assert named.headers['Location'].startswith('https://www.google.com/travel/flights?q=Flights+to+Paris+from+New+York')
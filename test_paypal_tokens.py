@@ -0,0 +1,43 @@
+import time
+
+from services.paypal_service import PayPalTokenManager
+
+class FakeOAuth:
+    def __init__(self, expires_in):
+        self.expires_in = expires_in
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return f'token-{self.calls}', self.expires_in
+
+def test_token_is_reused_until_refresh_window(monkeypatch):
+    monkeypatch.setenv('PAYPAL_CLIENT_ID', 'test-reuse')
+    oauth = FakeOAuth(expires_in=3600)
+    manager = PayPalTokenManager(fetch=oauth)
+
+    assert [manager.get_token() for _ in range(5)] == ['token-1'] * 5
+    assert oauth.calls == 1
+
+    # A second worker picks the token up from the shared store
+    assert PayPalTokenManager(fetch=oauth).get_token() == 'token-1'
+    assert oauth.calls == 1
+
+def test_refreshes_in_background_and_after_rejection(monkeypatch):
+    monkeypatch.setenv('PAYPAL_CLIENT_ID', 'test-refresh')
+    oauth = FakeOAuth(expires_in=120)   # shorter than REFRESH_MARGIN
+    manager = PayPalTokenManager(fetch=oauth)
+
+    assert [manager.get_token() for _ in range(5)] == ['token-1'] * 5
+    assert oauth.calls == 1
+
+    manager._refresh_at = time.time()   # half of its lifetime has passed
+    # Still valid, so it is returned while a background refresh runs
+    assert manager.get_token() == 'token-1'
+    deadline = time.time() + 2
+    while oauth.calls < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert oauth.calls == 2
+
+    manager.invalidate(manager.get_token())
+    assert manager.get_token() not in ('token-1', None)
@@ -0,0 +1,38 @@
+from services.rate_limiter import MemoryRateLimitBackend
+
+def test_memory_backend_limits_per_key():
+    backend = MemoryRateLimitBackend(buckets=10)
+
+    results = [backend.hit('chat:1.2.3.4', 5, 60)[0] for _ in range(7)]
+    assert results == [True] * 5 + [False] * 2
+
+    # Other clients have their own window
+    assert backend.hit('chat:5.6.7.8', 5, 60) == (True, 4)
+
+    stats = backend.stats()
+    assert stats['allowed'] == 6
+    assert stats['denied'] == 2
+    assert stats['tracked_keys'] == 2
+
+def test_memory_backend_window_slides_and_expires(monkeypatch):
+    import services.rate_limiter as rl
+    clock = [1000.0]
+    monkeypatch.setattr(rl.time, 'time', lambda: clock[0])
+
+    backend = MemoryRateLimitBackend(buckets=10, shards=1, sweep_interval=0)
+    for _ in range(3):
+        assert backend.hit('k', 3, 10)[0]
+    assert not backend.hit('k', 3, 10)[0]
+
+    # Half a window later the old bucket still counts
+    clock[0] += 5
+    assert not backend.hit('k', 3, 10)[0]
+
+    # Once the first bucket slides out, requests are allowed again
+    clock[0] += 6
+    assert backend.hit('k', 3, 10)[0]
+
+    # Idle keys are swept after a full window
+    clock[0] += 30
+    backend.hit('other', 3, 10)
+    assert backend.stats()['tracked_keys'] == 1
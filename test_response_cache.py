@@ -0,0 +1,62 @@
+from services import response_cache as rc
+from services.ai_engine import ai_engine
+from services.response_cache import ResponseCache, normalize_message
+
+
+def test_key_normalization():
+    assert normalize_message('  Best time to visit BALI?? ') == 'best time to visit bali'
+    cache = ResponseCache(max_entries=10, ttl=60)
+    cache.set('Best time to visit Bali?', [2, 1], 'Dry season')
+    assert cache.get('best time to visit bali', [1, 2]) == 'Dry season'
+    assert cache.get('best time to visit bali', [1]) is None
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rc.time, 'time', lambda: now[0])
+    cache = ResponseCache(max_entries=10, ttl=60)
+    cache.set('weather in paris', [], 'Mild')
+    now[0] += 59
+    assert cache.get('weather in paris') == 'Mild'
+    now[0] += 2
+    assert cache.get('weather in paris') is None
+    assert cache.metrics()['size'] == 0
+
+
+def test_similarity_is_opt_in():
+    assert ResponseCache(max_entries=10, ttl=60).similarity == 0
+    exact = ResponseCache(max_entries=10, ttl=60)
+    exact.set('things to do in bali in june', [1], 'Surf')
+    assert exact.get('things to do in bali in july', [1]) is None
+
+    similar = ResponseCache(max_entries=10, ttl=60, similarity=0.8)
+    similar.set('what are the best things to do in bali', [1], 'Surf')
+    assert similar.get('what are the best things to do in bali please', [1]) == 'Surf'
+    assert similar.metrics()['similar_hits'] == 1
+
+
+def test_personal_answers_are_scoped_per_user():
+    cache = ResponseCache(max_entries=10, ttl=60)
+    cache.set('plan my trip', [], 'Hi Ana, ...', scope=7)
+    assert cache.get('plan my trip', scope=7) == 'Hi Ana, ...'
+    assert cache.get('plan my trip', scope=8) is None
+    assert cache.get('plan my trip') is None
+    assert ai_engine.cache_scope({'user_id': 'guest'}) is None
+    assert ai_engine.cache_scope({'user_id': 7}) == 7
+
+
+def test_request_and_user_bypass(monkeypatch):
+    cache = ResponseCache(max_entries=10, ttl=60)
+    monkeypatch.setattr('services.ai_engine.response_cache', cache)
+    cache.set('visa for kenya', [], 'eVisa', scope=5)
+    assert ai_engine.cached_response('visa for kenya', [], scope=5) == 'eVisa'
+    assert ai_engine.cached_response('visa for kenya', [], bypass_cache=True, scope=5) is None
+
+    cache.set_user_bypass(5, True)
+    try:
+        assert ai_engine.cached_response('visa for kenya', [], scope=5) is None
+        ai_engine.store_response('new question', [], 'answer', scope=5)
+        assert cache.get('new question', scope=5) is None
+    finally:
+        cache.set_user_bypass(5, False)
+    assert cache.metrics()['bypassed'] == 2
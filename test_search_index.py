@@ -0,0 +1,108 @@
+from services.search_index import SearchIndex, DESTINATION_FIELDS
+
+def make_index():
+    index = SearchIndex()
+    for doc_id, name, country, category in [
+        (1, 'Paris', 'France', 'cultural'),
+        (2, 'Santorini', 'Greece', 'luxury'),
+        (3, 'São Paulo', 'Brazil', 'city'),
+    ]:
+        fields = {'name': name, 'country': country, 'category': category}
+        index.add_document(('destination', doc_id), fields, DESTINATION_FIELDS, {'id': doc_id, 'name': name})
+    return index
+
+def test_prefix_fuzzy_and_accent_matching():
+    index = make_index()
+
+    assert [r['name'] for r in index.search('sant')] == ['Santorini']
+    assert [r['name'] for r in index.search('santorni')] == ['Santorini']
+    assert [r['name'] for r in index.search('sao pau')] == ['São Paulo']
+    assert [r['name'] for r in index.search('paris fra')] == ['Paris']
+    assert index.search('paris greece') == []
+
+def test_incremental_update_and_removal():
+    index = make_index()
+
+    index.add_document(('destination', 1), {'name': 'Lyon', 'country': 'France'}, DESTINATION_FIELDS, {'id': 1, 'name': 'Lyon'})
+    assert index.search('paris') == []
+    assert [r['name'] for r in index.search('lyo')] == ['Lyon']
+
+    index.remove_document(('destination', 1))
+    assert index.search('lyon') == []
+    assert 'lyon' not in index.terms
+
+def test_search_is_not_blocked_by_a_rebuild(monkeypatch):
+    import threading
+    from app import create_app
+    from db import db
+    from new_models import Destination
+    from services import search_index
+    from services.search_index import CatalogSearch
+
+    app = create_app('testing')
+    with app.app_context():
+        db.session.add(Destination(name='Lisbon', country='Portugal', description='-', price=1))
+        db.session.commit()
+
+    catalog = CatalogSearch()
+    catalog.index = make_index()
+    catalog.built_at = float('inf')
+    catalog._full_rebuild = True
+
+    entered, release = threading.Event(), threading.Event()
+    build_document = search_index.destination_document
+    def slow_document(d):
+        entered.set()
+        release.wait(5)
+        return build_document(d)
+    monkeypatch.setattr(search_index, 'destination_document', slow_document)
+
+    def rebuild():
+        with app.app_context():
+            catalog.search('lis')
+    worker = threading.Thread(target=rebuild)
+    worker.start()
+    try:
+        assert entered.wait(5)
+        # The old index keeps answering while the new one is built
+        assert [r['name'] for r in catalog.search('paris')] == ['Paris']
+    finally:
+        release.set()
+        worker.join(5)
+    assert [r['name'] for r in catalog.search('lis')] == ['Lisbon']
+
+def test_expired_index_is_rebuilt_in_the_background(app, monkeypatch):
+    import threading
+    from db import db
+    from new_models import Destination
+    from services import search_index
+    from services.search_index import CatalogSearch
+
+    with app.app_context():
+        db.session.add(Destination(name='Lisbon', country='Portugal', description='-', price=1))
+        db.session.commit()
+
+    catalog = CatalogSearch(max_age=60)
+    catalog.index = make_index()
+    catalog.built_at = 0.0
+    catalog._full_rebuild = False
+
+    entered, release = threading.Event(), threading.Event()
+    build_document = search_index.destination_document
+    def slow_document(d):
+        entered.set()
+        release.wait(5)
+        return build_document(d)
+    monkeypatch.setattr(search_index, 'destination_document', slow_document)
+
+    with app.app_context():
+        try:
+            # The request that finds the index expired is answered from it
+            assert [r['name'] for r in catalog.search('paris')] == ['Paris']
+            assert entered.wait(5)
+            assert catalog.search('lis') == []
+        finally:
+            release.set()
+        assert catalog._rebuild_lock.acquire(timeout=5)
+        catalog._rebuild_lock.release()
+        assert [r['name'] for r in catalog.search('lis')] == ['Lisbon']
@@ -0,0 +1,128 @@
+import glob
+import os
+
+import pytest
+
+from app import db
+from new_models import Destination, Hotel, Flight
+from services.seed_loader import SEEDS_DIR, TABLES, SeedError, load_fixture, read_fixture
+
+
+def _fixture(price=100, prune=False, hotels=True):
+    tables = [{'model': 'destinations', 'update': ['price'], 'prune': prune, 'rows': [
+        {'name': 'Seed Alpha', 'country': 'Seedland', 'description': 'a', 'price': price},
+        {'name': 'Seed Beta', 'country': 'Seedland', 'description': 'b', 'price': price, 'category': 'beach'},
+    ]}]
+    if hotels:
+        tables.append({'model': 'hotels', 'rows': [
+            {'name': 'Seed Inn', 'location': 'Alpha, Seedland', 'price': 50, 'destination': 'Seed Alpha'},
+            {'name': 'Nowhere Inn', 'location': 'Gone', 'price': 50, 'destination': 'Missing Place'},
+        ]})
+    # Listed child-first on purpose; the loader orders tables itself
+    return {'tables': list(reversed(tables))}
+
+
+def test_shipped_fixtures_have_natural_keys():
+    paths = glob.glob(os.path.join(SEEDS_DIR, '*.json'))
+    assert len(paths) >= 6
+    for path in paths:
+        for spec in read_fixture(path)['tables']:
+            _, key = TABLES[spec['model']]
+            assert all(row.get(k) is not None for row in spec['rows'] for k in key), path
+
+
+def test_upsert_by_natural_key_in_one_transaction(app):
+    with app.app_context():
+        try:
+            report = load_fixture(_fixture())
+            assert report['tables']['destinations']['inserted'] == 2
+            assert report['tables']['hotels'] == {'inserted': 1, 'updated': 0, 'unchanged': 0, 'deleted': 0, 'skipped': 1}
+            alpha = Destination.query.filter_by(name='Seed Alpha').one()
+            assert Hotel.query.filter_by(name='Seed Inn').one().destination_id == alpha.id
+            assert alpha.id in report['changes']['Destination']
+
+            # Nothing differs, so nothing is written or invalidated
+            report = load_fixture(_fixture())
+            assert report['changes'] == {}
+            assert report['tables']['destinations']['unchanged'] == 2
+
+            # Re-running updates in place, keeping ids and untouched columns
+            report = load_fixture(_fixture(price=250, hotels=False))
+            assert report['tables']['destinations']['updated'] == 2
+            beta = Destination.query.filter_by(name='Seed Beta').one()
+            assert (beta.price, beta.category) == (250, 'beach')
+            assert Destination.query.filter_by(name='Seed Alpha').one().id == alpha.id
+            assert report['changes'] == {'Destination': sorted([alpha.id, beta.id])}
+
+            # A bad row rolls back the whole fixture
+            bad = _fixture(price=999, hotels=False)
+            bad['tables'][0]['rows'].append({'name': 'Seed Gamma', 'description': 'no country'})
+            with pytest.raises(SeedError):
+                load_fixture(bad)
+            assert Destination.query.filter_by(name='Seed Alpha').one().price == 250
+        finally:
+            Hotel.query.filter(Hotel.name.in_(['Seed Inn', 'Nowhere Inn'])).delete(synchronize_session=False)
+            Destination.query.filter_by(country='Seedland').delete(synchronize_session=False)
+            db.session.commit()
+
+
+def test_prune_soft_deletes_and_relists(app):
+    with app.app_context():
+        listed = []
+        try:
+            load_fixture(_fixture(hotels=False))
+            beta = Destination.query.filter_by(name='Seed Beta').one()
+            listed = [d.id for d in Destination.query.filter(Destination.country != 'Seedland', Destination.available.isnot(False))]
+
+            only_beta = _fixture(hotels=False, prune=True)
+            only_beta['tables'][0]['rows'] = only_beta['tables'][0]['rows'][1:]
+            report = load_fixture(only_beta)
+            alpha = Destination.query.filter_by(name='Seed Alpha').one()
+            assert alpha.available is False
+            assert report['tables']['destinations']['deleted'] == len(listed) + 1
+            assert beta.id not in report['changes']['Destination']
+
+            # Listing it again brings back the same row
+            report = load_fixture(_fixture(hotels=False, prune=True))
+            assert Destination.query.filter_by(name='Seed Alpha').one().available is True
+            assert report['changes']['Destination'] == [alpha.id]
+        finally:
+            # Undo the soft-delete of the rest of the catalog
+            Destination.query.filter(Destination.id.in_(listed)).update({Destination.available: True}, synchronize_session=False)
+            Destination.query.filter_by(country='Seedland').delete(synchronize_session=False)
+            db.session.commit()
+
+
+def test_pruned_hotels_are_unlisted_not_deleted(app):
+    with app.app_context():
+        listed = []
+        try:
+            load_fixture(_fixture())
+            inn = Hotel.query.filter_by(name='Seed Inn').one()
+            listed = [h.id for h in Hotel.query.filter(Hotel.id != inn.id, Hotel.available.isnot(False))]
+
+            report = load_fixture({'tables': [{'model': 'hotels', 'prune': True, 'rows': []}]})
+            assert report['tables']['hotels']['deleted'] == len(listed) + 1
+            # The row (and anything linking to its id) survives, but is no longer listed
+            assert db.session.get(Hotel, inn.id).available is False
+            names = [h['name'] for h in app.test_client().get('/booking/hotels?format=json').get_json()]
+            assert 'Seed Inn' not in names
+        finally:
+            Hotel.query.filter(Hotel.id.in_(listed)).update({Hotel.available: True}, synchronize_session=False)
+            Hotel.query.filter(Hotel.name.in_(['Seed Inn', 'Nowhere Inn'])).delete(synchronize_session=False)
+            Destination.query.filter_by(country='Seedland').delete(synchronize_session=False)
+            db.session.commit()
+
+
+def test_flight_departure_is_relative_to_load_time(app):
+    with app.app_context():
+        try:
+            load_fixture({'tables': [{'model': 'flights', 'rows': [
+                {'airline': 'Seed Air', 'origin': 'AAA', 'destination': 'BBB', 'price': 1,
+                 'departure_in_hours': 3, 'duration': '1h', 'flight_number': 'SEED01'}
+            ]}]})
+            flight = Flight.query.filter_by(flight_number='SEED01').one()
+            assert flight.departure_time is not None
+        finally:
+            Flight.query.filter_by(flight_number='SEED01').delete()
+            db.session.commit()
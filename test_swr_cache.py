@@ -0,0 +1,42 @@
+import threading
+import time
+
+from services.shared_store import MemoryStore, SharedStore
+from services.swr_cache import SWRCache
+
+def test_concurrent_misses_share_one_computation():
+    cache = SWRCache('t', ttl=60, stale_ttl=60, store=SharedStore(MemoryStore()))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {'n': len(calls)}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('paris', compute))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert {value['n'] for value, _ in results} == {1}
+    assert sorted(state for _, state in results).count('miss') == 1
+
+def test_stale_entry_is_served_while_refreshing():
+    cache = SWRCache('t', ttl=0.05, stale_ttl=60, store=SharedStore(MemoryStore()))
+    assert cache.get('k', lambda: 'v1') == ('v1', 'miss')
+    time.sleep(0.1)
+
+    assert cache.get('k', lambda: 'v2') == ('v1', 'stale')
+    deadline = time.time() + 2
+    while cache.get('k', lambda: 'v3')[0] != 'v2' and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.get('k', lambda: 'v3') == ('v2', 'hit')
+
+def test_ttl_for_can_skip_caching():
+    cache = SWRCache('t', ttl=60, stale_ttl=60, store=SharedStore(MemoryStore()))
+    assert cache.get('k', lambda: 'bad', ttl_for=lambda v: 0) == ('bad', 'miss')
+    assert cache.get('k', lambda: 'good') == ('good', 'miss')
+    assert cache.get('k', lambda: 'other') == ('good', 'hit')
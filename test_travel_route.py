@@ -1,10 +1,13 @@
-from app import app, db, Destination
+from app import db, Destination
+from services.seed_loader import load_fixture
 
-def test_travel_route():
+def test_travel_route(app):
     with app.app_context():
+        load_fixture('catalog')
         # Simulate the travel route logic
         query = Destination.query.filter_by(available=True)
         destinations = query.order_by(Destination.rating.desc()).all()
+        assert destinations
         
         print(f"\n=== TRAVEL ROUTE TEST ===")
         print(f"Destinations returned by travel route: {len(destinations)}")
@@ -21,6 +24,3 @@ def test_travel_route():
         for dest in destinations:
             if not dest.name or not dest.country or not dest.image_url:
                 print(f"WARNING: {dest.id} - Missing data: name={dest.name}, country={dest.country}, image={dest.image_url}")
-
-if __name__ == '__main__':
-    test_travel_route() 
\ No newline at end of file
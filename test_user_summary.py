@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app import db
+from models.subscription import Subscription
+from new_models import User, SavedItem, Booking, UserSummary
+
+
+def _profile(client):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        body = client.get('/api/user/profile').get_json()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    return body, [s for s in statements if 'user_summaries' in s or 'saved_items' in s or 'subscriptions' in s]
+
+
+def test_profile_summary_tracks_writes(app):
+    with app.app_context():
+        user = User(username='summary-test', email='summary-test@example.com')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+
+        try:
+            body, _ = _profile(client)
+            assert body['username'] == 'summary-test'
+            assert body['stats'] == {'saved_trips': 0, 'bookings': 0}
+            assert body['subscription']['plan'] == 'free'
+
+            # Served from the cache: no summary or source-table queries
+            _, queries = _profile(client)
+            assert queries == []
+
+            db.session.add_all([SavedItem(user_id=user_id, item_type='destination'),
+                                SavedItem(user_id=user_id, item_type='hotel'),
+                                Booking(user_id=user_id, total_price=100)])
+            db.session.add(Subscription(user_id=user_id, plan='yearly', status='active',
+                                        current_period_end=datetime.utcnow() + timedelta(days=30)))
+            db.session.commit()
+
+            body, queries = _profile(client)
+            assert body['stats'] == {'saved_trips': 2, 'bookings': 1}
+            assert body['subscription']['active'] and body['subscription']['plan'] == 'yearly'
+            assert len(queries) == 1    # one primary-key lookup on user_summaries
+
+            db.session.delete(SavedItem.query.filter_by(user_id=user_id).first())
+            db.session.commit()
+            assert _profile(client)[0]['stats']['saved_trips'] == 1
+        finally:
+            db.session.rollback()
+            SavedItem.query.filter_by(user_id=user_id).delete()
+            Booking.query.filter_by(user_id=user_id).delete()
+            Subscription.query.filter_by(user_id=user_id).delete()
+            UserSummary.query.filter_by(user_id=user_id).delete()
+            User.query.filter_by(id=user_id).delete()
+            db.session.commit()
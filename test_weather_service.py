@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from services.weather import WeatherService, key_for
+
+def test_batch_fetches_misses_concurrently_and_caches_them():
+    service = WeatherService(api_key='test', ttl=60)
+    calls, active, peak = [], [0], [0]
+    lock = threading.Lock()
+
+    def fake_fetch(params):
+        with lock:
+            calls.append(params)
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        return {'temp': 21, 'condition': 'Clear'}
+
+    service._fetch = fake_fetch
+    locations = [{'lat': 48.8566, 'lon': 2.3522}, {'lat': -8.4095, 'lon': 115.1889}, {'city': 'Tokyo'}, {'city': ' tokyo '}]
+    first = service.get_many(locations)
+    assert len(calls) == 3 and peak[0] > 1
+    assert first[key_for({'city': 'TOKYO'})]['temp'] == 21
+
+    service.get_many(locations)
+    assert len(calls) == 3
+
+def test_cache_only_batch_never_fetches():
+    service = WeatherService(api_key='test', ttl=60)
+    service._fetch = lambda params: pytest.fail('fetched on the request path')
+    service._remember(key_for({'city': 'Paris'}), {'temp': 18})
+    results = service.get_many([{'city': 'Paris'}, {'city': 'Lima'}], fetch=False)
+    assert results == {key_for({'city': 'Paris'}): {'temp': 18}, key_for({'city': 'Lima'}): None}
+
+def test_batch_endpoint_pages_destinations_by_default(app, monkeypatch):
+    import blueprints.core.routes as core_routes
+    from app import db
+    from new_models import Destination
+    from services.weather import weather_service
+
+    monkeypatch.setattr(core_routes, 'MAX_WEATHER_BATCH', 2)
+    monkeypatch.setattr(weather_service, 'api_key', 'test')
+    monkeypatch.setattr(weather_service, 'start_prefetcher', lambda app: None)
+    monkeypatch.setattr(weather_service, '_fetch', lambda params: pytest.fail('fetched on the request path'))
+    client = app.test_client()
+    with app.app_context():
+        dests = [Destination(name=f'Weather Page {i}', country='Nowhere', description='test', price=1) for i in range(5)]
+        db.session.add_all(dests)
+        db.session.commit()
+        ids = [str(d.id) for d in dests]
+        weather_service._remember(key_for({'city': 'Weather Page 0'}), {'temp': 25})
+
+        pages, offset = [], 0
+        while offset is not None:
+            body = client.get(f'/api/weather/batch?offset={offset}').get_json()
+            assert set(body) == {'destinations', 'cities', 'next_offset'}
+            pages.append(body['destinations'])
+            offset = body['next_offset']
+        assert [list(page) for page in pages] == [ids[0:2], ids[2:4], ids[4:]]
+        assert pages[0] == {ids[0]: {'temp': 25}, ids[1]: None}
+        assert client.get('/api/weather/batch?destination_ids=x').status_code == 400
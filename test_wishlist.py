@@ -0,0 +1,99 @@
+from sqlalchemy import event
+
+from app import db
+from new_models import User, Destination, Hotel, SavedItem
+from services.wishlist import dump_snapshot, link_ids
+
+
+def test_wishlist_hydrates_in_one_query_per_type(app):
+    with app.app_context():
+        user = User(username='wishlist-test', email='wishlist-test@example.com')
+        dests = [Destination(name=f'Wish {i}', country='Nowhere', description='test', price=1) for i in range(5)]
+        db.session.add(user)
+        db.session.add_all(dests)
+        db.session.flush()
+        hotel = Hotel(name='Wish Hotel', location='Nowhere', price=80, destination_id=dests[0].id)
+        db.session.add(hotel)
+        db.session.flush()
+        items = [
+            SavedItem(user_id=user.id, item_type='destination', item_data=dump_snapshot({'id': d.id, 'note': 'keep'}),
+                      **link_ids('destination', {'id': d.id}))
+            for d in dests
+        ]
+        items.append(SavedItem(user_id=user.id, item_type='hotel', item_data=dump_snapshot({'id': hotel.id}),
+                               **link_ids('hotel', {'id': str(hotel.id)})))
+        items.append(SavedItem(user_id=user.id, item_type='custom', item_data='not json'))
+        db.session.add_all(items)
+        db.session.commit()
+        user_id = user.id
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session['_user_id'] = str(user_id)
+            response = client.get('/api/user/wishlist')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        try:
+            assert response.status_code == 200
+            body = response.get_json()
+            by_type = {}
+            for entry in body:
+                by_type.setdefault(entry['type'], []).append(entry['data'])
+            assert sorted(d['name'] for d in by_type['destination']) == [f'Wish {i}' for i in range(5)]
+            assert all(d['note'] == 'keep' for d in by_type['destination'])
+            assert by_type['hotel'][0]['name'] == 'Wish Hotel'
+            assert by_type['custom'] == [{}]
+            # user + saved items + destinations + hotels
+            assert len([s for s in statements if s.lstrip().upper().startswith('SELECT')]) <= 4
+        finally:
+            SavedItem.query.filter_by(user_id=user_id).delete()
+            db.session.delete(hotel)
+            for d in dests:
+                db.session.delete(d)
+            User.query.filter_by(id=user_id).delete()
+            db.session.commit()
+
+
+def test_live_hotels_are_saved_unlinked(app):
+    with app.app_context():
+        user = User(username='wishlist-live', email='wishlist-live@example.com')
+        dest = Destination(name='Wish Live', country='Nowhere', description='test', price=1)
+        db.session.add_all([user, dest])
+        db.session.flush()
+        hotel = Hotel(name='Catalog Hotel', location='Nowhere', price=80, destination_id=dest.id)
+        db.session.add(hotel)
+        db.session.commit()
+        user_id, hotel_id = user.id, hotel.id
+
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+        saved = [
+            # A Hotelbeds code that happens to equal a catalog id
+            {'id': hotel_id, 'name': 'Live Hotel', 'sources': ['hotelbeds'],
+             'offers': [{'provider': 'hotelbeds', 'id': hotel_id, 'price': 99}]},
+            # Listed by a live provider and the catalog: link the catalog row
+            {'id': 'lite-1', 'name': 'Merged Hotel', 'sources': ['liteapi', 'local'],
+             'offers': [{'provider': 'liteapi', 'id': 'lite-1', 'price': 70},
+                        {'provider': 'local', 'id': hotel_id, 'price': 80}]},
+            {'id': hotel_id + 1000, 'name': 'Gone Hotel'},
+        ]
+        for data in saved:
+            assert client.post('/api/user/wishlist', json={'type': 'hotel', 'data': data}).status_code == 201
+
+        try:
+            links = [item.hotel_id for item in SavedItem.query.filter_by(user_id=user_id).order_by(SavedItem.id)]
+            assert links == [None, hotel_id, None]
+            names = sorted(entry['data']['name'] for entry in client.get('/api/user/wishlist').get_json())
+            assert names == ['Catalog Hotel', 'Gone Hotel', 'Live Hotel']
+        finally:
+            SavedItem.query.filter_by(user_id=user_id).delete()
+            db.session.delete(hotel)
+            db.session.delete(dest)
+            User.query.filter_by(id=user_id).delete()
+            db.session.commit()